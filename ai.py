@@ -0,0 +1,103 @@
+"""
+ai.py
+
+Gracz komputerowy zastępujący przeciwnika sieciowego w trybie jednoosobowym.
+
+AIOpponent działa w osobnym wątku na drugim końcu pary gniazd (socket.socketpair())
+i mówi tym samym protokołem JSON co zdalny gracz: wysyła {"type":"ready"},
+odpowiada na {"type":"attack"} komunikatem {"type":"result"}, po czym oddaje
+własny strzał wybrany przez strategię z strategies.STRATEGIES. Dzięki temu
+main.py nie odróżnia gry z komputerem od gry sieciowej.
+"""
+
+import json
+import random
+import socket
+import threading
+import time
+
+from board import Board, SHIPS
+from network import send_json
+from strategies import STRATEGIES
+
+
+class AIOpponent(threading.Thread):
+    """
+    Wątek gracza komputerowego.
+
+    Parametry:
+    ----------
+    sock : socket.socket
+        Blokujący koniec pary gniazd po stronie komputera.
+    strategy : str
+        Nazwa strategii z STRATEGIES (domyślnie "probability").
+    seed : int lub None
+        Ziarno losowania floty i strzałów.
+    delay : float
+        Pauza (s) przed własnym strzałem, żeby gracz widział przebieg tury.
+    """
+
+    def __init__(self, sock, strategy="probability", seed=None, delay=0.4):
+        super().__init__(name="AIOpponent", daemon=True)
+        self.sock = sock
+        self.rng = random.Random(seed)
+        self.board = Board.random_fleet(SHIPS, self.rng)
+        self.shooter = STRATEGIES[strategy](self.rng, SHIPS)
+        self.delay = delay
+
+    def run(self):
+        try:
+            send_json(self.sock, {"type": "ready"})
+            with self.sock.makefile("r", encoding="utf-8") as reader:
+                for line in reader:
+                    if not line.strip():
+                        continue
+                    msg = json.loads(line)
+                    if msg.get("type") == "attack":
+                        if not self._on_attack(msg["row"], msg["col"]):
+                            break
+                    elif msg.get("type") == "result":
+                        self.shooter.observe(msg["row"], msg["col"], msg.get("hit", False),
+                                             msg.get("sunk", False))
+                        if msg.get("gameover"):
+                            break
+        except OSError:
+            # Gracz zamknął okno – gniazdo zostało zamknięte
+            pass
+        finally:
+            self.sock.close()
+
+    def _on_attack(self, row, col):
+        """
+        Odpowiada na strzał gracza i oddaje własny. Zwraca False, gdy gra się skończyła.
+        """
+        res, sunk = self.board.receive_attack(row, col)
+        lost = bool(res) and self.board.all_sunk()
+        send_json(self.sock, {
+            "type": "result",
+            "row": row,
+            "col": col,
+            "hit": False if res is None else res,
+            "sunk": True if sunk else False,
+            "gameover": lost
+        })
+        if lost:
+            return False
+        time.sleep(self.delay)
+        r, c = self.shooter.next_shot()
+        send_json(self.sock, {"type": "attack", "row": r, "col": c})
+        return True
+
+
+def start_ai_opponent(strategy="probability", seed=None):
+    """
+    Uruchamia gracza komputerowego i zwraca koniec pary gniazd dla main.py.
+
+    Zwraca:
+    --------
+    socket.socket
+        Połączony socket (blokujący – init_network przełączy go w tryb nieblokujący).
+    """
+    player_sock, ai_sock = socket.socketpair()
+    AIOpponent(ai_sock, strategy, seed).start()
+    return player_sock
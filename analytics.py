@@ -0,0 +1,380 @@
+"""
+analytics.py
+
+Statystyki strzałów liczone strumieniowo z dzienników meczów (matchlog.py):
+- mapa pierwszych strzałów (pole pierwszego strzału każdego gracza),
+- mapa zajętości pól przez statki (z flot zapisanych w dzienniku),
+- skuteczność według numeru tury gracza,
+- rozkład liczby strzałów zwycięzcy potrzebnych do wygranej,
+- przeżywalność statków zwycięzcy według długości (ile statków danej długości
+  zostało na wodzie na koniec gry; flota przegranego jest zawsze zatopiona).
+
+Plik jest mapowany w pamięć i przetwarzany paczkami po `chunk_games` gier: obszar
+paczki to jedna tablica uint32 bez kopii (numpy.frombuffer), z której strzały i statki
+wybieramy indeksami, więc zużycie pamięci zależy od rozmiaru paczki, a nie pliku.
+Pliki są rozdzielane na pulę procesów, a częściowe ShotStats scalane przez merge().
+
+Wyniki zapisujemy jako CSV (write_csv) – mapy pól jako siatki size×size, które
+gui.draw_grid(..., heatmap=...) rysuje jako nakładkę (--show).
+
+Uruchomienie:
+    python -m analytics mecze.bin [inne.bin ...] [--workers 4] [--out statystyki]
+                        [--show first_shots|fleet_cells]
+"""
+
+import argparse
+import csv
+import functools
+import multiprocessing
+import os
+import time
+
+import numpy as np
+
+from board import BOARD_SIZE
+from matchlog import MatchLog
+
+CHUNK_GAMES = 16_384   # gier w jednej paczce (ogranicza pamięć roboczą)
+
+# Rekord statku w dzienniku to dwa słowa uint32: pole początkowe oraz
+# długość (bity 0–15) i orientacja (bajt 2, 'H'/'V') – patrz matchlog.encode_game
+_SHIP_WORDS = 2
+_ORIENT_V = ord("V")
+
+HEATMAPS = ("first_shots", "fleet_cells")
+
+
+class ShotStats:
+    """
+    Zagregowane statystyki strzałów; częściowe wyniki łączymy merge().
+
+    Parametry:
+    ----------
+    size : int
+        Rozmiar planszy (z nagłówka dziennika).
+
+    Atrybuty:
+    ----------
+    games, shots : int
+        Liczba pełnych gier i strzałów.
+    first_shots : numpy.ndarray
+        size*size liczników: pole pierwszego strzału gracza.
+    fleet_cells : numpy.ndarray
+        size*size liczników: ile razy pole zajmował statek (znane floty).
+    turn_shots, turn_hits : numpy.ndarray
+        Strzały i trafienia według numeru tury gracza (0 – pierwszy strzał).
+    winner_shots : numpy.ndarray
+        Histogram: winner_shots[k] – liczba gier wygranych k-tym strzałem zwycięzcy.
+    ships_total, ships_afloat : numpy.ndarray
+        Według długości: statki zwycięzców oraz te z nich, które nie zostały zatopione.
+    """
+
+    def __init__(self, size=BOARD_SIZE):
+        cells = size * size
+        self.size = size
+        self.games = 0
+        self.shots = 0
+        self.first_shots = np.zeros(cells, np.int64)
+        self.fleet_cells = np.zeros(cells, np.int64)
+        self.turn_shots = np.zeros(cells, np.int64)
+        self.turn_hits = np.zeros(cells, np.int64)
+        self.winner_shots = np.zeros(cells + 1, np.int64)
+        self.ships_total = np.zeros(size + 1, np.int64)
+        self.ships_afloat = np.zeros(size + 1, np.int64)
+
+    def merge(self, other):
+        """
+        Dolicza statystyki `other` do bieżących (kolejność łączenia bez znaczenia).
+
+        Wyjątki:
+        ----------
+        ValueError
+            Statystyki dotyczą plansz różnej wielkości.
+        """
+        if other.size != self.size:
+            raise ValueError(f"Różne rozmiary plansz: {self.size} i {other.size}")
+        self.games += other.games
+        self.shots += other.shots
+        for name in ("first_shots", "fleet_cells", "turn_shots", "turn_hits",
+                     "winner_shots", "ships_total", "ships_afloat"):
+            getattr(self, name)[:] += getattr(other, name)
+        return self
+
+    def hit_rate(self):
+        """
+        Skuteczność według numeru tury (NaN dla tur, w których nikt nie strzelał).
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.turn_hits / self.turn_shots
+
+    def survival(self):
+        """
+        Odsetek statków zwycięzcy danej długości, które przetrwały grę (NaN – brak statków).
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.ships_afloat / self.ships_total
+
+    def heatmap(self, name):
+        """
+        Mapa `name` ("first_shots" albo "fleet_cells") jako tablica size×size
+        znormalizowana do 0..1 – gotowa dla gui.draw_grid(..., heatmap=...).
+        """
+        counts = getattr(self, name).reshape(self.size, self.size)
+        top = counts.max()
+        return counts / top if top else counts.astype(float)
+
+
+def _segments(starts, counts):
+    """
+    Indeksy wszystkich elementów segmentów [starts[i], starts[i] + counts[i]) oraz
+    numer segmentu i pozycja w segmencie dla każdego z nich.
+    """
+    total = int(counts.sum())
+    owner = np.repeat(np.arange(len(counts)), counts)
+    first = np.cumsum(counts) - counts
+    position = np.arange(total) - first[owner]
+    return starts[owner] + position, owner, position
+
+
+def _add_chunk(stats, words, base, headers):
+    """
+    Dolicza do `stats` paczkę gier. `words` – obszar paczki jako uint32 zaczynający
+    się w bajcie `base` pliku, `headers` – krotki z MatchLog.headers().
+    """
+    size = stats.size
+    cells = size * size
+    head = np.array(headers, np.int64).reshape(-1, 6)
+    ships_at, shots_at, counts, ships_a, ships_b, winners = head.T
+    games = len(head)
+
+    # Strzały: słowo (pole << 3) | (gracz << 2) | (zatopienie << 1) | trafienie
+    index, game, turn_in_game = _segments((shots_at - base) // 4, counts)
+    shots = words[index]
+    cell = (shots >> 3).astype(np.int64)
+    player = ((shots >> 2) & 1).astype(np.int64)
+    hit = (shots & 1).astype(bool)
+
+    # Numer tury gracza: ile jego strzałów padło wcześniej w tej grze
+    b_shots = np.bincount(game, weights=player, minlength=games).astype(np.int64)
+    b_turn = np.cumsum(player) - player - (np.cumsum(b_shots) - b_shots)[game]
+    turn = np.where(player == 1, b_turn, turn_in_game - b_turn)
+    turn = np.minimum(turn, cells - 1)
+
+    stats.games += games
+    stats.shots += len(cell)
+    stats.first_shots += np.bincount(cell[turn == 0], minlength=cells)
+    stats.turn_shots += np.bincount(turn, minlength=cells)
+    stats.turn_hits += np.bincount(turn[hit], minlength=cells)
+
+    finished = winners >= 0
+    by_winner = np.where(winners == 1, b_shots, counts - b_shots)
+    stats.winner_shots += np.bincount(np.minimum(by_winner[finished], cells), minlength=cells + 1)
+
+    # Statki: rozwijamy każdy na jego pola (krok 1 poziomo, size pionowo)
+    fleets = ships_a + ships_b
+    if not fleets.any():
+        return
+    _, ship_game, ship_in_game = _segments(np.zeros(games, np.int64), fleets)
+    record = (ships_at[ship_game] - base) // 4 + ship_in_game * _SHIP_WORDS
+    start = words[record].astype(np.int64)
+    meta = words[record + 1]
+    length = (meta & 0xFFFF).astype(np.int64)
+    step = np.where(((meta >> 16) & 0xFF) == _ORIENT_V, size, 1)
+    side = (ship_in_game >= ships_a[ship_game]).astype(np.int64)
+
+    _, ship_of_cell, k = _segments(start, length)
+    ship_cells = start[ship_of_cell] + k * step[ship_of_cell]
+    stats.fleet_cells += np.bincount(ship_cells, minlength=cells)
+
+    # Przeżywalność: statek zwycięzcy przetrwał, jeśli któreś jego pole nie zostało
+    # trafione przez przeciwnika
+    mine = finished[ship_game] & (side == winners[ship_game])
+    if not mine.any():
+        return
+    enemy_hits = hit & (player != winners[game]) & finished[game]
+    hit_keys = np.unique(game[enemy_hits] * cells + cell[enemy_hits])
+    cell_keys = ship_game[ship_of_cell] * cells + ship_cells
+    cell_hit = np.isin(cell_keys, hit_keys)
+    hits_per_ship = np.bincount(ship_of_cell, weights=cell_hit, minlength=len(start))
+    afloat = hits_per_ship < length
+    stats.ships_total += np.bincount(length[mine], minlength=size + 1)[:size + 1]
+    stats.ships_afloat += np.bincount(length[mine & afloat], minlength=size + 1)[:size + 1]
+
+
+def analyze_file(path, chunk_games=CHUNK_GAMES):
+    """
+    Statystyki jednego dziennika, liczone paczkami po `chunk_games` gier.
+
+    Zwraca:
+    --------
+    ShotStats
+    """
+    with MatchLog(path) as log:
+        stats = ShotStats(log.size)
+        headers = log.headers()
+        while True:
+            chunk = []
+            for header in headers:
+                chunk.append(header)
+                if len(chunk) == chunk_games:
+                    break
+            if not chunk:
+                break
+            # Obszar od statków pierwszej gry do końca strzałów ostatniej – bez kopii
+            base = chunk[0][0]
+            end = chunk[-1][1] + chunk[-1][2] * 4
+            words = np.frombuffer(log.buffer, "<u4", (end - base) // 4, base)
+            _add_chunk(stats, words, base, chunk)
+            del words   # widok na mmap musi zniknąć przed zamknięciem pliku
+            if len(chunk) < chunk_games:
+                break
+    return stats
+
+
+def analyze(paths, workers=1, chunk_games=CHUNK_GAMES, progress=None):
+    """
+    Statystyki wszystkich dzienników `paths`; pliki są rozdzielane na `workers` procesów.
+
+    Parametry:
+    ----------
+    paths : list[str]
+        Pliki zapisane przez matchlog.MatchLogWriter.
+    workers : int
+        Liczba procesów; 1 – wszystko w bieżącym procesie.
+    chunk_games : int
+        Rozmiar paczki gier.
+    progress : callable lub None
+        Wywoływane jako progress(stats) po każdym scalonym pliku.
+
+    Zwraca:
+    --------
+    ShotStats lub None
+        None, jeśli lista plików jest pusta.
+    """
+    total = None
+    task = functools.partial(analyze_file, chunk_games=chunk_games)
+    if workers <= 1 or len(paths) <= 1:
+        results = map(task, paths)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(min(workers, len(paths)))
+        results = pool.imap_unordered(task, paths)
+    try:
+        for part in results:
+            total = part if total is None else total.merge(part)
+            if progress:
+                progress(total)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return total
+
+
+def write_csv(stats, out_dir):
+    """
+    Zapisuje statystyki do katalogu `out_dir`:
+    first_shots.csv i fleet_cells.csv (siatki size×size z licznikami), turns.csv,
+    shots_to_win.csv i survival.csv (tabele z nagłówkiem).
+
+    Zwraca:
+    --------
+    list[str]
+        Ścieżki zapisanych plików.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    written = []
+    for name in HEATMAPS:
+        path = os.path.join(out_dir, name + ".csv")
+        np.savetxt(path, getattr(stats, name).reshape(stats.size, stats.size), fmt="%d", delimiter=",")
+        written.append(path)
+
+    tables = {
+        "turns.csv": (["turn", "shots", "hits", "hit_rate"],
+                      [(t, stats.turn_shots[t], stats.turn_hits[t], rate)
+                       for t, rate in enumerate(stats.hit_rate()) if stats.turn_shots[t]]),
+        "shots_to_win.csv": (["shots", "games"],
+                             [(k, n) for k, n in enumerate(stats.winner_shots) if n]),
+        "survival.csv": (["length", "ships", "afloat", "survival"],
+                         [(length, stats.ships_total[length], stats.ships_afloat[length], rate)
+                          for length, rate in enumerate(stats.survival()) if stats.ships_total[length]]),
+    }
+    for name, (header, rows) in tables.items():
+        path = os.path.join(out_dir, name)
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+        written.append(path)
+    return written
+
+
+def load_heatmap(path):
+    """
+    Wczytuje siatkę zapisaną przez write_csv() i normalizuje ją do 0..1.
+    """
+    counts = np.loadtxt(path, delimiter=",", ndmin=2)
+    top = counts.max()
+    return counts / top if top else counts
+
+
+def show_heatmap(heatmap, title):
+    """
+    Otwiera okno z pustą planszą i nakładką `heatmap` (gui.draw_grid); zamyka je
+    zamknięcie okna lub Esc.
+    """
+    import pygame
+    from gui import draw_grid, CELL_SIZE, MARGIN, COLOR_BG
+
+    pygame.init()
+    side = MARGIN * 2 + len(heatmap) * CELL_SIZE
+    screen = pygame.display.set_mode((side, side))
+    pygame.display.set_caption(title)
+    screen.fill(COLOR_BG)
+    draw_grid(screen, (MARGIN, MARGIN), heatmap=heatmap)
+    pygame.display.flip()
+    while True:
+        event = pygame.event.wait()
+        if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+            break
+    pygame.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Statystyki strzałów z dzienników meczów")
+    parser.add_argument("paths", nargs="+", help="pliki dziennika (matchlog)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="liczba procesów")
+    parser.add_argument("--chunk", type=int, default=CHUNK_GAMES, help="gier w jednej paczce")
+    parser.add_argument("--out", default=None, help="katalog na pliki CSV")
+    parser.add_argument("--show", default=None, choices=HEATMAPS, help="pokaż mapę jako nakładkę planszy")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    stats = analyze(args.paths, args.workers, args.chunk)
+    elapsed = time.perf_counter() - start
+
+    print(f"Gry:                {stats.games:,}")
+    print(f"Strzały:            {stats.shots:,}")
+    print(f"Czas:               {elapsed:.2f} s ({stats.shots / max(elapsed, 1e-9):,.0f} strzałów/s)")
+    rate = stats.hit_rate()
+    print("Skuteczność w turach 1/10/20/40: "
+          + " / ".join(f"{rate[t]:.1%}" for t in (0, 9, 19, 39) if t < len(rate) and stats.turn_shots[t]))
+    finished = stats.winner_shots.sum()
+    if finished:
+        mean = (np.arange(len(stats.winner_shots)) * stats.winner_shots).sum() / finished
+        print(f"Strzały zwycięzcy:  {mean:.2f} (mediana "
+              f"{np.searchsorted(np.cumsum(stats.winner_shots), finished / 2)})")
+    survival = stats.survival()
+    print("Przeżywalność statków zwycięzcy: "
+          + (", ".join(f"długość {length}: {survival[length]:.1%}"
+                       for length in range(len(survival)) if stats.ships_total[length])
+             or "brak znanych flot zwycięzców"))
+    if args.out:
+        for path in write_csv(stats, args.out):
+            print(f"Zapisano {path}")
+    if args.show:
+        show_heatmap(stats.heatmap(args.show), f"Statki – {args.show}")
+
+
+if __name__ == "__main__":
+    main()
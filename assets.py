@@ -0,0 +1,330 @@
+"""
+assets.py
+
+Ładowanie zasobów (dźwięki, muzyka, czcionki) w tle, tak żeby okno i menu sieci
+pojawiały się od razu, a nie po zdekodowaniu wszystkich plików MP3.
+
+- AssetManager – wątki robocze (concurrent.futures) tylko czytają pliki i zapisują
+  pamięć podręczną, a obiekty SDL (mikser, Sound, Font) powstają w wątku głównym,
+  który też dekoduje MP3 przy braku wpisu w pamięci podręcznej; sound() nie czeka
+  na wątki – dźwięk, którego plik jeszcze się czyta, jest NullSound,
+- brak urządzenia audio albo pliku nie przerywa gry: w miejsce dźwięku dostajemy
+  NullSound, który nic nie odtwarza,
+- zdekodowane dźwięki zapisujemy w katalogu podręcznym jako surowe próbki PCM
+  (w formacie miksera); kolejne uruchomienie tworzy Sound z bufora bez dekodowania,
+- StartupTimer mierzy etapy startu (także te w tle) i drukuje ich zestawienie.
+
+Porównanie dekodowania MP3 z odczytem z pamięci podręcznej: python -m benchmarks.assets
+"""
+
+import concurrent.futures
+import io
+import os
+import sys
+import threading
+import time
+import weakref
+
+import pygame
+
+SOUND_DIR = "sounds"
+ASSET_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "statki")
+
+
+class NullSound:
+    """
+    Zastępnik pygame.mixer.Sound, gdy nie ma urządzenia audio albo pliku dźwięku.
+    """
+
+    def play(self, *args, **kwargs):
+        return None
+
+    def stop(self):
+        pass
+
+    def set_volume(self, value):
+        pass
+
+    def get_length(self):
+        return 0.0
+
+
+class StartupTimer:
+    """
+    Czasy kolejnych etapów startu liczone od utworzenia obiektu.
+
+    Etapy mogą być mierzone w dowolnym wątku (stage() jako menedżer kontekstu albo
+    add() z gotowym czasem); report() zwraca zestawienie posortowane po chwili startu.
+    """
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.stages = []   # (nazwa, początek, czas trwania, wątek) w sekundach
+        self._lock = threading.Lock()
+
+    def add(self, name, start, duration):
+        """
+        Zapisuje etap `name`, który zaczął się w chwili `start` (perf_counter) i trwał `duration` s.
+        """
+        with self._lock:
+            self.stages.append((name, start - self.origin, duration, threading.current_thread().name))
+
+    def stage(self, name):
+        """
+        Menedżer kontekstu mierzący blok kodu jako etap `name`.
+        """
+        return _Stage(self, name)
+
+    def mark(self, name):
+        """
+        Zapisuje chwilę `name` (etap o zerowym czasie trwania), np. pierwszą klatkę.
+        """
+        self.add(name, time.perf_counter(), 0.0)
+
+    def report(self):
+        """
+        Zestawienie etapów: początek i czas trwania (ms) oraz wątek.
+
+        Zwraca:
+        --------
+        str
+            Wielowierszowy tekst gotowy do wydrukowania.
+        """
+        with self._lock:
+            stages = sorted(self.stages, key=lambda stage: stage[1])
+        lines = ["Start aplikacji (ms od uruchomienia):"]
+        for name, start, duration, thread in stages:
+            where = "" if thread == "MainThread" else f"  [{thread}]"
+            lines.append(f"  {start * 1000:8.1f}  {duration * 1000:8.1f}  {name}{where}")
+        return "\n".join(lines)
+
+
+class _Stage:
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.timer.add(self.name, self.start, time.perf_counter() - self.start)
+        return False
+
+
+class AssetManager:
+    """
+    Ładuje zasoby gry, zlecając wątkom tła tylko pracę bez obiektów SDL.
+
+    Inicjalizacja podsystemów SDL nie jest bezpieczna między wątkami, dlatego mikser
+    (pygame.mixer.init()), muzyka oraz wszystkie obiekty pygame.mixer.Sound
+    i pygame.font.Font powstają w wątku głównym. Wątki tła tylko czytają pliki (surowe
+    próbki PCM z pamięci podręcznej, plik czcionki wskazany przez
+    pygame.sysfont.match_font()) i zapisują do pamięci podręcznej próbki, które wątek
+    główny zdekodował z MP3, gdy wpisu jeszcze nie było – dekodowanie płacimy więc
+    w wątku głównym tylko przy pierwszym uruchomieniu. Wywołujący nie powinien wołać
+    pygame.init() – wystarczy pygame.display.init().
+
+    Parametry:
+    ----------
+    sound_dir : str
+        Katalog z plikami dźwięków (nazwa "hit" → sound_dir/hit.mp3).
+    cache_dir : str lub None
+        Katalog podręczny zdekodowanych dźwięków; None wyłącza pamięć podręczną.
+    timer : StartupTimer lub None
+        Gdzie zapisywać czasy ładowania poszczególnych zasobów.
+
+    Atrybuty:
+    ----------
+    audio : bool
+        True, jeśli mikser działa (jest urządzenie audio).
+    """
+
+    def __init__(self, sound_dir=SOUND_DIR, cache_dir=ASSET_CACHE_DIR, timer=None):
+        self.sound_dir = sound_dir
+        self.cache_dir = cache_dir
+        self.timer = timer or StartupTimer()
+        self.cache_hits = 0
+        self._pool = concurrent.futures.ThreadPoolExecutor(2, thread_name_prefix="assets")
+        self._pcm = {}      # nazwa dźwięku → Future z bajtami PCM lub ścieżką MP3 do zdekodowania
+        self._sounds = {}   # nazwa dźwięku → pygame.mixer.Sound lub NullSound
+        self._font_data = {}   # nazwa czcionki → Future z zawartością pliku (None – domyślna)
+        pygame.font.init()
+        with self.timer.stage("mikser"):
+            try:
+                pygame.mixer.init()
+                self.audio = True
+            except pygame.error:
+                # Brak urządzenia audio – gramy bez dźwięku
+                self.audio = False
+        self._format = pygame.mixer.get_init() if self.audio else None
+
+    def music(self, name, volume=1.0):
+        """
+        Uruchamia muzykę `name` (sound_dir/name.mp3) w pętli; bez dźwięku albo pliku
+        nic nie robi. Muzyka jest odtwarzana strumieniowo, więc load() nie dekoduje
+        całego pliku. Zwraca True, jeśli muzyka gra.
+        """
+        path = os.path.join(self.sound_dir, name + ".mp3")
+        if not self.audio or not os.path.exists(path):
+            return False
+        with self.timer.stage(f"muzyka {name}"):
+            try:
+                pygame.mixer.music.load(path)
+                pygame.mixer.music.set_volume(volume)
+                pygame.mixer.music.play(-1)
+            except pygame.error:
+                return False
+        return True
+
+    def load_sound(self, name):
+        """
+        Zleca w tle odczyt próbek dźwięku `name` (sound_dir/name.mp3) z pamięci podręcznej.
+
+        Zwraca:
+        --------
+        concurrent.futures.Future
+            Bajty PCM w formacie miksera, ścieżka MP3 (str), jeśli wpisu w pamięci
+            podręcznej nie ma i dźwięk trzeba zdekodować w wątku głównym, albo None
+            (brak dźwięku lub pliku).
+        """
+        future = self._pcm.get(name)
+        if future is None:
+            future = self._pcm[name] = self._pool.submit(self._read_sound, name)
+        return future
+
+    def sound(self, name):
+        """
+        Dźwięk `name` gotowy do odtworzenia – bez czekania; wywoływane z wątku głównego.
+
+        Przy braku wpisu w pamięci podręcznej dekoduje MP3 tutaj (w wątku głównym),
+        a zapis próbek zleca wątkowi tła.
+
+        Zwraca:
+        --------
+        pygame.mixer.Sound lub NullSound
+            NullSound, dopóki plik się czyta (dźwięk po prostu nie zagra),
+            i na stałe, jeśli dźwięku nie udało się wczytać.
+        """
+        sound = self._sounds.get(name)
+        if sound is not None:
+            return sound
+        future = self.load_sound(name)
+        if not future.done():
+            return NullSound()
+        data = ready(future)
+        if isinstance(data, str):
+            sound = self._decode(name, data)
+        else:
+            sound = pygame.mixer.Sound(buffer=data) if data else NullSound()
+        self._sounds[name] = sound
+        return sound
+
+    def _decode(self, name, path):
+        with self.timer.stage(f"dźwięk {name} (dekodowanie)"):
+            try:
+                sound = pygame.mixer.Sound(path)
+            except pygame.error:
+                return NullSound()
+        if self.cache_dir:
+            self._pool.submit(self._store, self._cache_path(path), sound.get_raw())
+        return sound
+
+    def _cache_path(self, path):
+        """
+        Plik podręczny dla `path` – nazwa zawiera rozmiar i czas modyfikacji źródła
+        oraz format miksera, więc zmiana któregokolwiek unieważnia wpis.
+        """
+        stat = os.stat(path)
+        freq, fmt, channels = self._format
+        name = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(self.cache_dir,
+                            f"{name}-{stat.st_size}-{stat.st_mtime_ns}-{freq}-{fmt}-{channels}.pcm")
+
+    def _read_sound(self, name):
+        path = os.path.join(self.sound_dir, name + ".mp3")
+        if not self.audio or not os.path.exists(path):
+            return None
+        cached = self._cache_path(path) if self.cache_dir else None
+        if not cached or not os.path.exists(cached):
+            # Dekodowanie tworzy obiekt SDL, więc zostawiamy je wątkowi głównemu
+            return path
+        start = time.perf_counter()
+        with open(cached, "rb") as f:
+            data = f.read()
+        self.cache_hits += 1
+        self.timer.add(f"dźwięk {name} (pamięć podręczna)", start, time.perf_counter() - start)
+        return data
+
+    def _store(self, cached, data):
+        """
+        Zapisuje próbki do pamięci podręcznej (atomowo: plik tymczasowy + os.replace).
+        Błąd zapisu (np. katalog tylko do odczytu) tylko wyłącza pamięć podręczną.
+        """
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = f"{cached}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, cached)
+        except OSError:
+            pass
+
+    def load_font(self, name):
+        """
+        Zleca w tle wyszukanie czcionki systemowej `name` i odczyt jej pliku
+        (Future z bajtami pliku albo None – wtedy użyjemy czcionki domyślnej Pygame).
+        """
+        future = self._font_data.get(name)
+        if future is None:
+            future = self._font_data[name] = self._pool.submit(self._read_font, name)
+        return future
+
+    def _read_font(self, name):
+        with self.timer.stage(f"czcionka {name}"):
+            path = pygame.sysfont.match_font(name)
+            if path is None:
+                return None
+            with open(path, "rb") as f:
+                return f.read()
+
+    def font(self, name, size):
+        """
+        Czcionka `name` w rozmiarze `size` (pygame.font.Font) – tworzona w wątku
+        głównym; czeka, aż wątek tła odczyta plik.
+        """
+        future = self.load_font(name)
+        concurrent.futures.wait([future])
+        data = ready(future)
+        return pygame.font.Font(io.BytesIO(data) if data else None, size)
+
+    def shutdown(self):
+        """
+        Kończy wątki robocze (czeka na rozpoczęte zadania).
+        """
+        self._pool.shutdown()
+
+
+_reported = weakref.WeakSet()   # zadania, których błąd już wypisaliśmy
+
+
+def ready(future, default=None):
+    """
+    Wynik `future`, jeśli jest już gotowy, w przeciwnym razie `default` – bez czekania
+    (np. dźwięk, który jeszcze się dekoduje, po prostu nie zostanie odtworzony).
+
+    Jeśli zadanie zakończyło się wyjątkiem (np. OSError przy odczycie pamięci
+    podręcznej), zwraca `default`, a błąd wypisuje na stderr tylko za pierwszym razem –
+    błąd zasobu nie może przerwać pętli gry.
+    """
+    if not future.done():
+        return default
+    error = future.exception()
+    if error is None:
+        return future.result()
+    if future not in _reported:
+        _reported.add(future)
+        print(f"Nie udało się wczytać zasobu: {error!r}", file=sys.stderr)
+    return default
@@ -0,0 +1,176 @@
+"""
+batch_board.py
+
+Moduł z klasą BatchBoard – wsadowym silnikiem planszy dla wielu równoległych gier.
+
+Stan N gier trzymamy w ciągłych tablicach NumPy, a strzały (po jednym na grę)
+rozstrzygamy jednym, zwektoryzowanym wywołaniem. Semantyka jest identyczna
+z Board.receive_attack() i Board.all_sunk(), łącznie z przypadkiem
+„w to pole już strzelano” (hit = None w Board, tutaj hit = -1).
+"""
+
+import numpy as np
+
+from board import BOARD_SIZE, SHIPS, random_fleets
+
+# Kody stanu pola w tablicy `state`
+WATER = 0
+SHIP = 1
+HIT = 2
+MISS = 3
+
+# Znaki odpowiadające kodom – do budowy widoku zgodnego z Board.grid
+CELL_CHARS = ("~", "S", "X", "O")
+
+
+class BatchBoard:
+    """
+    N plansz „Statków” w tablicach NumPy.
+
+    Atrybuty:
+    ----------
+    state : numpy.ndarray, uint8, kształt (N, BOARD_SIZE, BOARD_SIZE)
+        Stan pól: WATER, SHIP, HIT lub MISS.
+    ship_id : numpy.ndarray, int8, kształt (N, BOARD_SIZE, BOARD_SIZE)
+        Numer statku zajmującego pole (indeks w kolejności ustawiania) albo -1.
+    ship_length : numpy.ndarray, int16, kształt (N, max_ships)
+        Długości statków każdej gry (0 dla nieużytych slotów).
+    ship_hits : numpy.ndarray, int16, kształt (N, max_ships)
+        Liczniki trafień każdego statku; statek jest zatopiony, gdy ship_hits == ship_length.
+    cells_remaining : numpy.ndarray, int32, kształt (N,)
+        Liczba nietrafionych pól statków w każdej grze.
+    """
+
+    def __init__(self, n, max_ships=len(SHIPS)):
+        """
+        Tworzy N pustych plansz (same pola wody).
+
+        Parametry:
+        ----------
+        n : int
+            Liczba gier.
+        max_ships : int
+            Maksymalna liczba statków na planszy.
+        """
+        self.n = n
+        self.state = np.zeros((n, BOARD_SIZE, BOARD_SIZE), dtype=np.uint8)
+        self.ship_id = np.full((n, BOARD_SIZE, BOARD_SIZE), -1, dtype=np.int8)
+        self.ship_length = np.zeros((n, max_ships), dtype=np.int16)
+        self.ship_hits = np.zeros((n, max_ships), dtype=np.int16)
+        self.cells_remaining = np.zeros(n, dtype=np.int32)
+        self._ship_count = np.zeros(n, dtype=np.int16)
+        # Płaskie widoki (N, BOARD_SIZE*BOARD_SIZE) – bez kopiowania danych
+        self._state_flat = self.state.reshape(n, -1)
+        self._ship_id_flat = self.ship_id.reshape(n, -1)
+        self._games = np.arange(n)
+
+    @classmethod
+    def from_boards(cls, boards):
+        """
+        Buduje BatchBoard z listy obiektów Board (kopiując ich statki i strzały).
+        """
+        max_ships = max((len(b.ships) for b in boards), default=0) or 1
+        batch = cls(len(boards), max_ships)
+        for game, board in enumerate(boards):
+            for ship in board.ships:
+                batch.place_ship(game, ship.row, ship.col, ship.length, ship.orient)
+            for r, row in enumerate(board.grid):
+                for c, val in enumerate(row):
+                    if val in ("X", "O"):
+                        batch.receive_attacks(np.array([r]), np.array([c]), games=np.array([game]))
+        return batch
+
+    @classmethod
+    def random(cls, n, ships=SHIPS, rng=None):
+        """
+        Tworzy N gier z losowymi flotami (board.random_fleets – to samo ziarno,
+        te same rozstawienia).
+        """
+        batch = cls(n, len(ships))
+        layouts = random_fleets(n, ships, rng)
+        games, cells, sids = [], [], []
+        # Maski → indeksy pól: odcinamy najniższy ustawiony bit, aż maska się wyzeruje
+        for game, layout in enumerate(layouts):
+            for sid, mask in enumerate(layout):
+                while mask:
+                    low = mask & -mask
+                    games.append(game)
+                    cells.append(low.bit_length() - 1)
+                    sids.append(sid)
+                    mask ^= low
+        batch._state_flat[games, cells] = SHIP
+        batch._ship_id_flat[games, cells] = sids
+        batch.ship_length[:] = [length for _, length in ships]
+        batch.cells_remaining[:] = sum(length for _, length in ships)
+        batch._ship_count[:] = len(ships)
+        return batch
+
+    def place_ship(self, game, row, col, length, orient):
+        """
+        Umieszcza statek w grze nr `game` – odpowiednik Board.place_ship().
+        """
+        sid = self._ship_count[game]
+        if orient == "H":
+            self.state[game, row, col:col + length] = SHIP
+            self.ship_id[game, row, col:col + length] = sid
+        else:  # orientacja "V"
+            self.state[game, row:row + length, col] = SHIP
+            self.ship_id[game, row:row + length, col] = sid
+        self.ship_length[game, sid] = length
+        self.cells_remaining[game] += length
+        self._ship_count[game] += 1
+
+    def receive_attacks(self, rows, cols, games=None):
+        """
+        Rozstrzyga jeden strzał w każdej z wybranych gier jednym wywołaniem.
+
+        Parametry:
+        ----------
+        rows, cols : numpy.ndarray[int]
+            Współrzędne strzałów (po jednym na grę).
+        games : numpy.ndarray[int] lub None
+            Numery gier, których dotyczą strzały (bez powtórzeń); None = wszystkie N gier.
+
+        Zwraca:
+        --------
+        (hit, sunk, gameover) : tuple[numpy.ndarray, ...]
+            hit : int8 – 1 trafienie, 0 pudło, -1 pole już wcześniej ostrzelane
+                  (odpowiednik hit = None w Board.receive_attack),
+            sunk : bool – czy trafienie zatopiło statek,
+            gameover : bool – stan all_sunk() danej gry po strzale.
+        """
+        if games is None:
+            games = self._games
+        flat = np.asarray(rows) * BOARD_SIZE + np.asarray(cols)
+        cell = self._state_flat[games, flat]
+
+        is_hit = cell == SHIP
+        is_miss = cell == WATER
+
+        hit_games = games[is_hit]
+        hit_flat = flat[is_hit]
+        self._state_flat[hit_games, hit_flat] = HIT
+        self._state_flat[games[is_miss], flat[is_miss]] = MISS
+
+        sids = self._ship_id_flat[hit_games, hit_flat]
+        self.ship_hits[hit_games, sids] += 1
+        self.cells_remaining[hit_games] -= 1
+
+        sunk = np.zeros(len(games), dtype=bool)
+        sunk[is_hit] = self.ship_hits[hit_games, sids] == self.ship_length[hit_games, sids]
+
+        hit = is_hit.astype(np.int8)
+        hit[~(is_hit | is_miss)] = -1
+        return hit, sunk, self.cells_remaining[games] == 0
+
+    def all_sunk(self):
+        """
+        Zwraca tablicę bool (N,) – True dla gier, w których nie został żaden nietrafiony statek.
+        """
+        return self.cells_remaining == 0
+
+    def grid(self, game):
+        """
+        Widok planszy gry nr `game` w formacie Board.grid (lista list '~','S','X','O').
+        """
+        return [[CELL_CHARS[v] for v in row] for row in self.state[game].tolist()]
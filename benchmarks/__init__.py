@@ -0,0 +1,10 @@
+"""
+Pakiet z benchmarkami wydajności gry „Statki”.
+
+Każdy moduł uruchamiamy z katalogu głównego projektu, np.:
+    python -m benchmarks.fleet
+
+Cały zestaw gorących ścieżek (plansza, gra, sieć, rysowanie) z wynikiem JSON
+i porównaniem z bazą:
+    python -m benchmarks --json wynik.json [--baseline baza.json]
+"""
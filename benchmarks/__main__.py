@@ -0,0 +1,419 @@
+"""
+benchmarks/__main__.py
+
+Zestaw benchmarków gorących ścieżek uruchamiany jednym poleceniem:
+- board.* – Board.can_place / place_ship / receive_attack / all_sunk,
+- game.simulate – pełna gra simulate.play_game (hunt kontra random),
+- network.* – send_json + try_receive_from_buffer (oraz Connection + FrameReader)
+  na lokalnej parze gniazd,
+- render.* – gui.draw_grid i gui.BoardRenderer na sterowniku SDL "dummy" oraz klatka
+  fazy ustawiania (pasek informacyjny + podgląd statku) z liczbą powierzchni
+  tworzonych na klatkę (gui.SURFACES).
+
+Każdy przypadek ma stałe ziarno, przebiegi rozgrzewkowe i `--repeats` pomiarów;
+podajemy medianę, minimum i odchylenie czasu jednej operacji. Wynik można zapisać
+jako JSON (--json) i porównać z zapisanym wcześniej (--baseline): przypadek, którego
+mediana (albo minimum – --stat min, stabilniejsze na zaszumionych maszynach
+wirtualnych) wzrosła o więcej niż --threshold, albo klatka, która tworzy więcej
+powierzchni niż w bazie, jest zgłaszany jako regresja, a program kończy się kodem 1.
+
+Uruchomienie:
+    python -m benchmarks [--filter board] [--repeats 7] [--warmup 2] [--seed 1]
+                         [--json wynik.json] [--baseline baza.json] [--threshold 0.15]
+                         [--stat median|min]
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import socket
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+import pygame
+
+from board import Board, BOARD_SIZE, SHIPS
+from network import Connection, FrameReader, send_json, try_receive_from_buffer
+from simulate import play_game
+from strategies import STRATEGIES
+from gui import (
+    SURFACES,
+    BoardRenderer,
+    TextCache,
+    draw_grid,
+    draw_info_bar,
+    draw_preview,
+    info_text,
+    COLOR_TEXT,
+    MARGIN,
+    WINDOW_HEIGHT,
+    WINDOW_WIDTH,
+)
+
+FORMAT_VERSION = 1   # wersja formatu pliku JSON z wynikami
+CELLS = [(r, c) for r in range(BOARD_SIZE) for c in range(BOARD_SIZE)]
+
+
+def random_fleets(seed, count):
+    """
+    `count` flot (listy krotek row, col, length, orient) z ustalonego ziarna.
+    """
+    rng = random.Random(seed)
+    return [[(s.row, s.col, s.length, s.orient) for s in Board.random_fleet(rng=rng).ships]
+            for _ in range(count)]
+
+
+def build(fleet):
+    board = Board()
+    for ship in fleet:
+        board.place_ship(*ship)
+    return board
+
+
+# Każdy przypadek: case(seed) → (prepare, ops). prepare() przygotowuje świeży stan
+# poza pomiarem i zwraca funkcję bez argumentów, której czas mierzymy; ops – liczba
+# operacji w jednym wywołaniu (wynik podajemy na operację).
+
+def case_can_place(seed):
+    boards = [build(fleet) for fleet in random_fleets(seed, 20)]
+    lengths = sorted({length for _, length in SHIPS})
+
+    def run():
+        for board in boards:
+            for r, c in CELLS:
+                for length in lengths:
+                    board.can_place(r, c, length, "H")
+                    board.can_place(r, c, length, "V")
+
+    return (lambda: run), len(boards) * len(CELLS) * len(lengths) * 2
+
+
+def case_place_ship(seed):
+    fleets = random_fleets(seed, 200)
+
+    def prepare():
+        boards = [Board() for _ in fleets]
+
+        def run():
+            for board, fleet in zip(boards, fleets):
+                for ship in fleet:
+                    board.place_ship(*ship)
+        return run
+
+    return prepare, sum(len(fleet) for fleet in fleets)
+
+
+def case_receive_attack(seed):
+    fleets = random_fleets(seed, 50)
+    order = CELLS[:]
+    random.Random(seed).shuffle(order)
+
+    def prepare():
+        boards = [build(fleet) for fleet in fleets]
+
+        def run():
+            for board in boards:
+                for r, c in order:
+                    board.receive_attack(r, c)
+        return run
+
+    return prepare, len(fleets) * len(order)
+
+
+def case_all_sunk(seed):
+    boards = [build(fleet) for fleet in random_fleets(seed, 50)]
+    calls = 200
+
+    def run():
+        for board in boards:
+            for _ in range(calls):
+                board.all_sunk()
+
+    return (lambda: run), len(boards) * calls
+
+
+def case_simulate(seed):
+    games = 50
+    hunt, rand = STRATEGIES["hunt"], STRATEGIES["random"]
+
+    def prepare():
+        # Nowy generator w każdym powtórzeniu – te same gry w każdym pomiarze
+        rng = random.Random(seed)
+        setups = [(Board.random_fleet(rng=rng), Board.random_fleet(rng=rng)) for _ in range(games)]
+
+        def run():
+            for board_a, board_b in setups:
+                play_game(board_a, board_b, hunt(rng), rand(rng))
+        return run
+
+    return prepare, games
+
+
+def _attacks(seed, count):
+    rng = random.Random(seed)
+    return [{"type": "attack", "row": rng.randrange(BOARD_SIZE), "col": rng.randrange(BOARD_SIZE)}
+            for _ in range(count)]
+
+
+BATCH = 64   # wiadomości wysyłanych przed odbiorem (mieszczą się w buforze gniazda)
+
+
+def case_json_socket(seed):
+    messages = _attacks(seed, 2048)
+
+    def prepare():
+        sender, receiver = socket.socketpair()
+        receiver.setblocking(False)
+
+        def run():
+            buffer = ""
+            try:
+                for start in range(0, len(messages), BATCH):
+                    batch = messages[start:start + BATCH]
+                    for msg in batch:
+                        send_json(sender, msg)
+                    received = 0
+                    while received < len(batch):
+                        got, buffer = try_receive_from_buffer(receiver, buffer)
+                        received += len(got)
+            finally:
+                sender.close()
+                receiver.close()
+        return run
+
+    return prepare, len(messages)
+
+
+def case_connection_socket(seed):
+    messages = _attacks(seed, 2048)
+
+    def prepare():
+        a, b = socket.socketpair()
+        a.setblocking(False)
+        b.setblocking(False)
+        sender = Connection(a)
+        reader = FrameReader()
+
+        def run():
+            try:
+                for start in range(0, len(messages), BATCH):
+                    batch = messages[start:start + BATCH]
+                    for msg in batch:
+                        sender.send(msg, flush=False)
+                    sender.flush()
+                    received = 0
+                    while received < len(batch):
+                        received += len(reader.receive(b))
+            finally:
+                a.close()
+                b.close()
+        return run
+
+    return prepare, len(messages)
+
+
+def _matrices(seed, count):
+    """
+    Macierze plansz w połowie gry: flota i połowa pól ostrzelana.
+    """
+    matrices = []
+    rng = random.Random(seed)
+    for fleet in random_fleets(seed, count):
+        board = build(fleet)
+        for r, c in rng.sample(CELLS, len(CELLS) // 2):
+            board.receive_attack(r, c)
+        matrices.append([row[:] for row in board.grid])
+    return matrices
+
+
+def case_draw_grid(seed):
+    screen = pygame.display.get_surface()
+    matrices = _matrices(seed, 20)
+
+    def run():
+        for matrix in matrices:
+            draw_grid(screen, (MARGIN, MARGIN), matrix, hide_ships=True)
+
+    return (lambda: run), len(matrices)
+
+
+def case_board_renderer(seed):
+    screen = pygame.display.get_surface()
+    matrices = _matrices(seed, 20)
+
+    def prepare():
+        renderer = BoardRenderer(hide_ships=True)
+
+        def run():
+            # Kolejne plansze różnią się wieloma polami – górna granica kosztu klatki
+            for matrix in matrices:
+                renderer.draw(screen, (MARGIN, MARGIN), matrix)
+        return run
+
+    return prepare, len(matrices)
+
+
+def case_placement_frame(seed):
+    screen = pygame.display.get_surface()
+    cache = TextCache(pygame.font.SysFont("arial", 18))
+    text = info_text("placement", 1, False, 0, SHIPS)
+    length = SHIPS[0][1]
+    frames = 500
+
+    def run():
+        for i in range(frames):
+            r, c = CELLS[i % len(CELLS)]
+            orient = "H" if (i // 100) % 2 == 0 else "V"
+            draw_preview(screen, (MARGIN, MARGIN), r, c, length, orient, c + length <= BOARD_SIZE)
+            draw_info_bar(screen, cache, [(text, COLOR_TEXT)])
+
+    return (lambda: run), frames
+
+
+CASES = {
+    "board.can_place": case_can_place,
+    "board.place_ship": case_place_ship,
+    "board.receive_attack": case_receive_attack,
+    "board.all_sunk": case_all_sunk,
+    "game.simulate": case_simulate,
+    "network.send_json": case_json_socket,
+    "network.connection": case_connection_socket,
+    "render.draw_grid": case_draw_grid,
+    "render.board_renderer": case_board_renderer,
+    "render.placement_frame": case_placement_frame,
+}
+
+
+def measure(case, seed, warmup, repeats):
+    """
+    Uruchamia przypadek: `warmup` przebiegów bez pomiaru i `repeats` mierzonych.
+
+    Zwraca:
+    --------
+    dict
+        Czasy jednej operacji w mikrosekundach (median_us, min_us, stdev_us), liczba
+        operacji w przebiegu oraz powierzchnie gui tworzone na operację (surfaces_per_op).
+    """
+    prepare, ops = case(seed)
+    for _ in range(warmup):
+        prepare()()
+    times = []
+    surfaces = 0
+    for _ in range(repeats):
+        run = prepare()
+        SURFACES.take()   # powierzchnie z przygotowania nie wchodzą do wyniku
+        # Jak timeit: odśmiecanie wyłączone na czas pomiaru, żeby nie zaszumiało wyników
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            run()
+            times.append((time.perf_counter() - start) / ops * 1e6)
+        finally:
+            gc.enable()
+        surfaces += SURFACES.take()
+    return {
+        "median_us": statistics.median(times),
+        "min_us": min(times),
+        "stdev_us": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "ops": ops,
+        "surfaces_per_op": surfaces / (ops * repeats),
+    }
+
+
+def compare(results, baseline, threshold, stat="median"):
+    """
+    Porównuje wyniki z bazą statystyką `stat` ("median" albo "min"); zwraca listę
+    opisów regresji (pusta – brak regresji).
+    """
+    key = stat + "_us"
+    regressions = []
+    for name, res in results.items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            continue
+        ratio = res[key] / base[key]
+        res["vs_baseline"] = ratio
+        if ratio > 1 + threshold:
+            regressions.append(f"{name}: {base[key]:.3f} → {res[key]:.3f} µs/op "
+                               f"(x{ratio:.2f}, {stat})")
+        if res["surfaces_per_op"] > base.get("surfaces_per_op", 0.0) + 1e-9:
+            regressions.append(f"{name}: {base.get('surfaces_per_op', 0.0):.2f} → "
+                               f"{res['surfaces_per_op']:.2f} powierzchni/op")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Zestaw benchmarków gry w statki")
+    parser.add_argument("--filter", default="", help="tylko przypadki, których nazwa zawiera ten tekst")
+    parser.add_argument("--repeats", type=int, default=7, help="liczba mierzonych przebiegów")
+    parser.add_argument("--warmup", type=int, default=2, help="liczba przebiegów rozgrzewkowych")
+    parser.add_argument("--seed", type=int, default=1, help="ziarno danych wejściowych")
+    parser.add_argument("--json", default=None, help="zapisz wyniki do pliku JSON")
+    parser.add_argument("--baseline", default=None, help="plik JSON z wynikami bazowymi")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="dopuszczalny względny wzrost czasu względem bazy")
+    parser.add_argument("--stat", default="median", choices=("median", "min"),
+                        help="statystyka porównywana z bazą")
+    args = parser.parse_args()
+
+    pygame.display.init()
+    pygame.font.init()
+    pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = {}
+    print(f"{'przypadek':<26}{'mediana':>12}{'min':>12}{'odch.':>10}{'pow./op':>9}")
+    for name, case in CASES.items():
+        if args.filter not in name:
+            continue
+        res = measure(case, args.seed, args.warmup, args.repeats)
+        results[name] = res
+        print(f"{name:<26}{res['median_us']:>9.3f} µs{res['min_us']:>9.3f} µs"
+              f"{res['stdev_us']:>7.3f} µs{res['surfaces_per_op']:>9.2f}")
+    pygame.quit()
+
+    regressions = compare(results, baseline, args.threshold, args.stat) if baseline else []
+    if args.json:
+        report = {
+            "version": FORMAT_VERSION,
+            "meta": {
+                "python": platform.python_version(),
+                "implementation": platform.python_implementation(),
+                "machine": platform.machine(),
+                "system": platform.system(),
+                "pygame": pygame.version.ver,
+                "numpy": np.__version__,
+                "seed": args.seed,
+                "repeats": args.repeats,
+                "warmup": args.warmup,
+            },
+            "results": results,
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Zapisano {args.json}")
+
+    if baseline:
+        for name, res in results.items():
+            if "vs_baseline" in res:
+                print(f"{name:<26} x{res['vs_baseline']:.2f} względem bazy")
+        for line in regressions:
+            print(f"REGRESJA: {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+benchmarks/assets.py
+
+Koszt ładowania zasobów przy starcie gry.
+
+- dekodowanie każdego dźwięku z MP3 (pygame.mixer.Sound(plik)) w porównaniu
+  z utworzeniem go z surowych próbek zapisanych przez AssetManager
+  (pygame.mixer.Sound(buffer=...)),
+- czas, przez który wątek główny czeka, zanim może otworzyć okno: dawny start
+  synchroniczny (mikser, trzy dźwięki, dwie czcionki po kolei) w porównaniu
+  z AssetManager, który w wątku głównym inicjalizuje mikser i tworzy dźwięki
+  z próbek, a odczyt plików zleca wątkom tła.
+
+Pamięć podręczna trafia do katalogu tymczasowego, usuwanego po pomiarze.
+
+Uruchomienie:
+    python -m benchmarks.assets [--repeats N]
+"""
+
+import argparse
+import concurrent.futures
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from assets import AssetManager, SOUND_DIR
+
+SOUNDS = ("miss", "hit", "sink")
+
+
+def measure(fn, repeats):
+    """
+    Mediana czasu wykonania `fn()` w ms.
+    """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def sync_start():
+    """
+    Start jak dawniej w main.main: wszystko po kolei w wątku głównym.
+    """
+    pygame.mixer.init()
+    for name in SOUNDS:
+        pygame.mixer.Sound(os.path.join(SOUND_DIR, name + ".mp3"))
+    pygame.font.init()
+    pygame.font.SysFont("arial", 24)
+    pygame.font.SysFont("arial", 18)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ładowania zasobów")
+    parser.add_argument("--repeats", type=int, default=5, help="liczba powtórzeń każdego pomiaru")
+    args = parser.parse_args()
+
+    pygame.display.init()
+    cache_dir = tempfile.mkdtemp(prefix="statki-assets-")
+    try:
+        # Pierwsze uruchomienie dekoduje MP3 w wątku głównym i zapisuje pamięć podręczną
+        warm = AssetManager(cache_dir=cache_dir)
+        for future in [warm.load_sound(name) for name in SOUNDS]:
+            future.result()
+        for name in SOUNDS:
+            warm.sound(name)
+        warm.shutdown()
+        assert warm.cache_hits == 0
+
+        print(f"{'dźwięk':<8}{'MP3':>10}{'PCM':>10}{'rozmiar PCM':>14}")
+        for name in SOUNDS:
+            path = os.path.join(SOUND_DIR, name + ".mp3")
+            cached = warm._cache_path(path)
+            with open(cached, "rb") as f:
+                raw = f.read()
+            decode = measure(lambda: pygame.mixer.Sound(path), args.repeats)
+            load = measure(lambda: pygame.mixer.Sound(buffer=open(cached, "rb").read()), args.repeats)
+            print(f"{name:<8}{decode:>8.1f} ms{load:>7.2f} ms{len(raw) / 1024:>11.0f} KB")
+
+        pygame.mixer.quit()
+        blocking = measure(lambda: (sync_start(), pygame.mixer.quit()), args.repeats)
+
+        def background_start():
+            # Wątek główny czeka tylko na mikser i zlecenie zadań; potem, jak gra,
+            # czeka na pliki i tworzy z nich dźwięki i czcionki – to chwila, gdy
+            # wszystko jest gotowe
+            start = time.perf_counter()
+            manager = AssetManager(cache_dir=cache_dir)
+            futures = [manager.load_sound(name) for name in SOUNDS]
+            manager.load_font("arial")
+            submitted = time.perf_counter() - start
+            concurrent.futures.wait(futures)
+            for name in SOUNDS:
+                manager.sound(name)
+            assert manager.cache_hits == len(SOUNDS)
+            manager.font("arial", 24)
+            manager.font("arial", 18)
+            done = time.perf_counter() - start
+            manager.shutdown()
+            pygame.mixer.quit()
+            return submitted, done
+
+        runs = [background_start() for _ in range(args.repeats)]
+        main_ms = statistics.median(r[0] for r in runs) * 1000
+        total_ms = statistics.median(r[1] for r in runs) * 1000
+        print(f"start synchroniczny: wątek główny czeka {blocking:.1f} ms")
+        print(f"AssetManager:        wątek główny czeka {main_ms:.1f} ms "
+              f"(wszystkie zasoby gotowe po {total_ms:.1f} ms)")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+benchmarks/eventpost.py
+
+Budzenie pętli gry zdarzeniem Pygame z wątku sieciowego (main.NETWORK_EVENT)
+i błąd Pygame 2.6, przez który pętla nie woła pygame.event.peek() bez argumentów.
+
+pygame.event.post() trzyma w kolejce SDL referencję do słownika zdarzenia, a
+pygame.event.peek() bez argumentów tworzy dla pierwszego zdarzenia w kolejce nowy
+obiekt Event, który „przejmuje” ten słownik bez zwiększenia licznika referencji –
+po zwolnieniu obiektu licznik spada o jeden, choć zdarzenie dalej czeka w kolejce.
+Gdy get() albo wait() zwolni je ponownie, słownik jest już zwolniony, a jego pamięć
+zajmują inne obiekty (np. wiadomości odebrane przez wątek sieciowy).
+
+Liczymy utracone referencje słownika wstawionego zdarzenia (trzymamy dodatkowe
+referencje, więc słownik nie zostanie naprawdę zwolniony) po:
+- peek() bez argumentów – błąd Pygame (1 utracona referencja na wywołanie),
+- peek(typ) – zwraca tylko True/False,
+- pętli jak w main.py: NetworkThread wstawia zdarzenie po każdej paczce wiadomości,
+  a pętla czeka w pygame.event.wait() i opróżnia kolejkę przez get(); sprawdzamy
+  też klucze każdej odebranej wiadomości.
+Jeśli wariant używany przez main.py (peek(typ), pętla) gubi referencje albo psuje
+wiadomości, program kończy się kodem 1.
+
+Uruchomienie:
+    python -m benchmarks.eventpost [--messages N] [--seed S]
+"""
+
+import argparse
+import json
+import os
+import random
+import socket
+import sys
+import threading
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from network import Connection, NetworkThread
+
+WAIT = 16   # najdłuższy sen pętli (ms)
+GUARD = 16  # dodatkowe referencje chroniące słownik przed zwolnieniem
+
+NETWORK_EVENT = pygame.event.custom_type()
+
+
+def lost_references(peek):
+    """
+    Wstawia zdarzenie, woła `peek` trzy razy i opróżnia kolejkę.
+
+    Zwraca:
+    --------
+    int
+        O ile spadł licznik referencji słownika zdarzenia.
+    """
+    pygame.event.get()
+    event = pygame.event.Event(NETWORK_EVENT)
+    guard = [event.__dict__] * GUARD
+    before = sys.getrefcount(event.__dict__)
+    pygame.event.post(event)
+    for _ in range(3):
+        peek()
+    pygame.event.get()
+    return before - sys.getrefcount(guard[0])
+
+
+def sender(sock, count, seed):
+    """
+    Wysyła `count` wiadomości "attack" w odstępach 0..2 ms.
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        sock.sendall((json.dumps({"type": "attack", "row": i % 10, "col": 3}) + "\n").encode())
+        time.sleep(rng.random() * 0.002)
+    sock.close()
+
+
+def run_loop(count, seed):
+    """
+    Pętla jak w main.py: wait() → receive() → get().
+
+    Zwraca:
+    --------
+    (received, corrupted, lost) : tuple[int, int, int]
+    """
+    pygame.event.get()
+    wake = pygame.event.Event(NETWORK_EVENT)
+    guard = [wake.__dict__] * GUARD
+    before = sys.getrefcount(wake.__dict__)
+    ours, theirs = socket.socketpair()
+    ours.setblocking(False)
+    net = NetworkThread(Connection(ours), notify=lambda: pygame.event.post(wake))
+    peer = threading.Thread(target=sender, args=(theirs, count, seed), daemon=True)
+    peer.start()
+    received = corrupted = 0
+    try:
+        while received < count:
+            pygame.event.wait(WAIT)
+            try:
+                messages = net.receive()
+            except ConnectionError:
+                break
+            for msg in messages:
+                received += 1
+                if sorted(msg) != ["col", "row", "type"] or msg["type"] != "attack":
+                    corrupted += 1
+            pygame.event.get()
+    finally:
+        net.close()
+    peer.join()
+    pygame.event.get()
+    return received, corrupted, before - sys.getrefcount(guard[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Zdarzenie Pygame z wątku sieciowego a peek()")
+    parser.add_argument("--messages", type=int, default=4000, help="liczba wiadomości w pętli")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    pygame.display.init()
+    pygame.display.set_mode((100, 100))
+    print(f"{'wariant':<32}{'utracone ref.':>14}{'uszkodzone wiad.':>18}")
+    lost = lost_references(pygame.event.peek)
+    print(f"{'3× peek()':<32}{lost:>14}{'-':>18}")
+    typed = lost_references(lambda: pygame.event.peek(NETWORK_EVENT))
+    print(f"{'3× peek(NETWORK_EVENT)':<32}{typed:>14}{'-':>18}")
+    received, corrupted, loop_lost = run_loop(args.messages, args.seed)
+    print(f"{'wątek sieciowy + event.wait()':<32}{loop_lost:>14}{corrupted:>18}")
+    pygame.quit()
+    if typed or loop_lost or corrupted or received < args.messages:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
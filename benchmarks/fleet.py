@@ -0,0 +1,111 @@
+"""
+benchmarks/fleet.py
+
+Pomiar przepustowości generatora losowych flot (rozstawień na sekundę):
+- random_fleets()        – wariant hurtowy, zwraca maski bitowe,
+- Board.random_fleet()   – pełna plansza Board,
+- BitBoard.random_fleet() – plansza na maskach bitowych,
+- naive                  – dla porównania: losowanie (row, col, orient) i can_place()
+                           aż do skutku, tak jak robiłby to gracz klikający myszą.
+
+Na koniec sprawdzamy, że floty niemożliwej do rozstawienia (statek dłuższy niż
+plansza, statki, które razem się nie mieszczą) generatory odrzucają wyjątkiem
+ValueError, zamiast zawisnąć albo zgłosić IndexError; inaczej program kończy się
+kodem 1.
+
+Uruchomienie:
+    python -m benchmarks.fleet [--count N] [--seed S]
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from board import Board, BitBoard, SHIPS, BOARD_SIZE, random_fleets
+
+
+def naive_fleet(rng):
+    """
+    Rozstawia flotę metodą prób i błędów (punkt odniesienia dla pomiaru).
+    """
+    board = Board()
+    for _, length in SHIPS:
+        while True:
+            row = rng.randrange(BOARD_SIZE)
+            col = rng.randrange(BOARD_SIZE)
+            orient = rng.choice("HV")
+            if board.can_place(row, col, length, orient):
+                board.place_ship(row, col, length, orient)
+                break
+    return board
+
+
+def measure(name, func, count):
+    """
+    Wywołuje func() i wypisuje liczbę rozstawień na sekundę.
+    """
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<24} {count / elapsed:>12,.0f} rozstawień/s  ({elapsed:.3f} s)")
+    return count / elapsed
+
+
+def check_impossible(name, func):
+    """
+    Wywołuje func() dla floty niemożliwej do rozstawienia; zwraca True, jeśli
+    zgłosiło ValueError.
+    """
+    start = time.perf_counter()
+    try:
+        func()
+        outcome = "BŁĄD: brak wyjątku"
+    except ValueError:
+        outcome = "OK (ValueError)"
+    except Exception as e:
+        outcome = f"BŁĄD: {e!r}"
+    print(f"{name:<40} {outcome}  ({time.perf_counter() - start:.3f} s)")
+    return outcome.startswith("OK")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark generatora losowych flot")
+    parser.add_argument("--count", type=int, default=100_000, help="liczba rozstawień na wariant")
+    parser.add_argument("--seed", type=int, default=1, help="ziarno generatora")
+    args = parser.parse_args()
+    count = args.count
+
+    measure("random_fleets", lambda: random_fleets(count, rng=args.seed), count)
+
+    def boards(cls):
+        rng = random.Random(args.seed)
+        for _ in range(count):
+            cls.random_fleet(rng=rng)
+
+    measure("Board.random_fleet", lambda: boards(Board), count)
+    measure("BitBoard.random_fleet", lambda: boards(BitBoard), count)
+
+    def naive():
+        rng = random.Random(args.seed)
+        for _ in range(count):
+            naive_fleet(rng)
+
+    measure("naive (can_place)", naive, count)
+
+    too_long = [("Lotniskowiec", BOARD_SIZE + 1)]
+    crowded = [("Okręt liniowy", 4)] * 5   # 20 pól na planszy 4×4 (16 pól)
+    checks = [
+        ("random_fleets: statek dłuższy", lambda: random_fleets(1, too_long, rng=args.seed)),
+        ("Board.random_fleet: statek dłuższy", lambda: Board.random_fleet(too_long, rng=args.seed)),
+        ("BitBoard.random_fleet: statek dłuższy", lambda: BitBoard.random_fleet(too_long, rng=args.seed)),
+        ("random_fleets: flota się nie mieści", lambda: random_fleets(1, crowded, rng=args.seed, size=4)),
+        ("Board.random_fleet: flota się nie mieści", lambda: Board.random_fleet(crowded, rng=args.seed, size=4)),
+    ]
+    results = [check_impossible(name, func) for name, func in checks]
+    if not all(results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+benchmarks/frame.py
+
+Koszt klatki fazy ustawiania poza samymi planszami: pasek informacyjny i podgląd
+statku wędrujący za kursorem po wszystkich polach.
+
+- "bez pamięci" – jak dawniej w main.py: small_font.render() napisu w każdej klatce
+  i nowa powierzchnia SRCALPHA dla każdego pola podglądu,
+- "TextCache + pula" – gui.draw_info_bar() z TextCache i gui.draw_preview() z gotowymi
+  kafelkami overlay_surface().
+
+Dla obu wariantów podajemy liczbę klatek na sekundę i liczbę powierzchni tworzonych
+na klatkę (gui.SURFACES). Z opcją --max-surfaces benchmark kończy się błędem, jeśli
+wariant z pamięcią przekroczy podaną liczbę alokacji na klatkę – regresja (nowa
+alokacja w pętli rysowania) od razu wychodzi na jaw.
+
+Uruchomienie:
+    python -m benchmarks.frame [--frames N] [--max-surfaces K]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from board import SHIPS
+from gui import (
+    SURFACES,
+    TextCache,
+    draw_info_bar,
+    draw_preview,
+    info_text,
+    BOARD_SIZE,
+    CELL_SIZE,
+    COLOR_GRID_BG,
+    COLOR_HIGHLIGHT,
+    COLOR_INVALID,
+    COLOR_TEXT,
+    INFO_HEIGHT,
+    MARGIN,
+    WINDOW_HEIGHT,
+    WINDOW_WIDTH,
+)
+
+LEFT_TOP = (MARGIN, MARGIN)
+
+
+def frame_uncached(screen, font, r, c, length, orient, valid, text):
+    """
+    Klatka w dawnym stylu main.py (każda powierzchnia tworzona od nowa).
+    """
+    if orient == "H":
+        cells = [(r, cc) for cc in range(c, min(c + length, BOARD_SIZE))]
+    else:
+        cells = [(rr, c) for rr in range(r, min(r + length, BOARD_SIZE))]
+    for rr, cc in cells:
+        overlay = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA)
+        SURFACES.add()
+        overlay.fill((*(COLOR_HIGHLIGHT if valid else COLOR_INVALID), 100))
+        screen.blit(overlay, (LEFT_TOP[0] + cc * CELL_SIZE, LEFT_TOP[1] + rr * CELL_SIZE))
+    pygame.draw.rect(screen, COLOR_GRID_BG, (0, WINDOW_HEIGHT - INFO_HEIGHT, WINDOW_WIDTH, INFO_HEIGHT))
+    surf = font.render(text, True, COLOR_TEXT)
+    SURFACES.add()
+    screen.blit(surf, (MARGIN, WINDOW_HEIGHT - INFO_HEIGHT + 15))
+
+
+def frame_cached(screen, cache, r, c, length, orient, valid, text):
+    """
+    Klatka z TextCache i pulą kafelków podglądu (jak obecnie w main.py).
+    """
+    draw_preview(screen, LEFT_TOP, r, c, length, orient, valid)
+    draw_info_bar(screen, cache, [(text, COLOR_TEXT)])
+
+
+def run(screen, frames, draw, arg):
+    """
+    Rysuje `frames` klatek; zwraca (klatki/s, powierzchnie na klatkę).
+    """
+    name, length = SHIPS[0]
+    text = info_text("placement", 1, False, 0, SHIPS)
+    # Rozgrzewka: pierwsze klatki (poprawny i błędny podgląd) wypełniają pamięci podręczne
+    draw(screen, arg, 0, 0, length, "H", True, text)
+    draw(screen, arg, 0, 9, length, "H", False, text)
+    SURFACES.take()
+    start = time.perf_counter()
+    for i in range(frames):
+        cell = i % (BOARD_SIZE * BOARD_SIZE)
+        r, c = divmod(cell, BOARD_SIZE)
+        orient = "H" if (i // 100) % 2 == 0 else "V"
+        draw(screen, arg, r, c, length, orient, c + length <= BOARD_SIZE, text)
+    elapsed = time.perf_counter() - start
+    return frames / elapsed, SURFACES.take() / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark alokacji w klatce")
+    parser.add_argument("--frames", type=int, default=20_000, help="liczba klatek na pomiar")
+    parser.add_argument("--max-surfaces", type=float, default=None,
+                        help="dopuszczalna liczba powierzchni na klatkę w wariancie z pamięcią")
+    args = parser.parse_args()
+
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    font = pygame.font.SysFont("arial", 18)
+
+    old_fps, old_allocs = run(screen, args.frames, frame_uncached, font)
+    new_fps, new_allocs = run(screen, args.frames, frame_cached, TextCache(font))
+    print(f"bez pamięci       {old_fps:>10,.0f} kl./s   {old_allocs:5.2f} pow./klatkę")
+    print(f"TextCache + pula  {new_fps:>10,.0f} kl./s   {new_allocs:5.2f} pow./klatkę   x{new_fps / old_fps:.1f}")
+    pygame.quit()
+
+    if args.max_surfaces is not None and new_allocs > args.max_surfaces:
+        print(f"REGRESJA: {new_allocs:.2f} > {args.max_surfaces} powierzchni na klatkę")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+benchmarks/large_board.py
+
+Duże plansze: pamięć i czas klatki dla plansz o boku 10, 100 i 1000 pól.
+
+Na każdą planszę przypada jedna flota SHIPS na `--cells-per-fleet` pól (co najmniej
+jedna), a potem oddajemy strzały w `--shots` (ułamek) losowych pól.
+
+Pamięć (tracemalloc; obie plansze mają te same statki, strzały i rekordy Ship):
+- Board – gęsta lista list size×size,
+- SparseBoard – kafelki tworzone przy pierwszym zapisie w ich obszarze (rzadkie jako
+  słowniki pól); podajemy też bajty na zapisane pole (statek albo strzał).
+
+Czas klatki w oknie `--view`×`--view` pikseli:
+- draw.rect – pygame.draw.rect na każde widoczne pole przy widoku całej planszy
+  (tak rysuje draw_grid()),
+- widok: strzał – gui.ViewportRenderer po zmianie planszy (strzał), cała plansza;
+  przeliczany jest tylko zmieniony kafelek (SparseBoard.changed_tiles),
+- widok: pełny – przeliczenie całego widoku (jak po przesunięciu albo zmianie
+  przybliżenia),
+- widok: bez zmian – ta sama klatka bez zmian (sam blit gotowej powierzchni),
+- 40 px: przeliczenie – przybliżenie 40 px na pole (widoczny tylko wycinek planszy).
+
+Benchmark kończy się błędem, jeśli klatka ze strzałem przy widoku całej planszy
+trwa dłużej niż --frame-budget (domyślnie jedna klatka przy 60 Hz); pełne
+przeliczenie widoku podajemy informacyjnie.
+
+Na koniec sprawdzamy zgodność silników na planszy o boku innym niż BOARD_SIZE:
+Board, BitBoard i SparseBoard z tymi samymi statkami i strzałami muszą dać te same
+wyniki i ten sam grid, a strzał poza planszę (także ujemny indeks) – IndexError.
+
+Uruchomienie:
+    python -m benchmarks.large_board [--sizes 10 100 1000] [--view 800] [--frame-budget MS]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from board import Board, BitBoard, SparseBoard, SHIPS
+from gui import ViewportRenderer, PALETTE, ZOOM_LEVELS, window_codes
+
+
+def build(board_cls, size, ships, shots):
+    """
+    Plansza `board_cls` z podanymi statkami (Ship) i strzałami; zwraca (plansza, bajty).
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    board = board_cls(size)
+    for ship in ships:
+        board.place_ship(ship.row, ship.col, ship.length, ship.orient)
+    for row, col in shots:
+        board.receive_attack(row, col)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return board, used
+
+
+def check_engines(size, seed):
+    """
+    Porównuje Board, BitBoard i SparseBoard o boku `size`; zwraca opis błędu albo None.
+    """
+    rng = random.Random(seed)
+    ships = Board.random_fleet(rng=rng, size=size).ships
+    cells = [(r, c) for r in range(size) for c in range(size)]
+    rng.shuffle(cells)
+    outside = [(-1, 0), (0, -1), (size, 0), (0, size)]
+    boards = {cls.__name__: cls(size) for cls in (Board, BitBoard, SparseBoard)}
+    expected = None
+    for name, board in boards.items():
+        for ship in ships:
+            if not board.can_place(ship.row, ship.col, ship.length, ship.orient):
+                return f"{name}: can_place odrzuca statek {ship.row, ship.col}"
+            board.place_ship(ship.row, ship.col, ship.length, ship.orient)
+        results = [board.receive_attack(r, c) for r, c in cells[:size * size // 2]]
+        for r, c in outside:
+            try:
+                board.receive_attack(r, c)
+                return f"{name}: strzał w ({r}, {c}) bez IndexError"
+            except IndexError:
+                pass
+        state = (results, [list(row) for row in board.grid], board.fleet_status())
+        if expected is None:
+            expected = state
+        elif state != expected:
+            return f"{name}: wyniki inne niż Board"
+    return None
+
+
+def timed(func, repeats):
+    """
+    Najlepszy z `repeats` czasów wywołania func() w milisekundach.
+    """
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def draw_rects(screen, board, view):
+    """
+    Widok całej planszy w stylu draw_grid(): jeden pygame.draw.rect na widoczne pole.
+    """
+    cell = max(1, int(view.scale))
+    rows = min(board.size, view.view_size[1] // cell)
+    cols = min(board.size, view.view_size[0] // cell)
+    codes = window_codes(board, 0, 0, rows, cols)
+    for r in range(rows):
+        line = codes[r]
+        for c in range(cols):
+            pygame.draw.rect(screen, PALETTE[line[c]], (c * cell, r * cell, cell, cell))
+
+
+def measure(size, args, screen):
+    rng = random.Random(args.seed)
+    fleets = max(1, size * size // args.cells_per_fleet)
+    sparse = SparseBoard.random_fleet(SHIPS * fleets, rng, size)
+    count = int(size * size * args.shots)
+    shots = [(rng.randrange(size), rng.randrange(size)) for _ in range(count)]
+
+    _, dense_bytes = build(Board, size, sparse.ships, shots)
+    sparse, sparse_bytes = build(SparseBoard, size, sparse.ships, shots)
+    stored = len(sparse.marks())
+
+    view = ViewportRenderer(size, (args.view, args.view))
+    view.fit()
+    rects_ms = timed(lambda: draw_rects(screen, sparse, view), 1 if size >= 1000 else args.repeats)
+    # Pola wody na strzały w kolejnych klatkach (zmiana planszy wymusza przeliczenie widoku)
+    free = [(r, c) for r in range(min(size, 8)) for c in range(size) if sparse.cell(r, c) == "~"]
+
+    def shot_frame():
+        sparse.receive_attack(*free.pop())
+        view.draw(screen, (0, 0), sparse)
+
+    def full_frame():
+        view._key = None
+        view.draw(screen, (0, 0), sparse)
+
+    rebuild_ms = timed(shot_frame, args.repeats)
+    full_ms = timed(full_frame, args.repeats)
+    static_ms = timed(lambda: view.draw(screen, (0, 0), sparse), args.repeats)
+    view.level = ZOOM_LEVELS.index((40, 1))
+    zoom_ms = timed(shot_frame, args.repeats)
+    return {
+        "size": size,
+        "ships": len(sparse.ships),
+        "shots": count,
+        "dense_mb": dense_bytes / 1e6,
+        "sparse_mb": sparse_bytes / 1e6,
+        "per_mark": sparse_bytes / max(1, stored),
+        "rects_ms": rects_ms,
+        "rebuild_ms": rebuild_ms,
+        "full_ms": full_ms,
+        "static_ms": static_ms,
+        "zoom_ms": zoom_ms,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dużych plansz")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--cells-per-fleet", type=int, default=400,
+                        help="pola planszy na jedną flotę SHIPS")
+    parser.add_argument("--shots", type=float, default=0.05, help="ułamek ostrzelanych pól")
+    parser.add_argument("--view", type=int, default=800, help="bok okna widoku w pikselach")
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--frame-budget", type=float, default=1000 / 60,
+                        help="dopuszczalny czas klatki ze strzałem przy widoku całej planszy (ms)")
+    args = parser.parse_args()
+
+    pygame.display.init()
+    screen = pygame.display.set_mode((args.view, args.view))
+    print(f"{'bok':>5} {'statki':>7} {'strzały':>8} {'Board MB':>9} {'Sparse MB':>10} {'B/zapis':>7}"
+          f" {'draw.rect':>10} {'strzał':>8} {'pełny':>8} {'bez zmian':>10} {'40 px':>7}")
+    over = []
+    for size in args.sizes:
+        res = measure(size, args, screen)
+        print(f"{res['size']:>5} {res['ships']:>7,} {res['shots']:>8,} {res['dense_mb']:>9.2f}"
+              f" {res['sparse_mb']:>10.2f} {res['per_mark']:>7.0f}"
+              f" {res['rects_ms']:>8.2f}ms {res['rebuild_ms']:>6.2f}ms {res['full_ms']:>6.2f}ms"
+              f" {res['static_ms']:>8.3f}ms"
+              f" {res['zoom_ms']:>5.2f}ms")
+        if res["rebuild_ms"] > args.frame_budget:
+            over.append(size)
+    pygame.quit()
+
+    error = check_engines(16, args.seed)
+    print(f"zgodność Board/BitBoard/SparseBoard (bok 16) {'OK' if error is None else 'BŁĄD: ' + error}")
+    if over:
+        print(f"REGRESJA: klatka widoku ponad {args.frame_budget:.1f} ms dla boku {over}")
+    if over or error is not None:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
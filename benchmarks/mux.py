@@ -0,0 +1,165 @@
+"""
+benchmarks/mux.py
+
+Wiele gier na jednym połączeniu: dwie farmy botów (Multiplexer po obu stronach
+jednej pary gniazd) rozgrywają `--games` pełnych gier, każdą na osobnym kanale.
+Zamiast 2×N deskryptorów (po jednym sockecie na mecz i stronę) używamy dwóch.
+
+Opcja `--flood M` sprawdza sprawiedliwość szeregowania: kanał-„hałaśnik” wrzuca na
+start M zbędnych wiadomości. Każda strona w jednym obiegu pętli obsługuje najwyżej
+`--budget` wiadomości (jak serwer w jednym takcie). Podajemy czas, po którym kończy
+się połowa gier i wszystkie gry, dla zadanego `--quantum` oraz (z `--compare`) dla
+obsługi bez podziału na kwanty, w której kanał obsługujemy do opróżnienia kolejki.
+
+Uruchomienie:
+    python -m benchmarks.mux [--games N] [--codec json|binary] [--quantum Q] [--flood M]
+                             [--budget B] [--compare]
+"""
+
+import argparse
+import random
+import socket
+import time
+
+from board import Board, SHIPS
+from network import Connection, Multiplexer
+from strategies import STRATEGIES
+
+FLOOD_CHANNEL = 0
+
+
+class BotFarm:
+    """
+    Jedna strona wszystkich gier: plansza i strategia na każdy kanał 1..games.
+
+    Parametry:
+    ----------
+    mux : Multiplexer
+        Multiplekser tej strony połączenia.
+    games : int
+        Liczba gier (kanałów).
+    strategy : str
+        Nazwa strategii z STRATEGIES.
+    seed : int
+        Ziarno losowania flot i strzałów.
+    host : bool
+        True – ta strona strzela pierwsza.
+    """
+
+    def __init__(self, mux, games, strategy, seed, host):
+        self.mux = mux
+        self.host = host
+        self.boards = {}
+        self.shooters = {}
+        self.finished = {}   # kanał → czas zakończenia gry (s od startu)
+        self.start = 0.0
+        for game in range(1, games + 1):
+            rng = random.Random(f"{seed}-{int(host)}-{game}")
+            self.boards[game] = Board.random_fleet(SHIPS, rng)
+            self.shooters[game] = STRATEGIES[strategy](rng, SHIPS)
+
+    def begin(self):
+        self.start = time.perf_counter()
+        for game in self.boards:
+            self.mux.channel(game).send({"type": "ready"}, flush=False)
+
+    def _fire(self, channel):
+        row, col = self.shooters[channel.id].next_shot()
+        channel.send({"type": "attack", "row": row, "col": col}, flush=False)
+
+    def _done(self, channel):
+        self.finished[channel.id] = time.perf_counter() - self.start
+        self.mux.close_channel(channel.id)
+
+    def handle(self, channel, msg):
+        kind = msg.get("type")
+        if kind == "ready":
+            if self.host:
+                self._fire(channel)
+        elif kind == "attack":
+            res, sunk = self.boards[channel.id].receive_attack(msg["row"], msg["col"])
+            lost = bool(res) and self.boards[channel.id].all_sunk()
+            channel.send({"type": "result", "row": msg["row"], "col": msg["col"],
+                          "hit": bool(res), "sunk": bool(sunk), "gameover": lost}, flush=False)
+            if lost:
+                self._done(channel)
+            else:
+                self._fire(channel)
+        elif kind == "result":
+            self.shooters[channel.id].observe(msg["row"], msg["col"], msg["hit"], msg["sunk"])
+            if msg["gameover"]:
+                self._done(channel)
+        # pozostałe wiadomości (np. z kanału-hałaśnika) ignorujemy
+
+
+def run(games, codec, quantum, flood, budget, strategy, seed):
+    """
+    Rozgrywa `games` gier na jednej parze gniazd. Zwraca słownik z wynikami.
+    """
+    sock_a, sock_b = socket.socketpair()
+    sock_a.setblocking(False)
+    sock_b.setblocking(False)
+    mux_a = Multiplexer(Connection(sock_a, codec), quantum)
+    mux_b = Multiplexer(Connection(sock_b, codec), quantum)
+    farm_a = BotFarm(mux_a, games, strategy, seed, host=True)
+    farm_b = BotFarm(mux_b, games, strategy, seed, host=False)
+
+    noise = mux_a.channel(FLOOD_CHANNEL)
+    for i in range(flood):
+        noise.send({"type": "chat", "text": f"spam {i}"}, flush=False)
+
+    farm_a.begin()
+    farm_b.begin()
+    messages = 0
+    while len(farm_a.finished) < games or len(farm_b.finished) < games:
+        mux_a.flush()
+        mux_b.flush()
+        messages += mux_a.poll() + mux_b.poll()
+        mux_a.process(farm_a.handle, budget)
+        mux_b.process(farm_b.handle, budget)
+    elapsed = time.perf_counter() - farm_a.start
+    sends = mux_a.connection.send_calls + mux_b.connection.send_calls
+    sock_a.close()
+    sock_b.close()
+
+    done = sorted(farm_a.finished.values())
+    return {
+        "elapsed": elapsed,
+        "messages": messages,
+        "sends": sends,
+        "half": done[len(done) // 2],
+        "last": done[-1],
+    }
+
+
+def report(label, res, games):
+    print(f"{label:<18} {games / res['elapsed']:>9,.0f} gier/s  "
+          f"{res['messages'] / res['elapsed']:>10,.0f} wiad./s  "
+          f"send() {res['sends']:>7,}  połowa gier {res['half'] * 1000:>8.1f} ms  "
+          f"wszystkie {res['last'] * 1000:>8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark wielu gier na jednym połączeniu")
+    parser.add_argument("--games", type=int, default=1000, help="liczba równoległych gier")
+    parser.add_argument("--codec", choices=("json", "binary"), default="binary")
+    parser.add_argument("--quantum", type=int, default=8, help="wiadomości kanału na kolejkę")
+    parser.add_argument("--flood", type=int, default=0, help="zbędne wiadomości kanału-hałaśnika")
+    parser.add_argument("--budget", type=int, default=2000, help="wiadomości na obieg pętli")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="hunt")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--compare", action="store_true",
+                        help="porównaj z obsługą kanału do opróżnienia kolejki")
+    args = parser.parse_args()
+
+    print(f"{args.games} gier na 2 deskryptorach (osobne sockety: {2 * args.games}), "
+          f"kodowanie {args.codec}, hałaśnik {args.flood} wiad.")
+    res = run(args.games, args.codec, args.quantum, args.flood, args.budget, args.strategy, args.seed)
+    report(f"quantum={args.quantum}", res, args.games)
+    if args.compare:
+        res = run(args.games, args.codec, 1 << 30, args.flood, args.budget, args.strategy, args.seed)
+        report("bez kwantów", res, args.games)
+
+
+if __name__ == "__main__":
+    main()
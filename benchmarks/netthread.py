@@ -0,0 +1,110 @@
+"""
+benchmarks/netthread.py
+
+Odbiór w pętli gry: Connection.receive() wywoływane w wątku głównym (jak dawniej
+w main.py) kontra NetworkThread, który czyta socket i dekoduje wiadomości w osobnym
+wątku, a pętli oddaje gotową kolejkę.
+
+Przeciwnika udaje wątek wysyłający przez parę gniazd serie wiadomości w losowych
+odstępach; każda niesie czas wysłania. Pętla gry śpi w select() (najwyżej
+EVENT_WAIT), odbiera wiadomości i „rysuje” (aktywne czekanie przez --render ms).
+Podajemy czas fazy sieciowej w klatce oraz opóźnienie od wysłania wiadomości do jej
+obsługi w pętli (mediana i p99).
+
+Uruchomienie:
+    python -m benchmarks.netthread [--messages N] [--render MS] [--burst K]
+"""
+
+import argparse
+import json
+import random
+import select
+import socket
+import statistics
+import threading
+import time
+
+from main import EVENT_WAIT
+from network import Connection, NetworkThread
+
+
+def sender(sock, count, burst, seed):
+    """
+    Wysyła `count` wiadomości seriami po 1..`burst` w odstępach 0..4 ms.
+    """
+    rng = random.Random(seed)
+    sent = 0
+    while sent < count:
+        n = min(rng.randint(1, burst), count - sent)
+        data = "".join(json.dumps({"type": "attack", "row": i % 10, "col": 0, "t": time.perf_counter()}) + "\n"
+                       for i in range(n))
+        sock.sendall(data.encode())
+        sent += n
+        time.sleep(rng.random() * 0.004)
+    sock.close()
+
+
+def run(threaded, count, render, burst, seed):
+    """
+    Rozgrywa pętlę gry aż do odebrania `count` wiadomości.
+
+    Zwraca:
+    --------
+    (phase, latency) : tuple[list[float], list[float]]
+        Czasy fazy sieciowej kolejnych klatek i opóźnienia wiadomości (s).
+    """
+    ours, theirs = socket.socketpair()
+    ours.setblocking(False)
+    conn = Connection(ours)
+    source = NetworkThread(conn) if threaded else conn
+    peer = threading.Thread(target=sender, args=(theirs, count, burst, seed))
+    peer.start()
+    phase = []
+    latency = []
+    received = 0
+    try:
+        while received < count:
+            select.select([source], [], [], EVENT_WAIT)
+            start = time.perf_counter()
+            try:
+                messages = source.receive()
+            except ConnectionError:
+                break
+            now = time.perf_counter()
+            phase.append(now - start)
+            for msg in messages:
+                latency.append(now - msg["t"])
+            received += len(messages)
+            end = now + render
+            while time.perf_counter() < end:
+                pass
+    finally:
+        peer.join()
+        source.close()
+    return phase, latency
+
+
+def describe(values):
+    ordered = sorted(values)
+    return statistics.median(ordered) * 1000, ordered[int(0.99 * (len(ordered) - 1))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark odbioru w wątku sieciowym")
+    parser.add_argument("--messages", type=int, default=5000, help="liczba wiadomości przeciwnika")
+    parser.add_argument("--render", type=float, default=5.0, help="czas rysowania klatki (ms)")
+    parser.add_argument("--burst", type=int, default=8, help="najdłuższa seria wiadomości naraz")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'odbiór':<16}{'faza sieci p50':>16}{'p99':>10}{'opóźnienie p50':>17}{'p99':>10}{'klatki':>8}")
+    for name, threaded in (("w pętli gry", False), ("NetworkThread", True)):
+        phase, latency = run(threaded, args.messages, args.render / 1000, args.burst, args.seed)
+        phase_p50, phase_p99 = describe(phase)
+        lat_p50, lat_p99 = describe(latency)
+        print(f"{name:<16}{phase_p50:>13.3f} ms{phase_p99:>7.3f} ms"
+              f"{lat_p50:>14.2f} ms{lat_p99:>7.2f} ms{len(phase):>8}")
+
+
+if __name__ == "__main__":
+    main()
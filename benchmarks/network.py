@@ -0,0 +1,133 @@
+"""
+benchmarks/network.py
+
+Mikrobenchmarki ścieżek sieciowych:
+- odbiór: try_receive_from_buffer() kontra FrameReader.receive() na seriach po
+  10 000 wiadomości, które przychodzą naraz (socket zastępuje BurstSocket, który oddaje
+  przygotowaną serię bajtów porcjami jak jądro systemu – mierzymy koszt po stronie Pythona),
+- wysyłka: Connection.send() z flush po każdej wiadomości kontra łączenie wiadomości
+  w jedno sock.send() (prawdziwa para gniazd; podajemy też liczbę wywołań send).
+
+Uruchomienie:
+    python -m benchmarks.network [--messages N] [--bursts B]
+"""
+
+import argparse
+import json
+import socket
+import time
+
+from network import Connection, FrameReader, try_receive_from_buffer
+
+
+class BurstSocket:
+    """
+    Atrapa nieblokującego socketu oddająca `data` porcjami po `chunk` bajtów.
+    """
+
+    def __init__(self, data, chunk=65536):
+        self.data = memoryview(data)
+        self.chunk = chunk
+        self.pos = 0
+
+    def _next(self, size):
+        if self.pos >= len(self.data):
+            raise BlockingIOError
+        part = self.data[self.pos:self.pos + min(size, self.chunk)]
+        self.pos += len(part)
+        return part
+
+    def recv(self, size):
+        return bytes(self._next(size))
+
+    def recv_into(self, buffer):
+        part = self._next(len(buffer))
+        buffer[:len(part)] = part
+        return len(part)
+
+
+def make_burst(count):
+    """
+    Seria `count` komunikatów attack/result w formacie send_json().
+    """
+    lines = []
+    for i in range(count):
+        r, c = divmod(i % 100, 10)
+        if i % 2:
+            obj = {"type": "attack", "row": r, "col": c}
+        else:
+            obj = {"type": "result", "row": r, "col": c, "hit": True, "sunk": False, "gameover": False}
+        lines.append(json.dumps(obj) + "\n")
+    return "".join(lines).encode()
+
+
+def run_old(data, count):
+    sock = BurstSocket(data)
+    buffer = ""
+    received = 0
+    # Stara funkcja robi jeden recv(4096) na wywołanie – wołamy ją aż do opróżnienia
+    while received < count:
+        msgs, buffer = try_receive_from_buffer(sock, buffer)
+        received += len(msgs)
+    return received
+
+
+def run_new(data, count):
+    reader = FrameReader()
+    return len(reader.receive(BurstSocket(data)))
+
+
+def run_send(count, batch):
+    """
+    Wysyła `count` wiadomości przez parę gniazd, wywołując flush() co `batch` wiadomości.
+
+    Zwraca:
+    --------
+    (elapsed, send_calls) : tuple[float, int]
+    """
+    left, right = socket.socketpair()
+    left.setblocking(False)
+    right.setblocking(False)
+    sender = Connection(left)
+    receiver = Connection(right)
+    msg = {"type": "attack", "row": 3, "col": 7}
+    received = 0
+    start = time.perf_counter()
+    for i in range(1, count + 1):
+        sender.send(msg, flush=False)
+        if i % batch == 0:
+            sender.flush()
+            received += len(receiver.receive())
+    while received < count:
+        sender.flush()
+        received += len(receiver.receive())
+    elapsed = time.perf_counter() - start
+    left.close()
+    right.close()
+    return elapsed, sender.send_calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark odbioru wiadomości")
+    parser.add_argument("--messages", type=int, default=10_000, help="wiadomości w serii")
+    parser.add_argument("--bursts", type=int, default=20, help="liczba serii")
+    args = parser.parse_args()
+
+    data = make_burst(args.messages)
+    for name, func in (("try_receive_from_buffer", run_old), ("FrameReader.receive", run_new)):
+        start = time.perf_counter()
+        for _ in range(args.bursts):
+            assert func(data, args.messages) == args.messages
+        elapsed = time.perf_counter() - start
+        total = args.messages * args.bursts
+        print(f"{name:<24} {total / elapsed:>12,.0f} wiadomości/s  "
+              f"({elapsed / args.bursts * 1e3:.1f} ms na serię)")
+
+    for batch in (1, 16, 256):
+        elapsed, calls = run_send(args.messages, batch)
+        print(f"{'send, flush co ' + str(batch):<24} {args.messages / elapsed:>12,.0f} wiadomości/s  "
+              f"({calls:,} wywołań send)")
+
+
+if __name__ == "__main__":
+    main()
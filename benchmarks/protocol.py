@@ -0,0 +1,91 @@
+"""
+benchmarks/protocol.py
+
+Porównanie kodowań wiadomości: JSON (encode_json + FrameReader) i ramek binarnych
+(encode_binary + BinaryFrameReader) na komunikatach "attack" i "result".
+
+Dla każdego kodowania podajemy przepustowość kodowania i dekodowania (wiadomości/s)
+oraz liczbę bajtów na wiadomość. Sprawdzamy też, że wiadomości, które nie mieszczą
+się w stałych ramkach (wiersz/kolumna ≥ 256 na dużej planszy, ujemne, "seq" ≥ 65536),
+ramki binarne przenoszą jako FRAME_JSON bez zmian; inaczej program kończy się kodem 1.
+
+Uruchomienie:
+    python -m benchmarks.protocol [--messages N]
+"""
+
+import argparse
+import sys
+import time
+
+from network import BinaryFrameReader, FrameReader, encode_binary, encode_json
+
+CODECS = (
+    ("json", encode_json, FrameReader),
+    ("binary", encode_binary, BinaryFrameReader),
+)
+
+
+def make_messages(count):
+    """
+    Naprzemienne komunikaty attack/result, jak w typowej rozgrywce.
+    """
+    messages = []
+    for i in range(count):
+        r, c = divmod(i % 100, 10)
+        if i % 2:
+            messages.append({"type": "attack", "row": r, "col": c})
+        else:
+            messages.append({"type": "result", "row": r, "col": c,
+                             "hit": bool(i % 3), "sunk": False, "gameover": False})
+    return messages
+
+
+# Wiadomości spoza zakresu stałych ramek (4 bajty) – muszą przejść jako FRAME_JSON
+WIDE_MESSAGES = [
+    {"type": "attack", "row": 256, "col": 3},
+    {"type": "attack", "row": 7, "col": 1000},
+    {"type": "attack", "row": -1, "col": 0},
+    {"type": "result", "row": 300, "col": 299, "hit": True, "sunk": False, "gameover": False},
+    {"type": "ping", "seq": 70_000},
+    {"type": "attack", "row": 512, "col": 512, "ch": 2},
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark kodowań protokołu")
+    parser.add_argument("--messages", type=int, default=100_000, help="liczba wiadomości")
+    args = parser.parse_args()
+
+    messages = make_messages(args.messages)
+    for name, encode, reader_cls in CODECS:
+        start = time.perf_counter()
+        frames = [encode(msg) for msg in messages]
+        encode_time = time.perf_counter() - start
+
+        data = b"".join(frames)
+        start = time.perf_counter()
+        reader = reader_cls()
+        decoded = reader.feed(data)
+        decode_time = time.perf_counter() - start
+        assert decoded == messages
+        assert reader.bytes_in == len(data), f"bytes_in {reader.bytes_in} != {len(data)}"
+
+        attack = len(encode({"type": "attack", "row": 9, "col": 9}))
+        result = len(encode({"type": "result", "row": 9, "col": 9,
+                             "hit": True, "sunk": True, "gameover": False}))
+        print(f"{name:<7} kodowanie {len(messages) / encode_time:>12,.0f} wiad./s  "
+              f"dekodowanie {len(messages) / decode_time:>12,.0f} wiad./s  "
+              f"bajty: attack {attack}, result {result}, średnio {len(data) / len(messages):.1f}")
+
+    try:
+        decoded = BinaryFrameReader().feed(b"".join(encode_binary(msg) for msg in WIDE_MESSAGES))
+        error = None if decoded == WIDE_MESSAGES else f"odebrano {decoded!r}"
+    except Exception as e:
+        error = repr(e)
+    print(f"binary: wiersz/kolumna/seq spoza ramki {'OK' if error is None else 'BŁĄD: ' + error}")
+    if error is not None:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
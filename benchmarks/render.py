@@ -0,0 +1,101 @@
+"""
+benchmarks/render.py
+
+Porównanie rysowania plansz: gui.draw_grid() (200 wywołań pygame.draw.rect na planszę
+w każdej klatce) kontra gui.BoardRenderer (trwała powierzchnia, przerysowanie tylko
+zmienionych pól i jeden blit na planszę).
+
+Klatka to narysowanie obu plansz, jak w main.py. Scenariusze:
+- "bez zmian" – plansze się nie zmieniają (np. czekanie na ruch przeciwnika),
+- "strzał na klatkę" – w każdej klatce przybywa jeden strzał na planszy zgadywań.
+
+Uruchamiane na sterowniku wideo "dummy", więc nie wymaga ekranu.
+
+Uruchomienie:
+    python -m benchmarks.render [--frames N] [--flip]
+"""
+
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from board import Board
+from gui import (
+    BoardRenderer,
+    draw_grid,
+    BOARD_SIZE,
+    CELL_SIZE,
+    GRID_GAP,
+    MARGIN,
+    WINDOW_HEIGHT,
+    WINDOW_WIDTH,
+)
+
+LEFT_TOP = (MARGIN, MARGIN)
+RIGHT_TOP = (MARGIN + BOARD_SIZE * CELL_SIZE + GRID_GAP, MARGIN)
+
+
+def make_shots(count, seed=0):
+    """
+    Kolejne strzały (wiersz, kolumna, znak) – po 100 polach plansza zaczyna się od nowa.
+    """
+    rng = random.Random(seed)
+    cells = [(r, c) for r in range(BOARD_SIZE) for c in range(BOARD_SIZE)]
+    shots = []
+    while len(shots) < count:
+        rng.shuffle(cells)
+        shots.extend((r, c, rng.choice("XO")) for r, c in cells)
+    return shots[:count]
+
+
+def run(screen, frames, shots, use_renderer, flip):
+    """
+    Rysuje `frames` klatek i zwraca liczbę klatek na sekundę.
+    """
+    own = Board.random_fleet(rng=random.Random(1)).grid
+    guess = [["~"] * BOARD_SIZE for _ in range(BOARD_SIZE)]
+    own_view = BoardRenderer()
+    guess_view = BoardRenderer()
+    start = time.perf_counter()
+    for i in range(frames):
+        if shots:
+            r, c, mark = shots[i]
+            if i % (BOARD_SIZE * BOARD_SIZE) == 0:
+                for row in guess:
+                    row[:] = ["~"] * BOARD_SIZE
+            guess[r][c] = mark
+        if use_renderer:
+            own_view.draw(screen, LEFT_TOP, own)
+            guess_view.draw(screen, RIGHT_TOP, guess)
+        else:
+            draw_grid(screen, LEFT_TOP, own)
+            draw_grid(screen, RIGHT_TOP, guess)
+        if flip:
+            pygame.display.flip()
+    return frames / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark rysowania plansz")
+    parser.add_argument("--frames", type=int, default=5000, help="liczba klatek na pomiar")
+    parser.add_argument("--flip", action="store_true", help="wliczaj pygame.display.flip()")
+    args = parser.parse_args()
+
+    pygame.display.init()
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    shots = make_shots(args.frames)
+    for label, scenario in (("bez zmian", None), ("strzał na klatkę", shots)):
+        old = run(screen, args.frames, scenario, False, args.flip)
+        new = run(screen, args.frames, scenario, True, args.flip)
+        print(f"{label:<17} draw_grid {old:>10,.0f} kl./s   BoardRenderer {new:>10,.0f} kl./s   "
+              f"x{new / old:.1f}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+benchmarks/server.py
+
+Obciążenie serwera meczów (server.MatchServer) na lokalnym porcie: `--matches`
+równoległych meczów botów, które rozstawiają losową flotę i strzelają w kolejne pola
+z przetasowanej listy. Podajemy liczbę meczów i wiadomości na sekundę.
+
+Potem sprawdzamy, że zepsuta wiadomość kończy mecz, zamiast go zawiesić: gracz 1
+wysyła niepoprawny JSON w fazie ustawiania oraz w trakcie gry (po kilku strzałach).
+Obaj gracze muszą dostać {"type":"error"} i rozłączenie, a serwer – policzyć mecz jako
+zakończony; inaczej program kończy się kodem 1.
+
+Uruchomienie:
+    python -m benchmarks.server [--matches N] [--seed S]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+from board import Board, BOARD_SIZE
+from server import MAX_LINE, MatchServer
+
+TIMEOUT = 5.0   # najdłuższe czekanie na wiadomość serwera (s)
+
+
+async def bot(port, seed, garbage_after=None):
+    """
+    Gra jeden mecz; `garbage_after` – po tylu strzałach gracz 1 wysyła zepsutą
+    wiadomość zamiast ataku (0 – zamiast floty).
+
+    Zwraca:
+    --------
+    list[dict]
+        Wiadomości odebrane od serwera aż do rozłączenia.
+    """
+    reader, writer = await asyncio.open_connection("127.0.0.1", port, limit=MAX_LINE)
+    rng = random.Random(seed)
+    targets = [(r, c) for r in range(BOARD_SIZE) for c in range(BOARD_SIZE)]
+    rng.shuffle(targets)
+    received = []
+
+    def send(obj):
+        writer.write((json.dumps(obj) + "\n").encode())
+
+    def attack():
+        if garbage_after is not None and len(targets) == BOARD_SIZE * BOARD_SIZE - garbage_after:
+            writer.write(b"{zepsuta ramka\n")
+            return
+        r, c = targets.pop()
+        send({"type": "attack", "row": r, "col": c})
+
+    try:
+        while True:
+            line = await asyncio.wait_for(reader.readline(), TIMEOUT)
+            if not line:
+                break
+            msg = json.loads(line)
+            received.append(msg)
+            kind = msg["type"]
+            if kind == "match":
+                player = msg["player"]
+                if garbage_after is None or player != 1:
+                    garbage_after = None
+                if garbage_after == 0:
+                    writer.write(b"{zepsuta ramka\n")
+                else:
+                    fleet = Board.random_fleet(rng=rng)
+                    send({"type": "ready", "ships": [[s.row, s.col, s.length, s.orient]
+                                                     for s in fleet.ships]})
+            elif kind == "ready" and player == 1:
+                attack()
+            elif kind == "attack":
+                attack()
+            await writer.drain()
+    except asyncio.TimeoutError:
+        received.append({"type": "timeout"})
+    finally:
+        writer.close()
+    return received
+
+
+async def run_matches(matches, seed):
+    server = MatchServer()
+    listener = await asyncio.start_server(server.handle_client, "127.0.0.1", 0, limit=MAX_LINE)
+    port = listener.sockets[0].getsockname()[1]
+    start = time.perf_counter()
+    # Gracze łączą się po kolei parami, więc kolejne dwa połączenia tworzą mecz
+    players = []
+    for i in range(2 * matches):
+        players.append(asyncio.ensure_future(bot(port, seed + i)))
+        await asyncio.sleep(0)
+    await asyncio.gather(*players)
+    elapsed = time.perf_counter() - start
+    while server.active:
+        await asyncio.sleep(0.01)
+    listener.close()
+    await listener.wait_closed()
+    return server, elapsed
+
+
+async def check_garbage(seed, garbage_after):
+    """
+    Jeden mecz z zepsutą wiadomością gracza 1. Zwraca opis błędu albo None.
+    """
+    server = MatchServer()
+    listener = await asyncio.start_server(server.handle_client, "127.0.0.1", 0, limit=MAX_LINE)
+    port = listener.sockets[0].getsockname()[1]
+    first = asyncio.ensure_future(bot(port, seed, garbage_after))
+    await asyncio.sleep(0.05)
+    second = asyncio.ensure_future(bot(port, seed + 1))
+    results = await asyncio.gather(first, second)
+    for _ in range(100):
+        if not server.active:
+            break
+        await asyncio.sleep(0.01)
+    listener.close()
+    await listener.wait_closed()
+    for number, received in enumerate(results, 1):
+        kinds = [msg["type"] for msg in received]
+        if "timeout" in kinds or "error" not in kinds:
+            return f"gracz {number} odebrał {kinds[-3:]}"
+    if server.active or server.finished != 1:
+        return f"serwer: active={server.active}, finished={server.finished}"
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark serwera meczów")
+    parser.add_argument("--matches", type=int, default=50, help="liczba równoległych meczów")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    server, elapsed = asyncio.run(run_matches(args.matches, args.seed))
+    messages = server.messages_in + server.messages_out
+    print(f"{server.finished} meczów w {elapsed:.2f} s: {server.finished / elapsed:,.0f} meczów/s, "
+          f"{messages / elapsed:,.0f} wiadomości/s")
+
+    failed = False
+    for name, garbage_after in (("zepsuty JSON zamiast floty", 0), ("zepsuty JSON w trakcie gry", 3)):
+        error = asyncio.run(check_garbage(args.seed, garbage_after))
+        print(f"{name:<28} {'OK' if error is None else 'BŁĄD: ' + error}")
+        failed = failed or error is not None
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
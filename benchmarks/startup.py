@@ -0,0 +1,109 @@
+"""
+benchmarks/startup.py
+
+Czas importu i startu rdzenia gry bez interfejsu w porównaniu z pełnym klientem.
+
+Każdy pomiar to osobny, świeży proces Pythona (żadnych modułów w pamięci):
+- "rdzeń" – import session (board + network), dwie GameSession na parze gniazd
+  i pełna gra między nimi (strzały po kolei w pola planszy) – tak może pracować
+  bezgłowy proces roboczy,
+- "main + pygame" – import main (gui, pygame, numpy) oraz pygame.init()
+  i okno na sterowniku "dummy" – koszt, który bezgłowe narzędzie płaciło,
+  korzystając z reguł gry zaszytych w main.py.
+
+Podajemy medianę czasu importu, startu (inicjalizacja/gra), całego procesu
+i informację, czy w procesie załadował się pygame.
+
+Uruchomienie:
+    python -m benchmarks.startup [--repeats N]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CORE = """
+import json, socket, sys, time
+t0 = time.perf_counter()
+from network import Connection
+from session import GameSession, GAME, OVER
+t1 = time.perf_counter()
+a, b = socket.socketpair()
+a.setblocking(False)
+b.setblocking(False)
+host = GameSession(Connection(a), 1, True)
+guest = GameSession(Connection(b), 2, False)
+shots = {}
+for s in (host, guest):
+    r = 0
+    while s.current_ship:
+        while not s.place(r, 0):
+            r += 1
+    s.confirm()
+    shots[s] = iter([(r, c) for r in range(10) for c in range(10)])
+while host.phase != OVER or guest.phase != OVER:
+    for s in (host, guest):
+        s.update()
+        if s.phase == GAME and s.my_turn:
+            s.fire(*next(shots[s]))
+t2 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "start": t2 - t1, "pygame": "pygame" in sys.modules}))
+"""
+
+GUI = """
+import json, sys, time
+t0 = time.perf_counter()
+import main
+import pygame
+t1 = time.perf_counter()
+pygame.init()
+pygame.display.set_mode((main.WINDOW_WIDTH, main.WINDOW_HEIGHT))
+t2 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "start": t2 - t1, "pygame": "pygame" in sys.modules}))
+"""
+
+
+def run(code, repeats):
+    """
+    Uruchamia `code` w `repeats` świeżych procesach; zwraca mediany (ms) i flagę pygame.
+    """
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy",
+               PYGAME_HIDE_SUPPORT_PROMPT="1")
+    imports, starts, walls = [], [], []
+    loaded = False
+    for _ in range(repeats):
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env,
+                             capture_output=True, text=True, check=True)
+        walls.append(time.perf_counter() - start)
+        res = json.loads(out.stdout.strip().splitlines()[-1])
+        imports.append(res["import"])
+        starts.append(res["start"])
+        loaded = res["pygame"]
+    return (statistics.median(imports) * 1000, statistics.median(starts) * 1000,
+            statistics.median(walls) * 1000, loaded)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark startu rdzenia gry")
+    parser.add_argument("--repeats", type=int, default=5, help="liczba świeżych procesów na wariant")
+    args = parser.parse_args()
+
+    rows = [("rdzeń (session)", CORE), ("main + pygame", GUI)]
+    results = []
+    for label, code in rows:
+        imp, start, wall, loaded = run(code, args.repeats)
+        results.append(wall)
+        print(f"{label:<16} import {imp:>7.1f} ms   start {start:>7.1f} ms   proces {wall:>7.1f} ms"
+              f"   pygame: {'tak' if loaded else 'nie'}")
+    print(f"rdzeń startuje x{results[1] / results[0]:.1f} szybciej")
+
+
+if __name__ == "__main__":
+    main()
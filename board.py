@@ -6,36 +6,335 @@ Moduł zawierający klasę Board, która odpowiada za logikę planszy gry „Sta
 - umożliwia umieszczanie statków,
 - obsługuje przyjmowanie strzałów,
 - sprawdza, czy wszystkie statki zostały zatopione.
+
+Obok klasy Board znajduje się BitBoard – ten sam silnik zapisany na maskach bitowych
+(jeden bit na pole), przeznaczony do szybkich rozgrywek bez interfejsu, oraz SparseBoard
+dla bardzo dużych plansz (kafelki tworzone przy pierwszym zapisie – pamięć rośnie
+z liczbą statków i strzałów, a nie pól).
+
+BOARD_SIZE to jedyne źródło domyślnego rozmiaru planszy (korzystają z niego też gui
+i moduły symulacji); Board i SparseBoard przyjmują własny rozmiar w konstruktorze.
 """
 
+import functools
+import random
+
 BOARD_SIZE = 10
 
+# Lista statków (nazwa, długość)
+SHIPS = [
+    ("Lotniskowiec", 5),
+    ("Okręt liniowy", 4),
+    ("Krążownik", 3),
+    ("Podwodny", 3),
+    ("Niszczyciel", 2),
+]
+
+SPARSE_CHUNK = 32             # bok kafelka SparseBoard (w polach)
+SPARSE_TILE_MARKS = 16        # do tylu zapisanych pól kafelek SparseBoard jest słownikiem
+SPARSE_PLACE_ATTEMPTS = 1000  # próby ustawienia jednego statku w SparseBoard.random_fleet
+FLEET_SAMPLE_ATTEMPTS = 10_000  # próby wylosowania całej floty w _sample_fleet
+
+
+@functools.lru_cache(maxsize=None)
+def placement_table(length, orient, size=BOARD_SIZE):
+    """
+    Tablica masek bitowych wszystkich ustawień statku danej długości i orientacji.
+
+    Bit nr row*size + col odpowiada polu (row, col). Wynik jest liczony raz dla każdej
+    trójki (length, orient, size) i współdzielony przez wszystkie plansze.
+
+    Zwraca:
+    --------
+    tuple[int, ...]
+        Krotka długości size*size indeksowana polem początkowym; element to maska pól
+        statku albo 0, jeśli statek zaczynający się w tym polu wychodzi poza planszę.
+    """
+    table = []
+    for row in range(size):
+        for col in range(size):
+            if orient == "H":
+                if col + length > size:
+                    table.append(0)
+                    continue
+                table.append(((1 << length) - 1) << (row * size + col))
+            else:  # orientacja "V"
+                if row + length > size:
+                    table.append(0)
+                    continue
+                mask = 0
+                for r in range(row, row + length):
+                    mask |= 1 << (r * size + col)
+                table.append(mask)
+    return tuple(table)
+
+
+@functools.lru_cache(maxsize=None)
+def cover_table(length, orient, size=BOARD_SIZE):
+    """
+    Odwrotność placement_table: dla każdego pola maska pól początkowych, których
+    ustawienie (length, orient) to pole zajmuje.
+
+    Pozwala przyrostowo wygaszać ustawienia, które przestały być legalne po
+    umieszczeniu statku. Każde ustawienie dopisujemy tylko do `length` pól, które
+    zajmuje – O(size²·length), a nie przegląd wszystkich bitów jego maski.
+    """
+    cover = [0] * (size * size)
+    step = 1 if orient == "H" else size
+    for start, mask in enumerate(placement_table(length, orient, size)):
+        if mask:
+            bit = 1 << start
+            for k in range(length):
+                cover[start + k * step] |= bit
+    return tuple(cover)
+
+
+@functools.lru_cache(maxsize=None)
+def legal_starts(length, orient, size=BOARD_SIZE):
+    """
+    Maska pól początkowych, z których statek (length, orient) mieści się na pustej planszy.
+    """
+    starts = 0
+    for start, mask in enumerate(placement_table(length, orient, size)):
+        if mask:
+            starts |= 1 << start
+    return starts
+
+
+@functools.lru_cache(maxsize=None)
+def placements(length, size=BOARD_SIZE):
+    """
+    Lista wszystkich ustawień statku o danej długości mieszczących się na pustej planszy.
+
+    Zwraca:
+    --------
+    tuple[tuple[int, int, str, int], ...]
+        Krotki (row, col, orient, mask) – najpierw ustawienia 'H', potem 'V'.
+    """
+    result = []
+    for orient in ("H", "V"):
+        for start, mask in enumerate(placement_table(length, orient, size)):
+            if mask:
+                result.append((start // size, start % size, orient, mask))
+    return tuple(result)
+
+
+def _make_rng(rng):
+    """
+    Zamienia argument `rng` na obiekt random.Random:
+    None → nowy, losowo zainicjowany; int → ziarno; Random → bez zmian.
+    """
+    if rng is None or isinstance(rng, int):
+        return random.Random(rng)
+    return rng
+
+
+def _fleet_candidates(ships, size):
+    """
+    Ustawienia (placements) każdego statku floty na planszy `size`×`size`.
+
+    Zgłasza ValueError, jeśli któryś statek nie mieści się na planszy.
+    """
+    candidates = []
+    for name, length in ships:
+        cands = placements(length, size)
+        if not cands:
+            raise ValueError(f"statek {name} (długość {length}) nie mieści się "
+                             f"na planszy {size}×{size}")
+        candidates.append(cands)
+    return candidates
+
+
+def _sample_fleet(candidates, rand):
+    """
+    Losuje jedno ustawienie floty: każdy statek niezależnie i jednostajnie spośród
+    swoich ustawień z `candidates`, całość odrzucana przy pierwszej kolizji masek.
+
+    Odrzucanie całej floty (a nie wybór kolejnego statku spośród pozostałych wolnych
+    miejsc) daje rozkład dokładnie jednostajny na zbiorze legalnych rozstawień.
+
+    Zgłasza ValueError, jeśli w FLEET_SAMPLE_ATTEMPTS próbach żadna flota nie była
+    legalna (np. statki nie mieszczą się razem na planszy).
+    """
+    for _ in range(FLEET_SAMPLE_ATTEMPTS):
+        occupied = 0
+        chosen = []
+        for cands in candidates:
+            placement = cands[int(rand() * len(cands))]
+            if placement[3] & occupied:
+                break
+            occupied |= placement[3]
+            chosen.append(placement)
+        else:
+            return chosen
+    raise ValueError(f"nie udało się rozstawić floty w {FLEET_SAMPLE_ATTEMPTS} próbach")
+
+
+def random_fleets(count, ships=SHIPS, rng=None, size=BOARD_SIZE):
+    """
+    Generuje hurtowo `count` losowych, legalnych rozstawień floty.
+
+    Parametry:
+    ----------
+    count : int
+        Liczba rozstawień.
+    ships : list[tuple[str, int]]
+        Lista statków (nazwa, długość) – domyślnie SHIPS.
+    rng : random.Random, int lub None
+        Źródło losowości albo ziarno; to samo ziarno daje te same rozstawienia.
+    size : int
+        Rozmiar planszy; bit pola (row, col) ma numer row * size + col.
+
+    Zwraca:
+    --------
+    list[tuple[int, ...]]
+        Dla każdego rozstawienia krotka masek bitowych statków w kolejności `ships`.
+
+    Zgłasza ValueError, jeśli floty nie da się rozstawić na planszy.
+    """
+    rand = _make_rng(rng).random
+    candidates = _fleet_candidates(ships, size)
+    layouts = []
+    for _ in range(count):
+        layouts.append(tuple(p[3] for p in _sample_fleet(candidates, rand)))
+    return layouts
+
+
+def _place_random_fleet(board, ships, rng):
+    """
+    Umieszcza na pustej planszy `board` losowe rozstawienie floty `ships` i ją zwraca.
+    """
+    candidates = _fleet_candidates(ships, board.size)
+    chosen = _sample_fleet(candidates, _make_rng(rng).random)
+    for (_, length), (row, col, orient, _) in zip(ships, chosen):
+        board.place_ship(row, col, length, orient)
+    return board
+
+
+def ship_mask(row, col, length, orient, size=BOARD_SIZE):
+    """
+    Zwraca maskę bitową pól zajmowanych przez statek (odczyt z placement_table).
+
+    Zwraca:
+    --------
+    int
+        Maska bitowa statku albo 0, jeśli statek nie mieści się na planszy size×size.
+    """
+    if not (0 <= row < size and 0 <= col < size):
+        return 0
+    return placement_table(length, orient, size)[row * size + col]
+
+
+
+class Ship:
+    """
+    Rekord pojedynczego statku umieszczonego na planszy.
+
+    Atrybuty:
+    ----------
+    row, col : int
+        Pole początkowe statku.
+    length : int
+        Długość statku.
+    orient : str
+        'H' – poziomo; 'V' – pionowo.
+    cells : tuple[tuple[int, int], ...]
+        Wszystkie współrzędne zajmowane przez statek (liczone przy odczycie, żeby
+        rekord nie trzymał krotki krotek – przy tysiącach statków SparseBoard to
+        większość jej pamięci).
+    remaining : int
+        Liczba jeszcze nietrafionych pól; 0 oznacza statek zatopiony.
+    """
+
+    __slots__ = ("row", "col", "length", "orient", "remaining")
+
+    def __init__(self, row, col, length, orient):
+        self.row = row
+        self.col = col
+        self.length = length
+        self.orient = orient
+        self.remaining = length
+
+    @property
+    def cells(self):
+        if self.orient == "H":
+            return tuple((self.row, c) for c in range(self.col, self.col + self.length))
+        return tuple((r, self.col) for r in range(self.row, self.row + self.length))
+
+    @property
+    def sunk(self):
+        """
+        True, jeśli wszystkie pola statku zostały trafione.
+        """
+        return self.remaining == 0
+
+    def __repr__(self):
+        return f"Ship({self.row}, {self.col}, {self.length}, {self.orient!r}, remaining={self.remaining})"
+
+
 class Board:
     """
-    Reprezentacja logiki planszy gry „Statki” (10×10).
+    Reprezentacja logiki planszy gry „Statki” (domyślnie 10×10).
 
     Atrybuty:
     ----------
+    size : int
+        Liczba pól w wierszu i kolumnie.
     grid : list[list[str]]
-        Dwuwymiarowa lista 10×10, w której:
+        Dwuwymiarowa lista size×size, w której:
             '~' – pole wody (pustego),
             'S' – fragment statku,
             'X' – trafione (fragment statku zmieniony z 'S'),
             'O' – pudło (strzał w wodę zmieniony z '~').
-    ships : list[dict]
-        Lista słowników opisujących każdy umieszczony statek:
-            {
-                "cells": [(r1, c1), (r2, c2), ...],  # wszystkie współrzędne statku
-                "hits": set()                        # trafione fragmenty tego statku
-            }
+    ships : list[Ship]
+        Lista rekordów Ship opisujących każdy umieszczony statek (w kolejności ustawiania).
+
+    Dodatkowo plansza utrzymuje indeks pole → Ship oraz liczniki statków na wodzie
+    i nietrafionych pól, dzięki czemu trafienie, zatopienie i koniec gry są O(1).
+    Dla każdej pary (długość, orientacja), o którą zapytano, przechowuje też maskę
+    pól początkowych, z których statek wciąż da się ustawić (patrz legal_placements).
     """
 
-    def __init__(self):
+    def __init__(self, size=BOARD_SIZE):
         """
-        Inicjalizuje nową planszę, wypełnioną wodą ('~') i pustą listę statków.
+        Inicjalizuje nową planszę size×size, wypełnioną wodą ('~') i pustą listę statków.
+
+        Maski ustawień mają size*size bitów, a pierwsze zapytanie o parę (długość,
+        orientacja) buduje tablice placement_table i cover_table w O(size²·length)
+        (ok. 0,1 s przy size=100), więc gęsta plansza nadaje się do rozmiarów rzędu
+        100; większe plansze obsługuje SparseBoard.
+        """
+        self.size = size
+        self.grid = [["~"] * size for _ in range(size)]
+        self.ships = []          # Lista rekordów Ship
+        self._ship_at = {}       # (row, col) → Ship
+        self._ships_afloat = 0   # liczba niezatopionych statków
+        self._cells_remaining = 0  # liczba nietrafionych pól statków
+        self._legal = {}         # (length, orient) → maska legalnych pól początkowych
+
+    @classmethod
+    def random_fleet(cls, ships=SHIPS, rng=None, size=BOARD_SIZE):
+        """
+        Tworzy planszę z losowo rozstawioną flotą (rozkład jednostajny na legalnych
+        rozstawieniach, bez ponawiania prób pole po polu).
+
+        Parametry:
+        ----------
+        ships : list[tuple[str, int]]
+            Lista statków (nazwa, długość) – domyślnie SHIPS.
+        rng : random.Random, int lub None
+            Źródło losowości albo ziarno (deterministyczne dla tego samego ziarna).
+        size : int
+            Rozmiar planszy.
+
+        Zwraca:
+        --------
+        Board
+            Nowa plansza z umieszczonymi statkami w kolejności `ships`.
+
+        Zgłasza ValueError, jeśli floty nie da się rozstawić na planszy.
         """
-        self.grid = [["~"] * BOARD_SIZE for _ in range(BOARD_SIZE)]
-        self.ships = []  # Lista słowników opisujących każdy statek
+        return _place_random_fleet(cls(size), ships, rng)
 
     def can_place(self, row, col, length, orient):
         """
@@ -59,23 +358,38 @@ class Board:
             True, jeśli statek mieści się w granicach planszy i nie nachodzi na inne,
             False – w przeciwnym razie.
         """
-        if orient == "H":
-            if col + length > BOARD_SIZE:
-                return False
-            for c in range(col, col + length):
-                if self.grid[row][c] == "S":
-                    return False
-        else:  # orientacja "V"
-            if row + length > BOARD_SIZE:
-                return False
-            for r in range(row, row + length):
-                if self.grid[r][col] == "S":
-                    return False
-        return True
+        if not (0 <= row < self.size and 0 <= col < self.size):
+            return False
+        return bool(self.legal_placements(length, orient) >> (row * self.size + col) & 1)
+
+    def legal_placements(self, length, orient):
+        """
+        Zwraca maskę pól początkowych, z których statek (length, orient) można jeszcze
+        ustawić na tej planszy.
+
+        Maska jest liczona przy pierwszym zapytaniu, a potem aktualizowana przyrostowo
+        w place_ship – kolejne zapytania są pojedynczym odczytem ze słownika.
+
+        Zwraca:
+        --------
+        int
+            Maska bitowa; bit nr row*size + col oznacza legalne ustawienie w (row, col).
+        """
+        key = (length, orient)
+        legal = self._legal.get(key)
+        if legal is None:
+            legal = legal_starts(length, orient, self.size)
+            cover = cover_table(length, orient, self.size)
+            for ship in self.ships:
+                for r, c in ship.cells:
+                    legal &= ~cover[r * self.size + c]
+            self._legal[key] = legal
+        return legal
 
     def place_ship(self, row, col, length, orient):
         """
-        Umieszcza statek na planszy, oznaczając pola jako 'S' i rejestruje go w self.ships.
+        Umieszcza statek na planszy, oznaczając pola jako 'S', rejestruje go w self.ships
+        oraz w indeksie pole → statek.
 
         Parametry:
         ----------
@@ -98,10 +412,20 @@ class Board:
                 self.grid[r][col] = "S"
                 cells.append((r, col))
 
-        self.ships.append({
-            "cells": cells,
-            "hits": set()
-        })
+        ship = Ship(row, col, length, orient)
+        self.ships.append(ship)
+        for cell in cells:
+            self._ship_at[cell] = ship
+        self._ships_afloat += 1
+        self._cells_remaining += length
+
+        # Wygaszamy ustawienia, które nachodzą na nowy statek
+        indices = [r * self.size + c for r, c in cells]
+        for key, legal in self._legal.items():
+            cover = cover_table(*key, self.size)
+            for i in indices:
+                legal &= ~cover[i]
+            self._legal[key] = legal
 
     def receive_attack(self, row, col):
         """
@@ -124,7 +448,14 @@ class Board:
             sunk : bool
                 True  – jeśli trafienie zatopiło cały dany statek,
                 False – w przeciwnym razie.
+
+        Wyjątki:
+        --------
+        IndexError
+            Pole leży poza planszą (także ujemny indeks – jak BitBoard i SparseBoard).
         """
+        if not (0 <= row < self.size and 0 <= col < self.size):
+            raise IndexError(f"pole ({row}, {col}) poza planszą {self.size}×{self.size}")
         cell = self.grid[row][col]
         # 1) Sprawdzamy, czy w to pole już wcześniej strzelano
         if cell in ("X", "O"):
@@ -133,11 +464,14 @@ class Board:
         # 2) Trafienie w statek
         if cell == "S":
             self.grid[row][col] = "X"
-            for ship in self.ships:
-                if (row, col) in ship["cells"]:
-                    ship["hits"].add((row, col))
-                    sunk = set(ship["cells"]) == ship["hits"]
-                    return True, sunk
+            ship = self._ship_at.get((row, col))
+            if ship is None:
+                return True, False
+            ship.remaining -= 1
+            self._cells_remaining -= 1
+            if ship.remaining == 0:
+                self._ships_afloat -= 1
+                return True, True
             return True, False
 
         # 3) Pudło
@@ -154,9 +488,458 @@ class Board:
         Zwraca:
         --------
         bool
-            True, jeśli w grid nie ma już żadnego 'S'; False w przeciwnym razie.
+            True, jeśli nie pozostało żadne nietrafione pole statku; False w przeciwnym razie.
+        """
+        return self._cells_remaining == 0
+
+    def fleet_status(self):
+        """
+        Zwraca stan floty bez przeglądania grid.
+
+        Zwraca:
+        --------
+        (ships_afloat, cells_remaining) : tuple[int, int]
+            Liczba niezatopionych statków oraz liczba ich nietrafionych pól.
+        """
+        return self._ships_afloat, self._cells_remaining
+
+
+class BitBoard:
+    """
+    Alternatywna, zwarta reprezentacja planszy oparta na maskach bitowych.
+
+    Udostępnia to samo API co Board (can_place, place_ship, receive_attack, all_sunk),
+    ale stan przechowuje w liczbach całkowitych – jeden bit na pole:
+
+    Atrybuty:
+    ----------
+    ship_bits : int
+        Pola zajęte przez statki.
+    hit_bits : int
+        Pola statków, które zostały trafione.
+    miss_bits : int
+        Pola wody, w które oddano strzał.
+    ship_masks : list[int]
+        Maski kolejnych umieszczonych statków (do wykrywania zatopienia).
+    ships : list[Ship]
+        Rekordy umieszczonych statków – jak Board.ships (np. dla matchlog).
+
+    Pole `grid` jest widokiem tylko do odczytu (lista list '~','S','X','O'), budowanym
+    z masek na żądanie – dla zgodności z gui.draw_grid.
+    """
+
+    def __init__(self, size=BOARD_SIZE):
+        """
+        Inicjalizuje pustą planszę size×size (same zera w maskach); bit pola (row, col)
+        ma numer row * size + col.
+        """
+        self.size = size
+        self.ship_bits = 0
+        self.hit_bits = 0
+        self.miss_bits = 0
+        self.ship_masks = []
+        self.ships = []
+        self._afloat_bits = 0   # pola statków jeszcze nietrafione
+        self._ships_afloat = 0  # liczba niezatopionych statków
+        self._mask_at = {}      # row*size + col → maska statku zajmującego pole
+        self._grid = None       # zbuforowany widok grid (None = nieaktualny)
+
+    @classmethod
+    def random_fleet(cls, ships=SHIPS, rng=None, size=BOARD_SIZE):
+        """
+        Tworzy planszę z losowo rozstawioną flotą – jak Board.random_fleet.
+        """
+        return _place_random_fleet(cls(size), ships, rng)
+
+    def can_place(self, row, col, length, orient):
+        """
+        Sprawdza, czy statek mieści się na planszy i nie nachodzi na inne (jedno AND).
+        """
+        mask = ship_mask(row, col, length, orient, self.size)
+        return mask != 0 and not (mask & self.ship_bits)
+
+    def place_ship(self, row, col, length, orient):
+        """
+        Umieszcza statek, ustawiając jego bity w ship_bits.
+        """
+        mask = ship_mask(row, col, length, orient, self.size)
+        self.ship_bits |= mask
+        self._afloat_bits |= mask
+        self.ship_masks.append(mask)
+        if orient == "H":
+            cells = tuple((row, c) for c in range(col, col + length))
+        else:
+            cells = tuple((r, col) for r in range(row, row + length))
+        for r, c in cells:
+            self._mask_at[r * self.size + c] = mask
+        self.ships.append(Ship(row, col, length, orient))
+        self._ships_afloat += 1
+        self._grid = None
+
+    def receive_attack(self, row, col):
+        """
+        Przyjmuje strzał w pole (row, col). Semantyka identyczna jak Board.receive_attack:
+        zwraca (hit, sunk), gdzie hit = None oznacza pole już wcześniej ostrzelane.
+        Statek trafionego pola odczytujemy ze słownika pole → maska (O(1)).
+
+        Zgłasza IndexError dla pola spoza planszy.
+        """
+        if not (0 <= row < self.size and 0 <= col < self.size):
+            raise IndexError(f"pole ({row}, {col}) poza planszą {self.size}×{self.size}")
+        index = row * self.size + col
+        bit = 1 << index
+        if (self.hit_bits | self.miss_bits) & bit:
+            return None, False
+
+        if self.ship_bits & bit:
+            self.hit_bits |= bit
+            self._afloat_bits &= ~bit
+            self._grid = None
+            if self._mask_at[index] & self._afloat_bits:
+                return True, False
+            self._ships_afloat -= 1
+            return True, True
+
+        self.miss_bits |= bit
+        self._grid = None
+        return False, False
+
+    def all_sunk(self):
+        """
+        Zwraca True, jeśli nie pozostało żadne nietrafione pole statku (O(1)).
+        """
+        return not self._afloat_bits
+
+    def fleet_status(self):
+        """
+        Zwraca (ships_afloat, cells_remaining) – jak Board.fleet_status.
+        """
+        return self._ships_afloat, self._afloat_bits.bit_count()
+
+    @property
+    def grid(self):
+        """
+        Widok planszy w formacie Board.grid (lista list '~','S','X','O').
+        Budowany ponownie tylko po zmianie stanu.
+        """
+        if self._grid is None:
+            grid = []
+            bit = 1
+            for _ in range(self.size):
+                row = []
+                for _ in range(self.size):
+                    if self.hit_bits & bit:
+                        row.append("X")
+                    elif self.miss_bits & bit:
+                        row.append("O")
+                    elif self.ship_bits & bit:
+                        row.append("S")
+                    else:
+                        row.append("~")
+                    bit <<= 1
+                grid.append(row)
+            self._grid = grid
+        return self._grid
+
+
+def _tile_bytes(marks):
+    """
+    Pełny kafelek SparseBoard (bytearray znaków pól) z kafelka-słownika `marks`.
+    """
+    tile = bytearray(b"~" * (SPARSE_CHUNK * SPARSE_CHUNK))
+    for index, value in marks.items():
+        tile[index] = value
+    return tile
+
+
+class SparseBoard:
+    """
+    Plansza dla bardzo dużych wariantów gry (np. 1000×1000): zamiast gęstej tablicy pól
+    przechowuje kafelki SPARSE_CHUNK×SPARSE_CHUNK tworzone dopiero przy pierwszym
+    zapisie statku albo strzału w ich obszarze. Kafelek z kilkoma zapisanymi polami
+    (do SPARSE_TILE_MARKS) to słownik pole → znak, a gęstszy – bytearray (jeden bajt,
+    znak pola, na pole).
+    Pamięć rośnie więc z liczbą statków i strzałów (a nie pól): pusta woda nic nie
+    kosztuje, a nawet w pełni zapisana plansza zajmuje bajt na pole zamiast ośmiu
+    (wskaźnik na napis) w Board.grid. Statki nie mają indeksu pole → statek: to, czy
+    pole jest zajęte, mówi kafelek, a statek trafionego pola znajdujemy w słowniku
+    pole początkowe → statek, sprawdzając najwyżej długość najdłuższego statku pól
+    w lewo i w górę.
+
+    Udostępnia to samo API co Board (can_place, place_ship, receive_attack, all_sunk,
+    fleet_status). Zamiast grid (który dla dużej planszy miałby miliony pól) warto używać:
+    cell() – wartość jednego pola, tiles() – kafelki przecinające prostokątne okno
+    (do hurtowego odczytu, np. gui.ViewportRenderer), changed_tiles() – kafelki
+    zmienione od danej wersji (do przyrostowego rysowania) oraz marks() – zapisane
+    pola okna.
+
+    Atrybuty:
+    ----------
+    size : int
+        Liczba pól w wierszu i kolumnie.
+    ships : list[Ship]
+        Rekordy umieszczonych statków (w kolejności ustawiania).
+    version : int
+        Licznik zmian stanu – pozwala widokom przerysowywać planszę tylko po zmianie.
+    """
+
+    def __init__(self, size=BOARD_SIZE):
+        self.size = size
+        self.ships = []
+        self.version = 0
+        self._ship_from = {}      # row*size + col pola początkowego → Ship
+        self._longest = 0         # długość najdłuższego statku
+        self._chunks = {}         # (row // SPARSE_CHUNK, col // SPARSE_CHUNK) → bytearray znaków pól
+        self._few = {}            # klucz kafelka z kilkoma polami → {pole w kafelku: kod znaku}
+        self._stamps = {}         # klucz kafelka → version jego ostatniej zmiany
+        self._ships_afloat = 0
+        self._cells_remaining = 0
+        self._grid = None         # zbuforowany widok grid (None = nieaktualny)
+
+    @classmethod
+    def random_fleet(cls, ships=SHIPS, rng=None, size=BOARD_SIZE):
+        """
+        Tworzy planszę z losowo rozstawioną flotą.
+
+        Tablice ustawień (placements) mają size*size pozycji, więc statki losujemy
+        po kolei: losowe pole i orientacja, ponawiane przy kolizji. Przy rzadkiej
+        flocie na dużej planszy kolizje są rzadkie, a rozkład bliski jednostajnemu;
+        gdy któregoś statku nie da się ustawić w rozsądnej liczbie prób, losujemy
+        całą flotę od nowa.
+
+        Parametry:
+        ----------
+        ships : list[tuple[str, int]]
+            Lista statków (nazwa, długość) – może być bardzo długa (np. wiele flot SHIPS).
+        rng : random.Random, int lub None
+            Źródło losowości albo ziarno.
+        size : int
+            Rozmiar planszy.
+
+        Zwraca:
+        --------
+        SparseBoard
+            Nowa plansza z umieszczonymi statkami w kolejności `ships`.
+
+        Zgłasza ValueError, jeśli któryś statek jest dłuższy niż plansza.
+        """
+        for name, length in ships:
+            if length > size:
+                raise ValueError(f"statek {name} (długość {length}) nie mieści się "
+                                 f"na planszy {size}×{size}")
+        rand = _make_rng(rng)
+        while True:
+            board = cls(size)
+            for _, length in ships:
+                for _ in range(SPARSE_PLACE_ATTEMPTS):
+                    orient = "H" if rand.random() < 0.5 else "V"
+                    row = rand.randrange(size if orient == "H" else size - length + 1)
+                    col = rand.randrange(size - length + 1 if orient == "H" else size)
+                    if board.can_place(row, col, length, orient):
+                        board.place_ship(row, col, length, orient)
+                        break
+                else:
+                    break
+            else:
+                return board
+
+    def _set(self, row, col, value):
+        """
+        Zapisuje wartość pola w jego kafelku: najpierw w słowniku, a po przekroczeniu
+        SPARSE_TILE_MARKS pól – w pełnym kafelku bytearray.
+        """
+        key = (row // SPARSE_CHUNK, col // SPARSE_CHUNK)
+        index = row % SPARSE_CHUNK * SPARSE_CHUNK + col % SPARSE_CHUNK
+        chunk = self._chunks.get(key)
+        if chunk is not None:
+            chunk[index] = ord(value)
+        else:
+            few = self._few.setdefault(key, {})
+            few[index] = ord(value)
+            if len(few) > SPARSE_TILE_MARKS:
+                self._chunks[key] = _tile_bytes(few)
+                del self._few[key]
+        self.version += 1
+        self._stamps[key] = self.version
+        self._grid = None
+
+    def can_place(self, row, col, length, orient):
+        """
+        Sprawdza, czy statek mieści się na planszy i nie nachodzi na inne – O(length).
+        """
+        end_row, end_col = (row, col + length - 1) if orient == "H" else (row + length - 1, col)
+        if not (0 <= row and 0 <= col and end_row < self.size and end_col < self.size):
+            return False
+        if orient == "H":
+            return not any(self.cell(row, c) in "SX" for c in range(col, col + length))
+        return not any(self.cell(r, col) in "SX" for r in range(row, row + length))
+
+    def place_ship(self, row, col, length, orient):
+        """
+        Umieszcza statek i zapisuje jego pola jako 'S' (bez sprawdzania kolizji – jak Board).
+        """
+        ship = Ship(row, col, length, orient)
+        self.ships.append(ship)
+        self._ship_from[row * self.size + col] = ship
+        self._longest = max(self._longest, length)
+        for r, c in ship.cells:
+            self._set(r, c, "S")
+        self._ships_afloat += 1
+        self._cells_remaining += length
+
+    def receive_attack(self, row, col):
+        """
+        Przyjmuje strzał w pole (row, col). Semantyka identyczna jak Board.receive_attack:
+        zwraca (hit, sunk), gdzie hit = None oznacza pole już wcześniej ostrzelane.
+
+        Wyjątki:
+        --------
+        IndexError
+            Pole leży poza planszą (jak Board i BitBoard).
+        """
+        if not (0 <= row < self.size and 0 <= col < self.size):
+            raise IndexError(f"pole ({row}, {col}) poza planszą {self.size}×{self.size}")
+        cell = self.cell(row, col)
+        if cell in ("X", "O"):
+            return None, False
+
+        if cell == "S":
+            self._set(row, col, "X")
+            ship = self._ship_covering(row, col)
+            ship.remaining -= 1
+            self._cells_remaining -= 1
+            if ship.remaining == 0:
+                self._ships_afloat -= 1
+                return True, True
+            return True, False
+
+        self._set(row, col, "O")
+        return False, False
+
+    def _ship_covering(self, row, col):
+        """
+        Statek zajmujący pole (row, col): zaczyna się najwyżej _longest - 1 pól w lewo
+        (poziomy) albo w górę (pionowy) – O(długość najdłuższego statku).
+        """
+        ships = self._ship_from
+        for k in range(self._longest):
+            if k <= col:
+                ship = ships.get(row * self.size + col - k)
+                if ship is not None and ship.orient == "H" and ship.length > k:
+                    return ship
+            if k <= row:
+                ship = ships.get((row - k) * self.size + col)
+                if ship is not None and ship.orient == "V" and ship.length > k:
+                    return ship
+        return None
+
+    def all_sunk(self):
+        """
+        Zwraca True, jeśli nie pozostało żadne nietrafione pole statku (O(1)).
+        """
+        return self._cells_remaining == 0
+
+    def fleet_status(self):
+        """
+        Zwraca (ships_afloat, cells_remaining) – jak Board.fleet_status.
+        """
+        return self._ships_afloat, self._cells_remaining
+
+    def cell(self, row, col):
+        """
+        Wartość pola (row, col): '~', 'S', 'X' lub 'O'.
+        """
+        key = (row // SPARSE_CHUNK, col // SPARSE_CHUNK)
+        index = row % SPARSE_CHUNK * SPARSE_CHUNK + col % SPARSE_CHUNK
+        chunk = self._chunks.get(key)
+        if chunk is not None:
+            return chr(chunk[index])
+        few = self._few.get(key)
+        return "~" if few is None else chr(few.get(index, 126))
+
+    def tiles(self, row0=0, col0=0, row1=None, col1=None):
+        """
+        Kafelki przecinające okno [row0, row1) × [col0, col1); kafelków samej wody
+        (jeszcze nieutworzonych) nie ma na liście.
+
+        Parametry:
+        ----------
+        row0, col0 : int
+            Lewy górny róg okna (włącznie).
+        row1, col1 : int lub None
+            Prawy dolny róg okna (wyłącznie); None – do krawędzi planszy.
+
+        Zwraca:
+        --------
+        list[tuple[int, int, bytearray]]
+            Krotki (row, col, tile): lewy górny róg kafelka i jego SPARSE_CHUNK² znaków
+            pól wierszami (kafelek-słownik jest rozwijany do bajtów). Kafelek może
+            wystawać poza okno i planszę (tam jest woda); nie wolno go modyfikować.
+        """
+        row1 = self.size if row1 is None else row1
+        col1 = self.size if col1 is None else col1
+        result = []
+        chunks, few = self._chunks, self._few
+        for cr in range(row0 // SPARSE_CHUNK, (row1 - 1) // SPARSE_CHUNK + 1):
+            for cc in range(col0 // SPARSE_CHUNK, (col1 - 1) // SPARSE_CHUNK + 1):
+                chunk = chunks.get((cr, cc))
+                if chunk is None:
+                    marks = few.get((cr, cc))
+                    if marks is None:
+                        continue
+                    chunk = _tile_bytes(marks)
+                result.append((cr * SPARSE_CHUNK, cc * SPARSE_CHUNK, chunk))
+        return result
+
+    def changed_tiles(self, since, row0=0, col0=0, row1=None, col1=None):
+        """
+        Kafelki okna jak w tiles(), zmienione po wersji `since` (porównanie z version).
+
+        Zwraca:
+        --------
+        list[tuple[int, int]]
+            Lewe górne rogi (row, col) zmienionych kafelków.
+        """
+        row1 = self.size if row1 is None else row1
+        col1 = self.size if col1 is None else col1
+        result = []
+        stamps = self._stamps
+        for cr in range(row0 // SPARSE_CHUNK, (row1 - 1) // SPARSE_CHUNK + 1):
+            for cc in range(col0 // SPARSE_CHUNK, (col1 - 1) // SPARSE_CHUNK + 1):
+                if stamps.get((cr, cc), 0) > since:
+                    result.append((cr * SPARSE_CHUNK, cc * SPARSE_CHUNK))
+        return result
+
+    def marks(self, row0=0, col0=0, row1=None, col1=None):
+        """
+        Zapisane pola (wszystko poza wodą) w oknie jak w tiles().
+
+        Zwraca:
+        --------
+        list[tuple[int, int, str]]
+            Krotki (row, col, value) w dowolnej kolejności.
+        """
+        row1 = self.size if row1 is None else row1
+        col1 = self.size if col1 is None else col1
+        result = []
+        water = ord("~")
+        for top, left, tile in self.tiles(row0, col0, row1, col1):
+            for i, value in enumerate(tile):
+                if value != water:
+                    r, c = top + i // SPARSE_CHUNK, left + i % SPARSE_CHUNK
+                    if row0 <= r < row1 and col0 <= c < col1:
+                        result.append((r, c, chr(value)))
+        return result
+
+    @property
+    def grid(self):
+        """
+        Gęsty widok planszy w formacie Board.grid – O(size²) pamięci, tylko dla
+        małych plansz (np. gui.draw_grid); budowany ponownie tylko po zmianie stanu.
         """
-        for row in self.grid:
-            if "S" in row:
-                return False
-        return True
+        if self._grid is None:
+            grid = [["~"] * self.size for _ in range(self.size)]
+            for r, c, value in self.marks():
+                grid[r][c] = value
+            self._grid = grid
+        return self._grid
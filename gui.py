@@ -4,11 +4,26 @@ gui.py
 Moduł zawierający funkcje rysujące planszę oraz interfejs gry w Pygame:
 - draw_grid(): rysuje siatkę 10×10 wraz z zawartością (woda, statek, trafienie, pudło),
 - get_cell_coords(): przetwarza współrzędne myszy na indeksy wiersza i kolumny,
-- info_text(): generuje tekst informacyjny do wyświetlenia w dolnym pasku ekranu.
+- BoardRenderer: szybsza odmiana draw_grid() – trwała powierzchnia planszy, na której
+  przerysowujemy tylko zmienione pola z gotowych kafelków (cell_surfaces()),
+- ViewportRenderer: widok dużej planszy (np. SparseBoard 1000×1000) z przybliżaniem
+  i przesuwaniem – tablica palety NumPy kopiowana przez pygame.surfarray, tylko dla
+  pól widocznych w oknie,
+- TextCache, overlay_surface(), draw_preview(), draw_info_bar(): rysowanie paska
+  informacyjnego i podglądu statku bez tworzenia nowych powierzchni w każdej klatce;
+  SURFACES liczy powierzchnie tworzone przez ten moduł (np. na klatkę),
+- info_text(): generuje tekst informacyjny do wyświetlenia w dolnym pasku ekranu,
+- latency_text(): tekst nakładki diagnostycznej z opóźnieniami łącza (klawisz F3).
 """
 
+import collections
+import functools
+
+import numpy as np
 import pygame
 
+from board import BOARD_SIZE, SPARSE_CHUNK
+
 # Stałe odpowiadające kolorom w formacie RGB
 COLOR_BG        = (0, 0, 0)       # absolutna czerń dla maksymalnego kontrastu
 COLOR_GRID_BG   = (50, 0, 100)    # głęboki fiolet dla wyraźnego rozdzielenia od tła
@@ -22,17 +37,51 @@ COLOR_INVALID   = (255, 0, 255)   # neonowy magenta na błędy
 
 
 
-# Wymiary interfejsu
-BOARD_SIZE     = 10    # plansza 10×10
+# Wymiary interfejsu (rozmiar planszy BOARD_SIZE pochodzi z board.py)
 CELL_SIZE      = 40    # rozmiar jednego pola w pikselach
 MARGIN         = 40    # margines od krawędzi okna do planszy
 GRID_GAP       = 80    # odstęp między dwoma planszami
 INFO_HEIGHT    = 60    # wysokość paska informacyjnego u dołu
 WINDOW_WIDTH   = MARGIN * 2 + BOARD_SIZE * CELL_SIZE * 2 + GRID_GAP
 WINDOW_HEIGHT  = MARGIN * 2 + BOARD_SIZE * CELL_SIZE + INFO_HEIGHT
+PREVIEW_ALPHA  = 100   # przezroczystość podglądu ustawianego statku
+HEATMAP_ALPHA  = 200   # krycie nakładki mapy cieplnej dla wartości 1.0
+HEATMAP_LEVELS = 16    # liczba poziomów krycia nakładki (po jednym kafelku na poziom)
+TEXT_CACHE_SIZE = 128  # najwięcej napisów trzymanych w jednej TextCache
+
+
+class SurfaceCounter:
+    """
+    Licznik powierzchni Pygame tworzonych przez ten moduł (render tekstu, nakładki,
+    plansze). Pozwala sprawdzić, ile alokacji kosztuje jedna klatka.
+
+    Atrybuty:
+    ----------
+    total : int
+        Liczba wszystkich utworzonych powierzchni.
+    """
 
+    def __init__(self):
+        self.total = 0
+        self._mark = 0
 
-def draw_grid(surface, top_left, board_matrix=None, hide_ships=False, highlight_cell=None):
+    def add(self, count=1):
+        self.total += count
+
+    def take(self):
+        """
+        Zwraca liczbę powierzchni utworzonych od poprzedniego take() (np. w klatce).
+        """
+        count = self.total - self._mark
+        self._mark = self.total
+        return count
+
+
+SURFACES = SurfaceCounter()
+
+
+def draw_grid(surface, top_left, board_matrix=None, hide_ships=False, highlight_cell=None,
+              heatmap=None):
     """
     Rysuje planszę 10×10 na podanej powierzchni Pygame.
 
@@ -51,6 +100,9 @@ def draw_grid(surface, top_left, board_matrix=None, hide_ships=False, highlight_
     highlight_cell : tuple[int,int] lub None
         Jeśli nie None, zawiera (r,c) pojedynczego pola, które ma być podświetlone obwódką koloru
         COLOR_HIGHLIGHT. Używane przy ustawianiu statków do wyraźnego pokazania, gdzie stanie statek.
+    heatmap : list[list[float]] lub numpy.ndarray lub None
+        Jeśli nie None, to wartości 0..1 dla każdego pola (np. analytics.ShotStats.heatmap()),
+        rysowane jako półprzezroczysta nakładka COLOR_HIGHLIGHT o kryciu rosnącym z wartością.
 
     Mechanika:
     ----------
@@ -64,6 +116,8 @@ def draw_grid(surface, top_left, board_matrix=None, hide_ships=False, highlight_
          'X' → COLOR_HIT,
          'O' → COLOR_MISS.
        - Rysujemy wypełniony prostokąt, a następnie obrys (COLOR_GRID_BG, szer. 1 px).
+       - Jeśli podano `heatmap`, nakładamy kafelek overlay_surface() o kryciu
+         zaokrąglonym do jednego z HEATMAP_LEVELS poziomów.
     2. Po narysowaniu całej siatki, jeśli `highlight_cell` jest podane i mieści się w zakresach,
        rysujemy obrys prostokąta kolorem COLOR_HIGHLIGHT (grubość 3 px) wokół danego pola.
     """
@@ -92,6 +146,12 @@ def draw_grid(surface, top_left, board_matrix=None, hide_ships=False, highlight_
             pygame.draw.rect(surface, color, rect)
             pygame.draw.rect(surface, COLOR_GRID_BG, rect, 1)
 
+            if heatmap is not None:
+                level = round(min(max(float(heatmap[r][c]), 0.0), 1.0) * HEATMAP_LEVELS)
+                if level:
+                    surface.blit(overlay_surface(COLOR_HIGHLIGHT, level * HEATMAP_ALPHA // HEATMAP_LEVELS),
+                                 rect)
+
     if highlight_cell:
         hr, hc = highlight_cell
         if 0 <= hr < BOARD_SIZE and 0 <= hc < BOARD_SIZE:
@@ -104,6 +164,472 @@ def draw_grid(surface, top_left, board_matrix=None, hide_ships=False, highlight_
             pygame.draw.rect(surface, COLOR_HIGHLIGHT, hrect, 3)
 
 
+@functools.lru_cache(maxsize=None)
+def cell_surfaces(cell_size=CELL_SIZE):
+    """
+    Kafelki pól planszy renderowane raz: wypełnienie kolorem stanu i obrys COLOR_GRID_BG
+    (piksel w piksel jak w draw_grid()).
+
+    Zwraca:
+    --------
+    dict[str, pygame.Surface]
+        "~" (woda), "S" (statek), "X" (trafienie), "O" (pudło).
+    """
+    tiles = {}
+    for value, color in (("~", COLOR_WATER), ("S", COLOR_SHIP), ("X", COLOR_HIT), ("O", COLOR_MISS)):
+        tile = pygame.Surface((cell_size, cell_size))
+        SURFACES.add()
+        tile.fill(color)
+        pygame.draw.rect(tile, COLOR_GRID_BG, tile.get_rect(), 1)
+        tiles[value] = tile
+    return tiles
+
+
+class BoardRenderer:
+    """
+    Plansza rysowana przyrostowo: trwała powierzchnia `surface` z siatką i pamięć tego,
+    co aktualnie na niej widać. update() przerysowuje (jednym blitem kafelka) tylko pola,
+    których wartość zmieniła się od poprzedniego wywołania, więc klatka bez zmian to
+    porównanie wierszy i jeden blit całej planszy w draw().
+
+    Parametry:
+    ----------
+    hide_ships : bool
+        Jeśli True, pola 'S' wyglądają jak woda (plansza przeciwnika).
+    size : int
+        Liczba pól w wierszu i kolumnie.
+    cell_size : int
+        Rozmiar pola w pikselach.
+    """
+
+    def __init__(self, hide_ships=False, size=BOARD_SIZE, cell_size=CELL_SIZE):
+        self.size = size
+        self.cell_size = cell_size
+        self.surface = pygame.Surface((size * cell_size, size * cell_size))
+        self._tiles = dict(cell_surfaces(cell_size))
+        if hide_ships:
+            self._tiles["S"] = self._tiles["~"]
+        SURFACES.add()
+        if pygame.display.get_surface() is not None:
+            # Kafelki w formacie ekranu – blit bez konwersji pikseli
+            self.surface = self.surface.convert()
+            self._tiles = {value: tile.convert() for value, tile in self._tiles.items()}
+            SURFACES.add(1 + len(self._tiles))
+        self._shown = [[None] * size for _ in range(size)]
+        self._water_row = ["~"] * size
+        self.repainted = 0   # liczba pól przerysowanych przez ostatnie update()
+
+    def update(self, board_matrix=None):
+        """
+        Przerysowuje na `surface` pola, które różnią się od `board_matrix`
+        (None – sama woda, jak w draw_grid()).
+
+        Zwraca:
+        --------
+        int
+            Liczba przerysowanych pól.
+        """
+        tiles = self._tiles
+        water = tiles["~"]
+        cell = self.cell_size
+        changed = []
+        for r, shown in enumerate(self._shown):
+            row = board_matrix[r] if board_matrix else self._water_row
+            if row == shown:
+                continue
+            for c in range(self.size):
+                val = row[c]
+                if val != shown[c]:
+                    shown[c] = val
+                    changed.append((tiles.get(val, water), (c * cell, r * cell)))
+        if changed:
+            self.surface.blits(changed, doreturn=False)
+        self.repainted = len(changed)
+        return self.repainted
+
+    def draw(self, surface, top_left, board_matrix=None, highlight_cell=None):
+        """
+        Odpowiednik draw_grid(): aktualizuje planszę i rysuje ją jednym blitem
+        w punkcie `top_left`; `highlight_cell` działa jak w draw_grid().
+        """
+        self.update(board_matrix)
+        surface.blit(self.surface, top_left)
+        if highlight_cell:
+            hr, hc = highlight_cell
+            if 0 <= hr < self.size and 0 <= hc < self.size:
+                hrect = pygame.Rect(
+                    top_left[0] + hc * self.cell_size,
+                    top_left[1] + hr * self.cell_size,
+                    self.cell_size,
+                    self.cell_size
+                )
+                pygame.draw.rect(surface, COLOR_HIGHLIGHT, hrect, 3)
+
+
+# Paleta rysowania widoku (ViewportRenderer): indeksy kolorów w 8-bitowej powierzchni.
+# Kolejność stanów pól jest priorytetem przy oddaleniu (kilka pól na piksel wygrywa
+# największy kod): trafienie > statek > pudło > woda.
+CODE_WATER, CODE_MISS, CODE_SHIP, CODE_HIT, CODE_GRID, CODE_BG = range(6)
+PALETTE = [COLOR_WATER, COLOR_MISS, COLOR_SHIP, COLOR_HIT, COLOR_GRID_BG, COLOR_BG]
+GRID_MIN_PX = 4   # poniżej tylu pikseli na pole nie rysujemy siatki
+
+# Poziomy przybliżenia (piksele na pole, pola na piksel)
+ZOOM_LEVELS = (
+    (1, 32), (1, 16), (1, 8), (1, 4), (1, 3), (1, 2),
+    (1, 1), (2, 1), (3, 1), (4, 1), (6, 1), (8, 1), (12, 1), (16, 1), (24, 1), (32, 1), (40, 1), (64, 1),
+)
+
+# Znak pola ('~', 'S', 'X', 'O') → kod palety; wariant z ukrytymi statkami. Tablice
+# dla bytes.translate(): zamiana znaków na kody w C, bez indeksowania NumPy
+_CODES = bytearray([CODE_WATER]) * 256
+_CODES[ord("S")] = CODE_SHIP
+_CODES[ord("X")] = CODE_HIT
+_CODES[ord("O")] = CODE_MISS
+_CODES_HIDDEN = bytearray(_CODES)
+_CODES_HIDDEN[ord("S")] = CODE_WATER
+
+
+def window_codes(board, row0, col0, row1, col1, hide_ships=False):
+    """
+    Kody palety pól w oknie [row0, row1) × [col0, col1) planszy.
+
+    Plansza kafelkowa (z metodą tiles(), np. SparseBoard) oddaje tylko utworzone kafelki
+    okna: sklejamy je w jeden bufor, zamieniamy znaki na kody (bytes.translate)
+    i rozkładamy jednym indeksowaniem NumPy do tablicy bloków kafelków, bez pętli
+    Pythona po kafelkach; dla pozostałych plansz (Board, BitBoard) odczytujemy
+    wycinek grid.
+
+    Zwraca:
+    --------
+    numpy.ndarray
+        Tablica uint8 o kształcie (row1 - row0, col1 - col0).
+    """
+    table = _CODES_HIDDEN if hide_ships else _CODES
+    rows, cols = row1 - row0, col1 - col0
+    if hasattr(board, "tiles"):
+        chunk = SPARSE_CHUNK
+        tr0, tc0 = row0 // chunk, col0 // chunk
+        nr, nc = (row1 - 1) // chunk - tr0 + 1, (col1 - 1) // chunk - tc0 + 1
+        blocks = np.full((nr, nc, chunk, chunk), CODE_WATER, np.uint8)
+        tiles = board.tiles(row0, col0, row1, col1)
+        if tiles:
+            tops, lefts, data = zip(*tiles)
+            stack = np.frombuffer(b"".join(data).translate(table), np.uint8)
+            blocks[np.array(tops) // chunk - tr0, np.array(lefts) // chunk - tc0] = \
+                stack.reshape(-1, chunk, chunk)
+        codes = blocks.transpose(0, 2, 1, 3).reshape(nr * chunk, nc * chunk)
+        r, c = row0 - tr0 * chunk, col0 - tc0 * chunk
+        return codes[r:r + rows, c:c + cols]
+    grid = board.grid if hasattr(board, "grid") else board
+    text = "".join("".join(row[col0:col1]) for row in grid[row0:row1])
+    return np.frombuffer(text.encode("ascii").translate(table), np.uint8).reshape(rows, cols)
+
+
+class ViewportRenderer:
+    """
+    Widok planszy dowolnej wielkości w oknie o stałym rozmiarze, z przybliżaniem
+    i przesuwaniem. Zamiast pygame.draw.rect na pole budujemy w NumPy tablicę indeksów
+    palety (tylko dla pól widocznych w oknie) i kopiujemy ją jednym
+    pygame.surfarray.blit_array() do 8-bitowej powierzchni z paletą PALETTE.
+
+    - przybliżenie ≥ 1 piksel na pole: pola powielamy np.repeat, a od GRID_MIN_PX
+      pikseli dorysowujemy obrys (przy 40 px obraz jest taki jak z draw_grid()),
+    - oddalenie (kilka pól na piksel): z każdego bloku pól bierzemy największy kod,
+      więc trafienia i statki nie znikają przy podglądzie całej planszy,
+    - obraz liczymy od nowa tylko po zmianie widoku albo planszy (board.version);
+      klatka bez zmian to sam blit gotowej powierzchni, a po zmianie samej planszy
+      kafelkowej (SparseBoard.changed_tiles) przeliczamy tylko zmienione kafelki.
+
+    Parametry:
+    ----------
+    size : int
+        Liczba pól w wierszu i kolumnie planszy.
+    view_size : tuple[int, int]
+        Szerokość i wysokość okna widoku w pikselach.
+    cell_size : int
+        Początkowe przybliżenie w pikselach na pole (najbliższy poziom z ZOOM_LEVELS).
+    hide_ships : bool
+        Jeśli True, pola 'S' wyglądają jak woda (plansza przeciwnika).
+    """
+
+    def __init__(self, size, view_size, cell_size=CELL_SIZE, hide_ships=False):
+        self.size = size
+        self.view_size = view_size
+        self.hide_ships = hide_ships
+        self.level = min(range(len(ZOOM_LEVELS)),
+                         key=lambda i: abs(ZOOM_LEVELS[i][0] / ZOOM_LEVELS[i][1] - cell_size))
+        self.offset = (0, 0)    # piksel obrazu planszy w lewym górnym rogu widoku
+        self.surface = pygame.Surface(view_size, depth=8)
+        self.surface.set_palette(PALETTE)
+        SURFACES.add()
+        self.rendered = 0       # pola przeliczone przy ostatnim odświeżeniu obrazu
+        self._key = None        # (level, offset, hide_ships) ostatniego obrazu
+        self._version = None    # board.version ostatniego obrazu
+        self._cells = 0
+
+    @property
+    def scale(self):
+        """
+        Piksele na pole przy bieżącym przybliżeniu (ułamek przy oddaleniu).
+        """
+        px, step = ZOOM_LEVELS[self.level]
+        return px / step
+
+    def _image_size(self):
+        px, step = ZOOM_LEVELS[self.level]
+        return -(-self.size // step) * px
+
+    def _clamp(self, x, y):
+        limit = self._image_size()
+        x = max(0, min(int(x), limit - self.view_size[0]))
+        y = max(0, min(int(y), limit - self.view_size[1]))
+        return x, y
+
+    def pan(self, dx, dy):
+        """
+        Przesuwa widok o (dx, dy) pikseli (obraz nie wyjeżdża poza krawędzie planszy).
+        """
+        self.offset = self._clamp(self.offset[0] + dx, self.offset[1] + dy)
+
+    def zoom(self, steps, anchor=None):
+        """
+        Zmienia przybliżenie o `steps` poziomów ZOOM_LEVELS (dodatnie – przybliżenie),
+        zostawiając pod punktem `anchor` (piksel widoku; domyślnie środek) to samo pole.
+        """
+        if anchor is None:
+            anchor = (self.view_size[0] // 2, self.view_size[1] // 2)
+        old = self.scale
+        self.level = max(0, min(len(ZOOM_LEVELS) - 1, self.level + steps))
+        ratio = self.scale / old
+        self.offset = self._clamp((self.offset[0] + anchor[0]) * ratio - anchor[0],
+                                  (self.offset[1] + anchor[1]) * ratio - anchor[1])
+
+    def fit(self):
+        """
+        Największe przybliżenie, przy którym cała plansza mieści się w widoku.
+        """
+        fitting = [i for i, (px, step) in enumerate(ZOOM_LEVELS)
+                   if -(-self.size // step) * px <= min(self.view_size)]
+        self.level = fitting[-1] if fitting else 0
+        self.offset = (0, 0)
+
+    def cell_at(self, pos):
+        """
+        Zamienia piksel widoku `pos` na (row, col) albo (None, None) poza planszą.
+        """
+        scale = self.scale
+        row = int((self.offset[1] + pos[1]) / scale)
+        col = int((self.offset[0] + pos[0]) / scale)
+        if 0 <= pos[0] < self.view_size[0] and 0 <= pos[1] < self.view_size[1] \
+                and 0 <= row < self.size and 0 <= col < self.size:
+            return row, col
+        return None, None
+
+    def render(self, board):
+        """
+        Aktualizuje `surface` dla planszy `board` (obiekt planszy albo macierz grid)
+        i ją zwraca. Obraz liczymy tylko dla widocznego okna pól, a jeśli zmieniła się
+        tylko plansza z changed_tiles() (SparseBoard), to tylko dla zmienionych kafelków.
+        """
+        version = getattr(board, "version", None)
+        key = (self.level, self.offset, self.hide_ships)
+        if version is not None and key == self._key:
+            if version == self._version:
+                return self.surface
+            if hasattr(board, "changed_tiles"):
+                self._update(board)
+                self._version = version
+                return self.surface
+        self._key = key
+        self._version = version
+
+        width, height = self.view_size
+        x, y = self.offset
+        px, _ = ZOOM_LEVELS[self.level]
+        u0, v0, u1, v1 = self._blocks()
+        codes = self._codes(board, u0, v0, u1, v1)
+        self.rendered = self._cells
+        view = np.full((height, width), CODE_BG, np.uint8)
+        part = codes[y - v0 * px:y - v0 * px + height, x - u0 * px:x - u0 * px + width]
+        view[:part.shape[0], :part.shape[1]] = part
+        pygame.surfarray.blit_array(self.surface, view.T)
+        return self.surface
+
+    def _blocks(self):
+        """
+        Okno widocznych bloków (blok = `step` pól, `px` pikseli): (u0, v0, u1, v1).
+        """
+        px, step = ZOOM_LEVELS[self.level]
+        x, y = self.offset
+        units = -(-self.size // step)
+        return (x // px, y // px,
+                min(units, -(-(x + self.view_size[0]) // px)), min(units, -(-(y + self.view_size[1]) // px)))
+
+    def _codes(self, board, u0, v0, u1, v1):
+        """
+        Piksele (kody palety) bloków [v0, v1) × [u0, u1); liczbę przeliczonych pól
+        zapisuje w _cells.
+        """
+        px, step = ZOOM_LEVELS[self.level]
+        codes = window_codes(board, v0 * step, u0 * step,
+                             min(self.size, v1 * step), min(self.size, u1 * step), self.hide_ships)
+        self._cells = codes.size
+        if step > 1:
+            # Maksimum z bloków step×step: najpierw co step-ty wiersz, potem kolumna
+            rows, cols = codes.shape
+            padded = np.zeros((-(-rows // step) * step, -(-cols // step) * step), np.uint8)
+            padded[:rows, :cols] = codes
+            pooled = padded[0::step]
+            for i in range(1, step):
+                pooled = np.maximum(pooled, padded[i::step])
+            codes = pooled[:, 0::step]
+            for i in range(1, step):
+                codes = np.maximum(codes, pooled[:, i::step])
+        if px > 1:
+            codes = np.repeat(np.repeat(codes, px, axis=0), px, axis=1)
+            if px >= GRID_MIN_PX:
+                edge_r = np.arange(codes.shape[0]) % px
+                edge_c = np.arange(codes.shape[1]) % px
+                codes[(edge_r == 0) | (edge_r == px - 1), :] = CODE_GRID
+                codes[:, (edge_c == 0) | (edge_c == px - 1)] = CODE_GRID
+        return codes
+
+    def _update(self, board):
+        """
+        Przelicza tylko bloki kafelków planszy zmienionych od poprzedniego obrazu
+        (np. jeden kafelek po strzale) i kopiuje je na `surface`.
+        """
+        px, step = ZOOM_LEVELS[self.level]
+        x, y = self.offset
+        u0, v0, u1, v1 = self._blocks()
+        self.rendered = 0
+        changed = board.changed_tiles(self._version, v0 * step, u0 * step,
+                                      min(self.size, v1 * step), min(self.size, u1 * step))
+        for top, left in changed:
+            bu0, bv0 = max(u0, left // step), max(v0, top // step)
+            bu1 = min(u1, -(-(left + SPARSE_CHUNK) // step))
+            bv1 = min(v1, -(-(top + SPARSE_CHUNK) // step))
+            codes = self._codes(board, bu0, bv0, bu1, bv1)
+            self.rendered += self._cells
+            # Część bloków może wystawać poza widok – przycinamy do okna
+            dx, dy = bu0 * px - x, bv0 * px - y
+            part = codes[max(0, -dy):self.view_size[1] - dy, max(0, -dx):self.view_size[0] - dx]
+            if part.size:
+                rect = (max(0, dx), max(0, dy), part.shape[1], part.shape[0])
+                pygame.surfarray.blit_array(self.surface.subsurface(rect), part.T)
+
+    def draw(self, surface, top_left, board):
+        """
+        Rysuje widok planszy `board` jednym blitem w punkcie `top_left`.
+        """
+        surface.blit(self.render(board), top_left)
+
+
+class TextCache:
+    """
+    Pamięć wyrenderowanych napisów jednej czcionki, z ograniczeniem LRU.
+
+    Napis w pasku informacyjnym zmienia się tylko przy zmianie fazy lub tury, więc
+    zamiast font.render() w każdej klatce zwracamy gotową powierzchnię.
+
+    Parametry:
+    ----------
+    font : pygame.font.Font
+        Czcionka, którą renderujemy napisy.
+    maxsize : int
+        Najwięcej pamiętanych napisów; najdawniej używany wypada pierwszy.
+    """
+
+    def __init__(self, font, maxsize=TEXT_CACHE_SIZE):
+        self.font = font
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._surfaces = collections.OrderedDict()
+
+    def render(self, text, color=COLOR_TEXT):
+        """
+        Zwraca powierzchnię z napisem `text` w kolorze `color` (antyaliasing włączony).
+        Zwróconej powierzchni nie wolno modyfikować – jest współdzielona.
+        """
+        key = (text, color)
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surf
+        self.misses += 1
+        surf = self.font.render(text, True, color)
+        SURFACES.add()
+        self._surfaces[key] = surf
+        if len(self._surfaces) > self.maxsize:
+            self._surfaces.popitem(last=False)
+        return surf
+
+    def clear(self):
+        self._surfaces.clear()
+
+
+@functools.lru_cache(maxsize=None)
+def overlay_surface(color, alpha=PREVIEW_ALPHA, cell_size=CELL_SIZE):
+    """
+    Półprzezroczysty kafelek podglądu (jeden na kolor, tworzony raz).
+    """
+    overlay = pygame.Surface((cell_size, cell_size), pygame.SRCALPHA)
+    SURFACES.add()
+    overlay.fill((*color, alpha))
+    return overlay
+
+
+def draw_preview(surface, top_left, row, col, length, orient, valid):
+    """
+    Rysuje podgląd ustawianego statku: kafelki COLOR_HIGHLIGHT (poprawne miejsce) albo
+    COLOR_INVALID, obcięte do krawędzi planszy. Nie tworzy nowych powierzchni.
+
+    Parametry:
+    ----------
+    surface : pygame.Surface
+        Powierzchnia docelowa (ekran).
+    top_left : tuple[int, int]
+        Lewy górny róg planszy.
+    row, col : int
+        Pole początkowe statku.
+    length : int
+        Długość statku.
+    orient : str
+        "H" (poziomo) lub "V" (pionowo).
+    valid : bool
+        Czy statek można tu postawić.
+    """
+    overlay = overlay_surface(COLOR_HIGHLIGHT if valid else COLOR_INVALID)
+    x0, y0 = top_left
+    if orient == "H":
+        cells = [(row, cc) for cc in range(col, min(col + length, BOARD_SIZE))]
+    else:  # orientacja "V"
+        cells = [(rr, col) for rr in range(row, min(row + length, BOARD_SIZE))]
+    surface.blits([(overlay, (x0 + cc * CELL_SIZE, y0 + rr * CELL_SIZE)) for rr, cc in cells],
+                  doreturn=False)
+
+
+def draw_info_bar(surface, text_cache, lines):
+    """
+    Rysuje pasek informacyjny u dołu okna i wypisuje w nim kolejne `lines`
+    (pary (tekst, kolor) lub None dla pustej linii) z pamięci `text_cache`.
+
+    Zwraca:
+    --------
+    pygame.Rect
+        Obszar paska (do pygame.display.update()).
+    """
+    rect = pygame.Rect(0, WINDOW_HEIGHT - INFO_HEIGHT, WINDOW_WIDTH, INFO_HEIGHT)
+    pygame.draw.rect(surface, COLOR_GRID_BG, rect)
+    for i, line in enumerate(lines):
+        if line:
+            text, color = line
+            surface.blit(text_cache.render(text, color), (MARGIN, rect.top + 15 + i * 20))
+    return rect
+
+
 def get_cell_coords(mouse_pos, top_left):
     """
     Konwertuje współrzędne kursora (x,y) na współrzędne pola (r,c) na planszy.
@@ -167,3 +693,54 @@ def info_text(current_phase, my_player, my_turn, ship_index, ships_list):
             return f"Player {my_player}: kliknij w prawą planszę, aby atakować"
         else:
             return f"Player {my_player}: czekaj na ruch przeciwnika"
+
+
+def latency_text(stats):
+    """
+    Generuje tekst nakładki diagnostycznej (F3) z wyników Connection.stats().
+
+    Parametry:
+    ----------
+    stats : dict
+        Słownik zwrócony przez network.Connection.stats().
+
+    Zwraca:
+    --------
+    str
+        Np. "RTT p50 12.1 / p95 30.4 / p99 41.0 ms (n=25)  ping 0.4 ms  cisza 0.3 s".
+    """
+    def ms(value):
+        return "-" if value is None else f"{value * 1000:.1f}"
+
+    rtt = stats["rtt"]
+    ping = stats["ping"]
+    text = f"RTT p50 {ms(rtt['p50'])} / p95 {ms(rtt['p95'])} / p99 {ms(rtt['p99'])} ms (n={rtt['count']})"
+    if ping["count"]:
+        text += f"  ping {ms(ping['p50'])} ms"
+    text += f"  cisza {stats['idle']:.1f} s"
+    if stats["queued_bytes"]:
+        text += f"  kolejka {stats['queued_bytes']} B"
+    return text
+
+
+def metrics_text(summary, stats):
+    """
+    Generuje tekst nakładki wydajności (F4).
+
+    Parametry:
+    ----------
+    summary : dict
+        Słownik zwrócony przez metrics.FrameMetrics.summary().
+    stats : dict
+        Słownik zwrócony przez network.Connection.stats().
+
+    Zwraca:
+    --------
+    str
+        Np. "sieć 0.05  logika 0.02  rys. 1.31  flip 0.40 ms (max 6.2)  wiad. 40/38  B 812/760".
+    """
+    text = (f"sieć {summary['network']:.2f}  logika {summary['logic']:.2f}"
+            f"  rys. {summary['render']:.2f}  flip {summary['flip']:.2f} ms (max {summary['max']:.1f})")
+    text += f"  wiad. {stats['messages_in']}/{stats['messages_out']}"
+    text += f"  B {stats['bytes_in']}/{stats['bytes_out']}"
+    return text
@@ -2,10 +2,13 @@
 
 """
 Główna część aplikacji, która integruje moduły:
-- board.py  → logika planszy,
+- session.py → reguły gry (GameSession: fazy, tura, plansze) – bez Pygame,
 - network.py → komunikacja TCP w trybie host/klient,
 - gui.py     → rysowanie interfejsu w Pygame.
 
+main.py jest cienkim widokiem: przekazuje sesji akcje gracza, a ze zdarzeń
+zwracanych przez GameSession.update() robi dźwięki i przerysowania.
+
 Schemat działania:
 1. Inicjalizacja Pygame oraz połączenia sieciowego (host/klient).
 2. Faza "placement" – każdy gracz (host to gracz 1, klient to gracz 2) ustawia swoje statki.
@@ -17,17 +20,46 @@ Schemat działania:
    - Na tej podstawie odtwarzamy dźwięk trafienia/pudła/zatopienia statku → odsyłamy {"type":"result","hit":..., "sunk":..., "gameover":...}.
    - W tle leci muzyka.
    - Zwycięzca/przegrany zobaczy odpowiedni komunikat, a gra zakończy się.
+
+Pętla główna jest sterowana zdarzeniami: gdy nic się nie zmieniło, śpi
+w pygame.event.wait() – zdarzenie gracza albo wiadomość sieciowa budzą ją w ciągu
+~1 ms, a bez nich budzi się co EVENT_WAIT sekund; zmiany stanu zaznaczają tylko
+obszary do przerysowania (lewa/prawa plansza, pasek informacyjny), przekazywane potem do
+pygame.display.update(rects). Bezczynna gra prawie nie zużywa procesora.
+
+Socketem zajmuje się wątek sieciowy (network.NetworkThread): odbiera i wysyła
+wiadomości oraz prowadzi heartbeat, a odebrane wiadomości oddaje przez kolejkę
+i budzi pętlę własnym zdarzeniem Pygame (NETWORK_EVENT). Wolny przeciwnik nie
+wstrzymuje więc klatki, a wiadomość nie czeka na koniec snu pętli.
+
+Diagnostyka (metrics.py): F3 – opóźnienia łącza, F4 – czasy faz klatki (sieć,
+logika, rysowanie, flip) i liczniki wiadomości/bajtów, F5 – włącza/wyłącza profiler
+próbkujący (zestawienie trafia na standardowe wyjście). Z --metrics PLIK metryki są
+też okresowo zrzucane do pliku (JSONL albo tekst Prometheusa).
 """
 
+import argparse
 import pygame
 import pygame.mixer
 import sys
-from board import Board
-from network import send_json, try_receive_from_buffer, init_network
+import time
+from assets import AssetManager, StartupTimer
+from board import SHIPS
+from matchlog import MatchLogWriter
+from metrics import FrameMetrics, MetricsDumper, SamplingProfiler
+from network import Multiplexer, NetworkThread, init_network
+from session import GameSession, GAME, PLACEMENT, WAITING
 from gui import (
-    draw_grid,
+    BoardRenderer,
+    TextCache,
+    draw_info_bar,
+    draw_preview,
     get_cell_coords,
     info_text,
+    latency_text,
+    metrics_text,
+    overlay_surface,
+    SURFACES,
     BOARD_SIZE,
     CELL_SIZE,
     MARGIN,
@@ -36,346 +68,312 @@ from gui import (
     WINDOW_WIDTH,
     WINDOW_HEIGHT,
     COLOR_BG,
-    COLOR_GRID_BG, COLOR_INVALID, COLOR_HIGHLIGHT, COLOR_TEXT,
+    COLOR_INVALID, COLOR_HIGHLIGHT, COLOR_TEXT,
 )
-import json
 
-# Lista statków (nazwa, długość)
-SHIPS = [
-    ("Lotniskowiec", 5),
-    ("Okręt liniowy", 4),
-    ("Krążownik", 3),
-    ("Podwodny", 3),
-    ("Niszczyciel", 2),
-]
+EVENT_WAIT = 0.25    # Najdłuższy sen pętli bez zdarzeń (s); zdarzenia budzą ją od razu
+NETWORK_EVENT = pygame.event.custom_type()  # Wstawia wątek sieciowy po odebraniu wiadomości
 
 
-def main():
+def main(log_path=None, metrics_path=None, metrics_format="jsonl"):
     """
     Funkcja uruchamiająca grę:
     - Inicjalizuje Pygame.
-    - Tworzy instancje planszy dla obu graczy.
-    - Inicjalizuje połączenie sieciowe (host/klient).
+    - Inicjalizuje połączenie sieciowe (host/klient) i tworzy GameSession
+      (z `log_path` – zapisującą mecz do dziennika matchlog).
+    - Z `metrics_path` co DUMP_INTERVAL sekund zrzuca metryki klatek i łącza
+      w formacie `metrics_format` ("jsonl" albo "prom").
     - Obsługuje pętlę główną, uwzględniając:
        * fazę 'placement',
        * fazę 'waiting_opponent',
        * fazę 'game'.
     - Po zakończeniu (zwycięstwo/przegrana) zamyka socket i kończy działanie Pygame.
     """
-    pygame.init()
-    pygame.mixer.init()
-
-    pygame.mixer.music.load("sounds/bg_music.mp3")
-    pygame.mixer.music.set_volume(0.0)
-    pygame.mixer.music.play(-1)
-
-    miss_sound = pygame.mixer.Sound("sounds/miss.mp3")
-    hit_sound  = pygame.mixer.Sound("sounds/hit.mp3")
-    sink_sound = pygame.mixer.Sound("sounds/sink.mp3")
-
-    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-    pygame.display.set_caption("Statki Sieciowe (Pygame)")
-    clock = pygame.time.Clock()
-    font = pygame.font.SysFont("arial", 24)
-    small_font = pygame.font.SysFont("arial", 18)
-
-    # Plansze: player_boards[1] – plansza hosta; player_boards[2] – plansza klienta
-    player_boards = {
-        1: Board(),
-        2: Board()
-    }
-    # guess_boards przechowują strzały skierowane do przeciwnika
-    guess_boards = {
-        1: [["~"] * BOARD_SIZE for _ in range(BOARD_SIZE)],
-        2: [["~"] * BOARD_SIZE for _ in range(BOARD_SIZE)]
+    # Okno otwieramy od razu; pliki dźwięków i czcionek czytają się w tle (AssetManager),
+    # także w czasie, gdy gracz wybiera tryb w menu sieci – obiekty SDL tworzymy tutaj
+    timer = StartupTimer()
+    with timer.stage("pygame.display.init"):
+        pygame.display.init()
+    assets = AssetManager(timer=timer)
+    assets.music("bg_music", volume=0.0)
+    for name in ("miss", "hit", "sink"):
+        assets.load_sound(name)
+    assets.load_font("arial")
+
+    with timer.stage("okno"):
+        screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        pygame.display.set_caption("Statki Sieciowe (Pygame)")
+
+    with timer.stage("sieć (menu i połączenie)"):
+        connection, my_player, is_host = init_network()
+
+    # Napisy renderujemy raz i trzymamy w pamięci; kafelki podglądu statku (oba kolory)
+    # tworzymy od razu, żeby pętla główna nie alokowała powierzchni
+    with timer.stage("czcionki (oczekiwanie)"):
+        title_cache = TextCache(assets.font("arial", 24))
+        text_cache = TextCache(assets.font("arial", 18))
+    # Dźwięki bez wpisu w pamięci podręcznej (pierwsze uruchomienie) dekodujemy teraz,
+    # w wątku głównym, a nie przy pierwszym strzale
+    with timer.stage("dźwięki"):
+        for name in ("miss", "hit", "sink"):
+            assets.sound(name)
+    overlay_surface(COLOR_HIGHLIGHT)
+    overlay_surface(COLOR_INVALID)
+
+    # Gra toczy się na kanale 0 połączenia; regułami (fazy, tura, plansze) zarządza
+    # GameSession, a ta pętla jest tylko widokiem: przekazuje jej akcje gracza,
+    # odtwarza dźwięki zdarzeń i przerysowuje zmienione obszary
+    # Od tej chwili socket obsługuje wątek sieciowy; Multiplexer odbiera i wysyła
+    # przez jego kolejki
+    net = NetworkThread(connection,
+                        notify=lambda: pygame.event.post(pygame.event.Event(NETWORK_EVENT)))
+    mux = Multiplexer(net)
+    match_log = MatchLogWriter(log_path) if log_path else None
+    session = GameSession(mux.channel(0), my_player, is_host, log=match_log)
+    show_latency = False            # Nakładka z opóźnieniami łącza (F3)
+    show_metrics = False            # Nakładka z czasami faz klatki (F4)
+    # Pomiar faz istnieje tylko, gdy ktoś go czyta (F4 lub zrzut do pliku); inaczej
+    # pętla płaci jedynie za sprawdzenie `metrics is not None`
+    metrics = None
+    dumper = None
+    profiler = None                 # Profiler próbkujący (F5)
+    if metrics_path:
+        metrics = FrameMetrics()
+        dumper = MetricsDumper(metrics_path, lambda: metrics.snapshot(net.stats()),
+                               fmt=metrics_format)
+
+    left_top = (MARGIN, MARGIN)
+    right_top = (MARGIN + BOARD_SIZE * CELL_SIZE + GRID_GAP, MARGIN)
+    # Obszary ekranu odświeżane niezależnie (pygame.display.update(rects))
+    regions = {
+        "screen": screen.get_rect(),
+        "left": pygame.Rect(left_top, (BOARD_SIZE * CELL_SIZE, BOARD_SIZE * CELL_SIZE)),
+        "right": pygame.Rect(right_top, (BOARD_SIZE * CELL_SIZE, BOARD_SIZE * CELL_SIZE)),
+        "info": pygame.Rect(0, WINDOW_HEIGHT - INFO_HEIGHT, WINDOW_WIDTH, INFO_HEIGHT),
     }
-
-    global current_phase, ship_index, orientation, my_turn, ready_received, net_buffer, my_player
-    current_phase = "placement"     # Początkowo obie strony w fazie ustawiania
-    orientation = "H"               # Domyślna orientacja statku: poziomo
-    ship_index = 0                  # Indeks pierwszego statku do ustawienia
-    my_turn = False                 # W fazie 'game' host zacznie turę, więc ustawimy niżej
-    ready_received = False          # Czy otrzymaliśmy {"type":"ready"} od przeciwnika
-    net_buffer = ""                 # Bufor do odczytu JSON
-
-    connection_sock, my_player, is_host = init_network()
-
-
-    my_turn = False
-
-    running = True
-    while running:
-        clock.tick(30)
+    # Plansze rysowane przyrostowo: każda ma własną powierzchnię, na której
+    # przerysowujemy tylko pola zmienione od poprzedniego rysowania
+    own_view = BoardRenderer()
+    guess_view = BoardRenderer()
+    dirty = {"screen"}              # Obszary do narysowania; na starcie cały ekran
+    hover_cell = None               # Pole pod kursorem w fazie 'placement' (podgląd statku)
+    stats_refresh = 0.0             # Kiedy odświeżyć nakładkę F3/F4 (time.perf_counter(), s)
+    frame_surfaces = 0              # Powierzchnie utworzone w ostatniej narysowanej klatce
+
+    def show_banner(lines, color):
+        """
+        Komunikat końcowy na środku ekranu, widoczny przez 3 sekundy.
+        """
         screen.fill(COLOR_BG)
-
-        left_top = (MARGIN, MARGIN)
-        right_top = (MARGIN + BOARD_SIZE * CELL_SIZE + GRID_GAP, MARGIN)
-
-        mx, my = pygame.mouse.get_pos()
-        highlight = None
-
-        # 0) Jeśli w fazie 'game', odczytujemy komunikaty sieciowe (attack/result)
-        if current_phase == "game" and connection_sock:
-            msgs, net_buffer = try_receive_from_buffer(connection_sock, net_buffer)
-            for msg in msgs:
-                if msg["type"] == "attack":
-                    """
-                    Obserwujemy ruch przeciwnika:
-                    - Otrzymaliśmy r, c → wykonujemy receive_attack() dla własnej planszy.
-                    - Sprawdzamy, czy dany statek został zatopiony (sunk) oraz czy cała flota przegrała (all_sunk).
-                    - Odsylamy reply: {"type":"result", "row":r, "col":c, "hit":..., "sunk":..., "gameover":...}.
-                    - Jeśli przegrałem całą flotę, wyświetlam komunikat przegranego i kończymy.
-                    - W przeciwnym razie, my_turn = True.
-                    """
-                    r = msg["row"]
-                    c = msg["col"]
-                    res, sunk = player_boards[my_player].receive_attack(r, c)
-                    lost = False
-
-                    if res and player_boards[my_player].all_sunk():
-                        lost = True
-
-                    if res is True:
-                        if sunk:
-                            sink_sound.play()
-                        else:
-                            hit_sound.play()
-                    elif res is False:
-                        miss_sound.play()
-
-                    reply = {
-                        "type": "result",
-                        "row": r,
-                        "col": c,
-                        # jeśli res jest None, to zwracamy False
-                        "hit": False if res is None else res,
-                        "sunk": True if sunk else False,
-                        "gameover": lost
-                    }
-                    send_json(connection_sock, reply)
-
-                    if lost:
-                        screen.fill(COLOR_BG)
-                        lose_lines = [
-                            f"Player {my_player} przegrał!",
-                            "Dziękujemy za grę."
-                        ]
-                        for i, line in enumerate(lose_lines):
-                            text_surf = font.render(line, True, (255, 50, 50))
-                            screen.blit(
-                                text_surf,
-                                (
-                                    WINDOW_WIDTH // 2 - text_surf.get_width() // 2,
-                                    WINDOW_HEIGHT // 2 - 20 + i * 30
-                                )
-                            )
-                        pygame.display.flip()
-                        pygame.time.delay(3000)
-                        running = False
-                        break
-
-                    my_turn = True
-
-                elif msg["type"] == "result":
-                    """
-                    Odpowiedź na mój atak:
-                    - msg["hit"] → prawda/fałsz, msg["sunk"] → czy mój atak zatopił cały okręt,
-                      msg["gameover"] → czy cała flota przeciwnika właśnie przegrała.
-                    - Aktualizujemy guess_boards: 'X' jeśli trafienie, 'O' jeśli pudło.
-                    - Odtwarzamy odpowiedni dźwięk (hit/miss/sink).
-                    - Jeśli gameover == True → wyświetlamy komunikat zwycięzcy i kończymy.
-                    - W przeciwnym razie: my_turn = False.
-                    """
-                    r = msg["row"]
-                    c = msg["col"]
-                    hit = msg.get("hit", False)
-                    sunk = msg.get("sunk", False)
-                    gameov = msg.get("gameover", False)
-
-                    if hit:
-                        if sunk:
-                            sink_sound.play()
-                        else:
-                            hit_sound.play()
-                        guess_boards[my_player][r][c] = "X"
-                    else:
-                        miss_sound.play()
-                        guess_boards[my_player][r][c] = "O"
-
-                    if gameov:
-                        screen.fill(COLOR_BG)
-                        win_lines = [
-                            f"Player {my_player} wygrał!",
-                            "Gratulacje!"
-                        ]
-                        for i, line in enumerate(win_lines):
-                            text_surf = font.render(line, True, (50, 255, 50))
-                            screen.blit(
-                                text_surf,
-                                (
-                                    WINDOW_WIDTH // 2 - text_surf.get_width() // 2,
-                                    WINDOW_HEIGHT // 2 - 20 + i * 30
-                                )
-                            )
-                        pygame.display.flip()
-                        pygame.time.delay(3000)
-                        running = False
-                        break
-
-                    my_turn = False
-
-        # 1) FAZA "placement" – rysowanie własnej planszy i podgląd statku
-        if current_phase == "placement":
-            draw_grid(
-                screen,
-                left_top,
-                board_matrix=player_boards[my_player].grid,
-                hide_ships=False,
-                highlight_cell=None
-            )
-            draw_grid(
-                screen,
-                right_top,
-                board_matrix=None,
-                hide_ships=False,
-                highlight_cell=None
-            )
-
-            r_h, c_h = get_cell_coords((mx, my), left_top)
-            if r_h is not None and ship_index < len(SHIPS):
-                highlight = (r_h, c_h)
-                name, length = SHIPS[ship_index]
-                preview_cells = []
-                valid_placement = True
-
-                if orientation == "H":
-                    for dc in range(length):
-                        rr = r_h
-                        cc = c_h + dc
-                        if cc >= BOARD_SIZE:
-                            valid_placement = False
-                            break
-                        if player_boards[my_player].grid[rr][cc] == "S":
-                            valid_placement = False
-                        preview_cells.append((rr, cc))
-                else:  # orientacja "V"
-                    for dr in range(length):
-                        rr = r_h + dr
-                        cc = c_h
-                        if rr >= BOARD_SIZE:
-                            valid_placement = False
-                            break
-                        if player_boards[my_player].grid[rr][cc] == "S":
-                            valid_placement = False
-                        preview_cells.append((rr, cc))
-
-                for (rr, cc) in preview_cells:
-                    cell_rect = pygame.Rect(
-                        left_top[0] + cc * CELL_SIZE,
-                        left_top[1] + rr * CELL_SIZE,
-                        CELL_SIZE,
-                        CELL_SIZE
-                    )
-                    overlay = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA)
-                    if valid_placement and len(preview_cells) == length:
-                        overlay.fill((*COLOR_HIGHLIGHT, 100))
-                    else:
-                        overlay.fill((*COLOR_INVALID, 100))
-                    screen.blit(overlay, cell_rect.topleft)
-
-        # 2) FAZA "waiting_opponent" – czekanie na "ready"
-        elif current_phase == "waiting_opponent":
-            screen.fill(COLOR_BG)
-            pygame.draw.rect(
-                screen,
-                COLOR_GRID_BG,
-                (0, WINDOW_HEIGHT - INFO_HEIGHT, WINDOW_WIDTH, INFO_HEIGHT)
-            )
-            info_surf = small_font.render(info_text(current_phase, my_player, my_turn, ship_index, SHIPS), True, COLOR_TEXT)
-            screen.blit(info_surf, (MARGIN, WINDOW_HEIGHT - INFO_HEIGHT + 15))
-            pygame.display.flip()
-
-            msgs, net_buffer = try_receive_from_buffer(connection_sock, net_buffer)
-            for msg in msgs:
-                if msg.get("type") == "ready":
-                    ready_received = True
-
-            if ready_received:
-                current_phase = "game"
-                my_turn = is_host
-
-            continue
-
-        # 3) FAZA "game" – rysujemy obie plansze
-        else:
-            draw_grid(
-                screen,
-                left_top,
-                board_matrix=player_boards[my_player].grid,
-                hide_ships=False,
-                highlight_cell=None
-            )
-            draw_grid(
-                screen,
-                right_top,
-                board_matrix=guess_boards[my_player],
-                hide_ships=False,
-                highlight_cell=None
+        for i, line in enumerate(lines):
+            text_surf = title_cache.render(line, color)
+            screen.blit(
+                text_surf,
+                (
+                    WINDOW_WIDTH // 2 - text_surf.get_width() // 2,
+                    WINDOW_HEIGHT // 2 - 20 + i * 30
+                )
             )
+        pygame.display.flip()
+        pygame.time.delay(3000)
 
-        # 4) Pasek informacyjny
-        pygame.draw.rect(
-            screen,
-            COLOR_GRID_BG,
-            (0, WINDOW_HEIGHT - INFO_HEIGHT, WINDOW_WIDTH, INFO_HEIGHT)
-        )
-        info_surf = small_font.render(info_text(current_phase, my_player, my_turn, ship_index, SHIPS), True, COLOR_TEXT)
-        screen.blit(info_surf, (MARGIN, WINDOW_HEIGHT - INFO_HEIGHT + 15))
-
-        # 5) Obsługa zdarzeń
-        for event in pygame.event.get():
+    running = True
+    while running:
+        # 0) Nie ma nic do narysowania – śpimy, aż przyjdzie zdarzenie gracza albo
+        #    NETWORK_EVENT od wątku sieciowego, najwyżej EVENT_WAIT. wait() sprawdza
+        #    kolejkę SDL co 1 ms, więc krótszy limit nie skraca reakcji na wejście,
+        #    a tylko zwiększa zużycie procesora w bezczynności. Zdarzenie zwrócone
+        #    przez wait() obsługujemy razem z resztą kolejki. Nie wołamy
+        #    pygame.event.peek() bez argumentów: w Pygame 2.6 gubi ono referencję do
+        #    słownika wstawionego zdarzenia i NETWORK_EVENT psułby pamięć
+        #    (python -m benchmarks.eventpost)
+        events = []
+        if not dirty:
+            event = pygame.event.wait(int(EVENT_WAIT * 1000))
+            if event.type != pygame.NOEVENT:
+                events.append(event)
+        if metrics is not None:
+            metrics.begin()
+
+        # Przekazujemy wątkowi sieciowemu wiadomości kanałów i odbieramy to, co już
+        # odczytał z socketu (heartbeat i odpowiedzi "pong" obsługuje sam wątek)
+        try:
+            mux.flush()
+            mux.poll()
+        except ConnectionError:
+            show_banner(["Utracono połączenie z przeciwnikiem"], (255, 50, 50))
+            break
+        if metrics is not None:
+            metrics.lap("network")
+
+        # 1) Wiadomości przeciwnika (ready/attack/result) obsługuje sesja; my pokazujemy
+        #    zdarzenia: dźwięk strzału, przerysowanie planszy, ekran końca gry
+        for event in session.update():
+            kind = event["type"]
+            if kind == "start":
+                dirty.add("screen")
+            elif kind in ("attacked", "result"):
+                if event["hit"] is not None:
+                    # Dźwięk, który jeszcze się dekoduje, po prostu pomijamy
+                    name = "sink" if event["sunk"] else "hit" if event["hit"] else "miss"
+                    assets.sound(name).play()
+                dirty.update(("left" if kind == "attacked" else "right", "info"))
+            elif kind == "over":
+                if event["won"]:
+                    show_banner([f"Player {my_player} wygrał!", "Gratulacje!"], (50, 255, 50))
+                else:
+                    show_banner([f"Player {my_player} przegrał!", "Dziękujemy za grę."], (255, 50, 50))
+                running = False
+        if not running:
+            break
+
+        # 2) Obsługa zdarzeń – akcje gracza przekazujemy sesji, a każda zmiana stanu
+        #    zaznacza obszary do przerysowania
+        for event in events + pygame.event.get():
+            if event.type == NETWORK_EVENT:
+                # Wiadomości odebrał już mux.poll(); zdarzenie tylko budzi pętlę
+                continue
             if event.type == pygame.QUIT:
                 running = False
                 break
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                # Pasek mieści dwie linie, więc nakładki F3 i F4 wykluczają się
+                show_latency = not show_latency
+                show_metrics = False
+                dirty.add("info")
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                show_metrics = not show_metrics
+                show_latency = False
+                if show_metrics and metrics is None:
+                    metrics = FrameMetrics()
+                elif not show_metrics and dumper is None:
+                    metrics = None
+                dirty.add("info")
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F5:
+                if profiler is None:
+                    profiler = SamplingProfiler()
+                    profiler.start()
+                    print("Profiler włączony (F5 – wyłącz i wypisz zestawienie)")
+                else:
+                    profiler.stop()
+                    print(profiler.report())
+                    profiler = None
 
             # Faza "placement"
-            if current_phase == "placement":
+            if session.phase == PLACEMENT:
+                if event.type == pygame.MOUSEMOTION:
+                    # Podgląd statku przerysowujemy tylko po zmianie pola pod kursorem
+                    cell = get_cell_coords(event.pos, left_top)
+                    if cell != hover_cell:
+                        hover_cell = cell
+                        dirty.add("left")
                 if event.type == pygame.KEYDOWN and event.key == pygame.K_r:
                     # Zmiana orientacji H ↔ V
-                    orientation = "V" if orientation == "H" else "H"
+                    session.rotate()
+                    dirty.add("left")
                 if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
-                    # Gdy wszystkie statki położone, wysyłamy "ready" i czekamy
-                    if ship_index >= len(SHIPS):
-                        send_json(connection_sock, {"type": "ready"})
-                        current_phase = "waiting_opponent"
-                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and ship_index < len(SHIPS):
-                    r, c = get_cell_coords((mx, my), left_top)
+                    # Gdy wszystkie statki położone, sesja wysyła "ready" i czekamy
+                    if session.confirm():
+                        dirty.add("screen")
+                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and session.current_ship:
+                    r, c = get_cell_coords(event.pos, left_top)
                     if r is not None:
-                        name, length = SHIPS[ship_index]
-                        if player_boards[my_player].can_place(r, c, length, orientation):
-                            player_boards[my_player].place_ship(r, c, length, orientation)
-                            ship_index += 1
+                        if session.place(r, c):
+                            dirty.update(("left", "info"))
                         else:
                             # Wyświetlamy krótki komunikat o nieprawidłowym położeniu
-                            err = small_font.render("Nieprawidłowe miejsce!", True, (255, 100, 100))
+                            err = text_cache.render("Nieprawidłowe miejsce!", (255, 100, 100))
                             screen.blit(err, (MARGIN, WINDOW_HEIGHT - INFO_HEIGHT + 35))
-                            pygame.display.flip()
+                            pygame.display.update(regions["info"])
                             pygame.time.delay(600)
+                            dirty.add("info")
 
             # Faza "game" – wysyłamy atak, jeśli moja tura
-            elif current_phase == "game" and my_turn:
+            elif session.phase == GAME and session.my_turn:
                 if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                    r2, c2 = get_cell_coords((mx, my), right_top)
-                    if r2 is not None and guess_boards[my_player][r2][c2] not in ("X", "O"):
-                        send_json(connection_sock, {"type": "attack", "row": r2, "col": c2})
-                        my_turn = False
-
-        pygame.display.flip()
+                    r2, c2 = get_cell_coords(event.pos, right_top)
+                    if r2 is not None and session.fire(r2, c2):
+                        dirty.add("info")
+
+        if (show_latency or show_metrics) and time.perf_counter() >= stats_refresh:
+            # Nakładki F3/F4 pokazują wartości zmienne w czasie – odświeżamy je dwa razy na sekundę
+            stats_refresh = time.perf_counter() + 0.5
+            dirty.add("info")
+
+        if metrics is not None:
+            metrics.lap("logic")
+            if dumper is not None:
+                dumper.maybe_dump()
+        if not running or not dirty:
+            continue
 
-    # Po zakończeniu gry zatrzymujemy muzykę, zamykamy socket i kończymy Pygame
-    pygame.mixer.music.stop()
+        # 3) Rysujemy tylko zaznaczone obszary i tylko je przekazujemy do wyświetlenia
+        if "screen" in dirty:
+            screen.fill(COLOR_BG)
+            dirty = {"screen", "left", "right", "info"}
+
+        # W fazie 'waiting_opponent' widać tylko pasek informacyjny
+        if session.phase != WAITING:
+            if "left" in dirty:
+                own_view.draw(screen, left_top, session.board.grid)
+            if "right" in dirty:
+                # W fazie 'placement' prawa plansza jest pusta
+                guess_view.draw(screen, right_top, session.guess if session.phase == GAME else None)
+
+        # Podgląd ustawianego statku na własnej planszy
+        if session.current_ship and "left" in dirty:
+            r_h, c_h = get_cell_coords(pygame.mouse.get_pos(), left_top)
+            if r_h is not None:
+                name, length = session.current_ship
+                # Poprawność to jeden odczyt z maski legalnych ustawień planszy, a podgląd
+                # (obcięty do krawędzi planszy) to blity gotowych kafelków
+                draw_preview(screen, left_top, r_h, c_h, length, session.orientation,
+                             session.can_place(r_h, c_h))
+
+        # Pasek informacyjny
+        if "info" in dirty:
+            lines = [(info_text(session.phase, my_player, session.my_turn, session.ship_index, SHIPS),
+                      COLOR_TEXT)]
+            if show_latency:
+                # Nakładka diagnostyczna: RTT atak → wynik, ping, czas ciszy łącza
+                # i liczba powierzchni utworzonych w poprzedniej klatce
+                lines.append((f"{latency_text(net.stats())}  pow./kl. {frame_surfaces}", COLOR_TEXT))
+            elif show_metrics:
+                # Średnie czasy faz (ms), najdłuższa klatka i wiadomości/bajty odebrane/wysłane
+                lines.append((metrics_text(metrics.summary(), net.stats()), COLOR_TEXT))
+            draw_info_bar(screen, text_cache, lines)
+        if metrics is not None:
+            metrics.lap("render")
+
+        if "screen" in dirty:
+            pygame.display.flip()
+        else:
+            pygame.display.update([regions[name] for name in dirty])
+        dirty.clear()
+        if metrics is not None:
+            metrics.lap("flip")
+            metrics.end_frame()
+        frame_surfaces = SURFACES.take()
+        if timer is not None:
+            # Po pierwszej klatce drukujemy zestawienie etapów startu
+            timer.mark("pierwsza klatka")
+            print(timer.report())
+            timer = None
+
+    # Po zakończeniu gry zatrzymujemy muzykę, wątek sieciowy (zamyka socket) i kończymy Pygame
+    if profiler is not None:
+        profiler.stop()
+        print(profiler.report())
+    if dumper is not None:
+        dumper.dump()
+    if assets.audio:
+        pygame.mixer.music.stop()
+    assets.shutdown()
+    if match_log is not None:
+        session.abandon()
+        match_log.close()
     try:
-        connection_sock.close()
+        net.close()
     except:
         pass
     pygame.quit()
@@ -383,4 +381,10 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Statki sieciowe")
+    parser.add_argument("--log", default=None, help="dopisz mecz do dziennika meczów (matchlog)")
+    parser.add_argument("--metrics", default=None, help="okresowo zrzucaj metryki klatek i łącza do pliku")
+    parser.add_argument("--metrics-format", choices=("jsonl", "prom"), default="jsonl",
+                        help="format zrzutu metryk: JSONL albo tekst Prometheusa")
+    args = parser.parse_args()
+    main(args.log, args.metrics, args.metrics_format)
@@ -0,0 +1,388 @@
+"""
+matchlog.py
+
+Dziennik meczów: plik binarny, do którego gry są tylko dopisywane, oraz czytnik
+mapujący go w pamięć (mmap).
+
+Format (liczby little-endian):
+- nagłówek pliku _HEADER: magic b"BSML", wersja, rozmiar planszy,
+- kolejne gry, każda to:
+    * nagłówek gry _GAME: liczba strzałów, liczba statków floty A i floty B, zwycięzca
+      (0 – A, 1 – B, -1 – nieznany),
+    * statki floty A, potem floty B (_SHIP: pole początkowe row*size+col, długość,
+      orientacja 'H'/'V'); flota nieznana (np. przeciwnik sieciowy) ma 0 statków,
+    * strzały – rekordy stałej długości: jedno słowo uint32
+      (pole << 3) | (gracz << 2) | (zatopienie << 1) | trafienie,
+      gdzie gracz 0 to A (strzela w flotę B), a 1 to B.
+
+MatchLogWriter zapisuje całe gry przez bufor pliku i wywołuje fsync co `sync_every`
+gier (oraz przy zamknięciu), więc awaria może uciąć tylko ostatnie gry; ucięty koniec
+pliku pomija czytnik, a MatchLogWriter przy otwarciu go obcina.
+
+MatchLog iteruje gry bez kopiowania: strzały gry to memoryview na zmapowanym pliku
+(numpy.frombuffer(log.buffer, "<u4", count, offset) daje tablicę bez kopii). Widoki
+uint32 mają natywną kolejność bajtów, więc czytnik działa na maszynach little-endian
+(x86, ARM).
+
+Uruchomienie:
+    python -m simulate --games 100000 --log mecze.bin
+    python -m matchlog mecze.bin
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+
+from board import BOARD_SIZE
+
+_HEADER = struct.Struct("<4sHH")     # magic, wersja, rozmiar planszy
+_GAME = struct.Struct("<IHHb3x")     # liczba strzałów, statki A, statki B, zwycięzca, wypełnienie
+_SHIP = struct.Struct("<IHcx")       # pole początkowe, długość, orientacja, wypełnienie
+_SHOT = struct.Struct("<I")          # zakodowany strzał (shot_word)
+_MAGIC = b"BSML"
+_VERSION = 1
+
+SYNC_EVERY = 256         # fsync co tyle zapisanych gier
+WRITE_BUFFER = 1 << 20   # bufor zapisu pliku (bajty)
+
+
+def shot_word(player, cell, hit, sunk):
+    """
+    Koduje strzał gracza `player` (0/1) w pole `cell` (row*size+col) na słowo uint32.
+    """
+    return cell << 3 | player << 2 | (2 if sunk else 0) | (1 if hit else 0)
+
+
+def decode_shot(word, size=BOARD_SIZE):
+    """
+    Odwrotność shot_word(): (player, row, col, hit, sunk).
+    """
+    row, col = divmod(word >> 3, size)
+    return (word >> 2) & 1, row, col, bool(word & 1), bool(word & 2)
+
+
+def encode_game(ships_a, ships_b, shots, winner=-1, size=BOARD_SIZE):
+    """
+    Koduje jedną grę do formatu dziennika.
+
+    Parametry:
+    ----------
+    ships_a, ships_b : list[board.Ship]
+        Floty graczy (np. Board.ships); pusta lista – flota nieznana.
+    shots : list[int]
+        Strzały w kolejności oddania, zakodowane przez shot_word().
+    winner : int
+        0 – wygrał A, 1 – wygrał B, -1 – nieznany (gra przerwana).
+    size : int
+        Rozmiar planszy (taki jak w nagłówku pliku).
+
+    Zwraca:
+    --------
+    bytes
+    """
+    parts = [_GAME.pack(len(shots), len(ships_a), len(ships_b), winner)]
+    for ship in list(ships_a) + list(ships_b):
+        parts.append(_SHIP.pack(ship.row * size + ship.col, ship.length, ship.orient.encode()))
+    parts.append(struct.pack(f"<{len(shots)}I", *shots))
+    return b"".join(parts)
+
+
+def _game_end(buffer, offset):
+    """
+    Koniec gry, której nagłówek leży pod `offset` (położenie następnej gry).
+    """
+    shots, ships_a, ships_b, _ = _GAME.unpack_from(buffer, offset)
+    return offset + _GAME.size + (ships_a + ships_b) * _SHIP.size + shots * _SHOT.size
+
+
+def _scan(buffer):
+    """
+    Przechodzi po nagłówkach gier od początku bufora; zwraca (liczba gier, liczba
+    strzałów, koniec ostatniej pełnej gry). Gra ucięta na końcu pliku nie jest liczona.
+    """
+    size = len(buffer)
+    offset = _HEADER.size
+    games = shots = 0
+    while offset + _GAME.size <= size:
+        end = _game_end(buffer, offset)
+        if end > size:
+            break
+        shots += _GAME.unpack_from(buffer, offset)[0]
+        offset = end
+        games += 1
+    return games, shots, offset
+
+
+class MatchLogWriter:
+    """
+    Dopisywanie gier do dziennika z buforowaniem i fsync co `sync_every` gier.
+
+    Parametry:
+    ----------
+    path : str
+        Plik dziennika; nowy dostaje nagłówek, istniejący jest sprawdzany i obcinany
+        do ostatniej pełnej gry.
+    size : int
+        Rozmiar planszy; musi zgadzać się z nagłówkiem istniejącego pliku.
+    sync_every : int
+        Co ile gier wymuszać zapis na dysk (os.fsync); 0 – tylko przy close().
+
+    Atrybuty:
+    ----------
+    games : int
+        Liczba gier w pliku (także tych sprzed otwarcia).
+    syncs : int
+        Liczba wywołań os.fsync().
+
+    Wyjątki:
+    ----------
+    ValueError
+        Plik nie jest dziennikiem meczów albo ma inny rozmiar planszy.
+    """
+
+    def __init__(self, path, size=BOARD_SIZE, sync_every=SYNC_EVERY):
+        self.path = path
+        self.size = size
+        self.sync_every = sync_every
+        self.syncs = 0
+        self._unsynced = 0
+        mode = "r+b" if os.path.exists(path) and os.path.getsize(path) > 0 else "w+b"
+        self._file = open(path, mode, buffering=WRITE_BUFFER)
+        if mode == "w+b":
+            self._file.write(_HEADER.pack(_MAGIC, _VERSION, size))
+            self.games = 0
+        else:
+            # Nagłówki gier czytamy przez mmap – plik nie trafia w całości do pamięci
+            with mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                magic, version, log_size = _HEADER.unpack_from(mm, 0)
+                if magic != _MAGIC or version != _VERSION or log_size != size:
+                    self._file.close()
+                    raise ValueError(f"Nieobsługiwany dziennik meczów: {path}")
+                self.games, _, end = _scan(mm)
+            self._file.seek(end)
+            self._file.truncate()
+
+    def write_game(self, ships_a, ships_b, shots, winner=-1):
+        """
+        Dopisuje grę (parametry jak w encode_game()).
+        """
+        self.write_encoded(encode_game(ships_a, ships_b, shots, winner, self.size), 1)
+
+    def write_encoded(self, data, games):
+        """
+        Dopisuje `games` gier zakodowanych już przez encode_game() (np. w procesie roboczym).
+        """
+        self._file.write(data)
+        self.games += games
+        self._unsynced += games
+        if self.sync_every and self._unsynced >= self.sync_every:
+            self.sync()
+
+    def sync(self):
+        """
+        Opróżnia bufor i wymusza zapis na dysk.
+        """
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.syncs += 1
+        self._unsynced = 0
+
+    def close(self):
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class LoggedGame:
+    """
+    Widok jednej gry w zmapowanym dzienniku (nic nie jest kopiowane przy tworzeniu).
+    Widok jest ważny do następnego kroku iteracji MatchLog – strzały potrzebne dłużej
+    trzeba skopiować (np. list(game.shots)).
+
+    Atrybuty:
+    ----------
+    offset : int
+        Położenie nagłówka gry w pliku.
+    winner : int
+        0 – A, 1 – B, -1 – nieznany.
+    shots : memoryview
+        Strzały jako słowa uint32 (format shot_word()) – widok na plik, bez kopii.
+    shots_offset : int
+        Położenie pierwszego strzału w pliku (dla numpy.frombuffer).
+    """
+
+    __slots__ = ("offset", "winner", "shots", "shots_offset", "size", "_buffer", "_ships")
+
+    def __init__(self, buffer, offset, size):
+        count, ships_a, ships_b, winner = _GAME.unpack_from(buffer, offset)
+        self._buffer = buffer
+        self._ships = (ships_a, ships_b)
+        self.offset = offset
+        self.size = size
+        self.winner = winner
+        self.shots_offset = offset + _GAME.size + (ships_a + ships_b) * _SHIP.size
+        self.shots = buffer[self.shots_offset:self.shots_offset + count * _SHOT.size].cast("I")
+
+    def fleets(self):
+        """
+        Floty obu graczy: dwie listy krotek (row, col, length, orient).
+        """
+        fleets = ([], [])
+        offset = self.offset + _GAME.size
+        for player, count in enumerate(self._ships):
+            for _ in range(count):
+                cell, length, orient = _SHIP.unpack_from(self._buffer, offset)
+                fleets[player].append((*divmod(cell, self.size), length, orient.decode()))
+                offset += _SHIP.size
+        return fleets
+
+    def moves(self):
+        """
+        Strzały po kolei jako krotki (player, row, col, hit, sunk).
+        """
+        size = self.size
+        for word in self.shots:
+            yield decode_shot(word, size)
+
+    def __len__(self):
+        return len(self.shots)
+
+    def release(self):
+        """
+        Zwalnia widok strzałów (mmap nie da się zamknąć, dopóki istnieją widoki).
+        """
+        self.shots.release()
+
+
+class MatchLog:
+    """
+    Dziennik meczów zmapowany w pamięć, tylko do odczytu.
+
+    Iteracja zwraca LoggedGame po kolei; gra ucięta na końcu pliku (np. po awarii
+    w trakcie zapisu) jest pomijana.
+
+    Parametry:
+    ----------
+    path : str
+        Plik zapisany przez MatchLogWriter.
+
+    Atrybuty:
+    ----------
+    size : int
+        Rozmiar planszy z nagłówka.
+    buffer : memoryview
+        Cały plik (np. dla numpy.frombuffer).
+
+    Wyjątki:
+    ----------
+    ValueError
+        Plik nie jest dziennikiem meczów albo maszyna nie jest little-endian.
+    """
+
+    def __init__(self, path):
+        if sys.byteorder != "little":
+            raise ValueError("MatchLog wymaga maszyny little-endian")
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, size = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC or version != _VERSION:
+            self.close()
+            raise ValueError(f"Nieobsługiwany dziennik meczów: {path}")
+        self.size = size
+        self.buffer = memoryview(self._mm)
+
+    def __iter__(self):
+        buffer = self.buffer
+        end = len(buffer)
+        offset = _HEADER.size
+        size = self.size
+        while offset + _GAME.size <= end:
+            next_offset = _game_end(buffer, offset)
+            if next_offset > end:
+                return
+            game = LoggedGame(buffer, offset, size)
+            try:
+                yield game
+            finally:
+                game.release()
+            offset = next_offset
+
+    def headers(self):
+        """
+        Nagłówki kolejnych pełnych gier bez tworzenia widoków: krotki (ships_offset,
+        shots_offset, shots, ships_a, ships_b, winner) – położenia rekordów statków
+        i strzałów w pliku, liczba strzałów, rozmiary flot i zwycięzca. Wszystkie
+        rekordy mają długość wielokrotną 4 bajtów, więc cały obszar gier można czytać
+        jako tablicę słów uint32 (analytics.py).
+        """
+        buffer = self.buffer
+        end = len(buffer)
+        offset = _HEADER.size
+        while offset + _GAME.size <= end:
+            shots, ships_a, ships_b, winner = _GAME.unpack_from(buffer, offset)
+            ships_offset = offset + _GAME.size
+            shots_offset = ships_offset + (ships_a + ships_b) * _SHIP.size
+            offset = shots_offset + shots * _SHOT.size
+            if offset > end:
+                return
+            yield ships_offset, shots_offset, shots, ships_a, ships_b, winner
+
+    def count(self):
+        """
+        Liczba pełnych gier i strzałów w pliku (czyta tylko nagłówki gier).
+        """
+        games, shots, _ = _scan(self.buffer)
+        return games, shots
+
+    def close(self):
+        if hasattr(self, "buffer"):
+            self.buffer.release()
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Podsumowanie dziennika meczów")
+    parser.add_argument("path", help="plik dziennika (MatchLogWriter)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    games = shots = hits = 0
+    wins = [0, 0]
+    with MatchLog(args.path) as log:
+        for game in log:
+            games += 1
+            shots += len(game)
+            hits += sum(word & 1 for word in game.shots)
+            if game.winner >= 0:
+                wins[game.winner] += 1
+        size = log.size
+    elapsed = time.perf_counter() - start
+
+    print(f"Plansza:            {size}×{size}")
+    print(f"Gry:                {games:,}")
+    print(f"Strzały:            {shots:,} ({shots / max(games, 1):.2f} na grę)")
+    print(f"Trafienia:          {hits / max(shots, 1):.2%}")
+    print(f"Wygrane A / B:      {wins[0]:,} / {wins[1]:,}")
+    print(f"Czas odczytu:       {elapsed:.2f} s ({shots / max(elapsed, 1e-9):,.0f} strzałów/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+metrics.py
+
+Diagnostyka wydajności bez Pygame:
+- FrameMetrics – czas klatki pętli main.main podzielony na fazy (sieć, logika,
+  rysowanie, wyświetlenie) w oknie ostatnich klatek; liczniki wiadomości i bajtów
+  pochodzą z network.Connection.stats(), a nakładkę (F4) rysuje gui.metrics_text(),
+- SamplingProfiler – profiler próbkujący: wątek co `interval` sekund odczytuje stos
+  wątku głównego (sys._current_frames()) i zlicza funkcje, w których trwa wykonanie,
+- MetricsDumper – okresowy zrzut metryk do pliku: JSONL (linia na zrzut) albo tekst
+  w formacie Prometheusa (plik podmieniany atomowo, np. dla node_exportera).
+
+Wyłączone metryki nic nie kosztują: main.py trzyma `metrics = None` i przed każdą
+fazą sprawdza tylko, czy obiekt istnieje; profiler nie ma wątku, dopóki go nie
+włączymy (F5 w grze).
+"""
+
+import collections
+import json
+import os
+import sys
+import threading
+import time
+
+PHASES = ("network", "logic", "render", "flip")
+METRICS_WINDOW = 120        # liczba klatek w średnich nakładki
+SAMPLE_INTERVAL = 0.005     # odstęp próbek profilera (s)
+DUMP_INTERVAL = 10.0        # odstęp zrzutów MetricsDumper (s)
+METRICS_PREFIX = "statki"   # przedrostek nazw metryk Prometheusa
+
+
+class FrameMetrics:
+    """
+    Czasy faz kolejnych klatek pętli głównej.
+
+    Obieg pętli zaczyna begin() (po śnie na sockecie, więc sen się nie liczy), każdą
+    fazę zamyka lap(nazwa) (czas od poprzedniego znacznika), a end_frame() zapisuje
+    klatkę w oknie ostatnich `window` klatek. Czasy faz sumują się aż do end_frame(),
+    więc obiegi bez rysowania doliczają się do następnej narysowanej klatki.
+
+    Atrybuty:
+    ----------
+    frames : int
+        Liczba zakończonych klatek.
+    totals : dict[str, float]
+        Łączny czas każdej fazy (s) od utworzenia.
+    """
+
+    def __init__(self, window=METRICS_WINDOW):
+        self.frames = 0
+        self.totals = dict.fromkeys(PHASES, 0.0)
+        self.recent = collections.deque(maxlen=window)   # krotki czasów faz (s)
+        self._current = dict.fromkeys(PHASES, 0.0)
+        self._mark = time.perf_counter()
+
+    def begin(self):
+        self._mark = time.perf_counter()
+
+    def lap(self, phase):
+        """
+        Dolicza czas od poprzedniego znacznika do fazy `phase`.
+        """
+        now = time.perf_counter()
+        self._current[phase] += now - self._mark
+        self._mark = now
+
+    def end_frame(self):
+        current = self._current
+        self.recent.append(tuple(current[phase] for phase in PHASES))
+        for phase in PHASES:
+            self.totals[phase] += current[phase]
+            current[phase] = 0.0
+        self.frames += 1
+
+    def summary(self):
+        """
+        Średni czas każdej fazy i najdłuższa klatka w oknie (ms).
+
+        Zwraca:
+        --------
+        dict
+            {"network": ms, "logic": ms, "render": ms, "flip": ms, "max": ms, "frames": int}
+        """
+        recent = self.recent
+        result = dict.fromkeys(PHASES, 0.0)
+        result["max"] = 0.0
+        result["frames"] = self.frames
+        if recent:
+            for i, phase in enumerate(PHASES):
+                result[phase] = sum(frame[i] for frame in recent) / len(recent) * 1000
+            result["max"] = max(sum(frame) for frame in recent) * 1000
+        return result
+
+    def snapshot(self, link=None):
+        """
+        Płaski słownik metryk do MetricsDumper: średnie faz (gauge, ms), liczba
+        klatek i – z `link` (Connection.stats()) – liczniki łącza (counter, *_total).
+        """
+        summary = self.summary()
+        values = {f"frame_{phase}_ms": summary[phase] for phase in PHASES}
+        values["frame_max_ms"] = summary["max"]
+        values["frames_total"] = self.frames
+        if link is not None:
+            for key in ("messages_in", "messages_out", "bytes_in", "bytes_out", "send_calls"):
+                values[f"{key}_total"] = link[key]
+        return values
+
+
+class SamplingProfiler:
+    """
+    Profiler próbkujący wątek, który go uruchomił (zwykle główny).
+
+    Nie spowalnia pętli gry jak cProfile (nie śledzi każdego wywołania): osobny wątek
+    co `interval` sekund zapisuje wiersz wykonywany na szczycie stosu (czas własny)
+    i wszystkie funkcje na stosie (czas łączny). Funkcje z rozszerzeń C (rysowanie
+    Pygame, select) nie mają ramek Pythona, więc ich czas trafia na wiersz, który je
+    wywołał – dlatego czas własny liczymy według wierszy, a nie całych funkcji.
+
+    Atrybuty:
+    ----------
+    samples : int
+        Liczba zebranych próbek.
+    own : collections.Counter
+        Próbki według (funkcja, wiersz) na szczycie stosu.
+    total : collections.Counter
+        Próbki według funkcji ("plik:wiersz funkcja") obecnej gdziekolwiek na stosie.
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.samples = 0
+        self.own = collections.Counter()
+        self.total = collections.Counter()
+        self._target = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._target = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is None:
+                continue
+            self.samples += 1
+            self.own[(_where(frame), frame.f_lineno)] += 1
+            seen = set()
+            while frame is not None:
+                name = _where(frame)
+                if name not in seen:
+                    seen.add(name)
+                    self.total[name] += 1
+                frame = frame.f_back
+
+    def report(self, top=15):
+        """
+        Zestawienie `top` wierszy o największym czasie własnym (odsetek próbek)
+        razem z czasem łącznym ich funkcji.
+        """
+        if not self.samples:
+            return "Profiler: brak próbek"
+        lines = [f"Profiler: {self.samples} próbek co {self.interval * 1000:.0f} ms"
+                 f"  (własny / łączny)"]
+        for (name, line), count in self.own.most_common(top):
+            lines.append(f"  {count / self.samples:6.1%}  {self.total[name] / self.samples:6.1%}"
+                         f"  {name}, wiersz {line}")
+        return "\n".join(lines)
+
+
+def _where(frame):
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_firstlineno} {code.co_name}"
+
+
+def prometheus_text(values, prefix=METRICS_PREFIX):
+    """
+    Metryki `values` w formacie tekstowym Prometheusa; nazwy kończące się na
+    "_total" są typu counter, pozostałe – gauge.
+    """
+    lines = []
+    for name, value in sorted(values.items()):
+        full = f"{prefix}_{name}"
+        lines.append(f"# TYPE {full} {'counter' if name.endswith('_total') else 'gauge'}")
+        lines.append(f"{full} {value}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsDumper:
+    """
+    Okresowy zrzut metryk do pliku.
+
+    Parametry:
+    ----------
+    path : str
+        Plik docelowy.
+    collect : callable
+        Zwraca płaski słownik metryk (np. FrameMetrics.snapshot).
+    fmt : str
+        "jsonl" – dopisuje linię {"time": ..., metryki...}; "prom" – podmienia plik
+        tekstem w formacie Prometheusa (zapis do pliku tymczasowego i os.replace).
+    interval : float
+        Odstęp zrzutów (s) – patrz maybe_dump().
+    """
+
+    def __init__(self, path, collect, fmt="jsonl", interval=DUMP_INTERVAL):
+        if fmt not in ("jsonl", "prom"):
+            raise ValueError(f"Nieznany format metryk: {fmt}")
+        self.path = path
+        self.collect = collect
+        self.fmt = fmt
+        self.interval = interval
+        self.dumps = 0
+        self._next = time.monotonic() + interval
+
+    def maybe_dump(self):
+        """
+        Zrzuca metryki, jeśli minął `interval` od poprzedniego zrzutu; wywoływane
+        w każdym obiegu pętli (koszt: jedno porównanie czasu).
+        """
+        now = time.monotonic()
+        if now >= self._next:
+            self._next = now + self.interval
+            self.dump()
+
+    def dump(self):
+        values = self.collect()
+        if self.fmt == "jsonl":
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"time": time.time(), **values}) + "\n")
+        else:
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(prometheus_text(values))
+            os.replace(tmp, self.path)
+        self.dumps += 1
@@ -7,13 +7,105 @@ Zawiera funkcje:
 - init_network(): menu wyboru host/klient i nawiązywanie połączenia TCP,
 - send_json(): wysyła słownik Python jako JSON zakończony '\n',
 - try_receive_from_buffer(): odczytuje z nieblokującego socketu pełne linie JSON rozdzielone '\n'.
+- wait_for_match(): czeka na przydział numeru gracza od serwera meczów (server.py),
+- negotiate(): uzgadnia z drugą stroną kodowanie wiadomości (binarne lub JSON),
+- tune_socket(): ustawia opcje socketu TCP pod kątem opóźnień (TCP_NODELAY, keepalive).
+
+Klasa FrameReader to wydajniejszy odpowiednik try_receive_from_buffer(): bufor bajtów
+wielokrotnego użytku, recv_into() bez pośrednich kopii i limit rozmiaru ramki.
+BinaryFrameReader czyta zwarte ramki binarne, a Connection łączy socket z wybranym
+kodowaniem. Multiplexer prowadzi na jednym Connection wiele gier naraz (kanały) –
+z kanału 0 korzysta main.py. NetworkThread przenosi całą obsługę socketu Connection
+do osobnego wątku, a wątkowi głównemu oddaje gotowe wiadomości przez kolejkę.
+
+Connection mierzy opóźnienia: zapamiętuje czas wysłania każdego "attack", paruje go
+z nadchodzącym "result" i prowadzi kroczące percentyle RTT (LatencyStats). Przy
+włączonym heartbeacie co HEARTBEAT_INTERVAL wysyła {"type":"ping"} (druga strona
+odpowiada "pong" na poziomie Connection) i zgłasza PeerTimeoutError, gdy przez
+PEER_TIMEOUT nic nie nadeszło. Wszystko to zwraca Connection.stats().
+
+Kodowanie binarne (PROTOCOL_VERSION 2):
+- "attack", "result" i "ready" to ramki 4-bajtowe: typ, wiersz, kolumna, flagi
+  (bit 0 – hit, bit 1 – sunk, bit 2 – gameover),
+- pozostałe wiadomości (np. "ready" z flotą) to ramka typu 0: 2 bajty długości
+  (little-endian) i treść JSON.
+
+Kanały (PROTOCOL_VERSION 3):
+- w JSON numer kanału to pole "ch" wiadomości (brak pola – kanał 0),
+- w kodowaniu binarnym ramka FRAME_CHANNEL (typ, numer kanału: 2 bajty little-endian,
+  bajt wypełnienia) poprzedza wiadomość należącą do kanału innego niż 0.
+Kanał 0 wygląda na łączu dokładnie tak jak w wersji 2, więc zwykła gra działa ze
+starszymi klientami. Heartbeat ({"type":"ping"/"pong","seq":n}, binarnie ramki
+FRAME_PING/FRAME_PONG z 2-bajtowym numerem) włączamy tylko, gdy druga strona
+zgłosiła wersję 3.
 """
 
+import collections
+import selectors
 import socket
+import struct
 import sys
 import json
+import threading
+import time
 
 PORT = 5000  # Domyślny port do komunikacji gry
+MAX_FRAME = 64 * 1024  # Domyślny maksymalny rozmiar jednej wiadomości (bajty)
+RECV_CHUNK = 4096      # Minimalna wolna przestrzeń bufora przed recv_into()
+PROTOCOL_VERSION = 3   # 1 – tylko JSON, 2 – JSON lub ramki binarne, 3 – kanały
+HELLO_TIMEOUT = 2.0    # Czas oczekiwania na "hello" drugiej strony (s)
+HIGH_WATER = 256 * 1024  # Próg bajtów w kolejce wyjściowej, powyżej którego send() odmawia
+MAX_CHANNEL = 0xFFFF   # Największy numer kanału (2 bajty w ramce FRAME_CHANNEL)
+QUANTUM = 8            # Domyślna liczba wiadomości kanału na jedną kolejkę obsługi
+HEARTBEAT_INTERVAL = 1.0  # Odstęp między wiadomościami "ping" (s)
+PEER_TIMEOUT = 5.0        # Cisza (s), po której uznajemy drugą stronę za martwą
+RTT_WINDOW = 256          # Liczba ostatnich pomiarów RTT branych do percentyli
+MAX_INFLIGHT = 4096       # Najwięcej zapamiętanych ataków bez odpowiedzi
+IO_TICK = 0.1             # Najdłuższy sen wątku sieciowego między sprawdzeniami heartbeatu (s)
+
+# Ramki binarne
+FRAME_JSON = 0
+FRAME_READY = 1
+FRAME_ATTACK = 2
+FRAME_RESULT = 3
+FRAME_CHANNEL = 4
+FRAME_PING = 5
+FRAME_PONG = 6
+FLAG_HIT = 1
+FLAG_SUNK = 2
+FLAG_GAMEOVER = 4
+_FRAME = struct.Struct("BBBB")        # typ, wiersz, kolumna, flagi
+_JSON_HEADER = struct.Struct("<BH")   # typ (FRAME_JSON), długość treści
+_CHANNEL = struct.Struct("<BHx")      # typ (FRAME_CHANNEL), numer kanału, wypełnienie
+_HEARTBEAT = struct.Struct("<BHx")    # typ (FRAME_PING/FRAME_PONG), numer kolejny, wypełnienie
+_READY_FRAME = _FRAME.pack(FRAME_READY, 0, 0, 0)
+_HEARTBEAT_FRAMES = {"ping": FRAME_PING, "pong": FRAME_PONG}
+
+_ATTACK_KEYS = frozenset(("type", "row", "col"))
+_RESULT_KEYS = frozenset(("type", "row", "col", "hit", "sunk", "gameover"))
+_HEARTBEAT_KEYS = frozenset(("type", "seq"))
+
+_decoder = json.JSONDecoder()
+
+
+class FrameTooLargeError(ConnectionError):
+    """
+    Druga strona przysłała wiadomość dłuższą niż dopuszczalny rozmiar ramki.
+    """
+
+
+class PeerTimeoutError(ConnectionError):
+    """
+    Od PEER_TIMEOUT sekund nie nadeszła żadna wiadomość (nawet "pong") – druga strona
+    albo łącze przestały odpowiadać.
+    """
+
+
+class BackpressureError(Exception):
+    """
+    Kolejka wyjściowa połączenia przekroczyła próg high_water – druga strona nie
+    nadąża z odbiorem i nadawca powinien wstrzymać produkcję wiadomości.
+    """
 
 
 def send_json(sock, obj):
@@ -37,6 +129,42 @@ def send_json(sock, obj):
     sock.sendall(data.encode())
 
 
+def encode_json(obj):
+    """
+    Koduje słownik jako linię JSON zakończoną '\n' (format send_json()).
+    """
+    return (json.dumps(obj) + "\n").encode()
+
+
+def encode_binary(obj):
+    """
+    Koduje słownik jako ramkę binarną; wiadomości spoza stałych ramek trafiają
+    do ramki FRAME_JSON – także "attack"/"result" z wierszem lub kolumną spoza
+    0..255 (duże plansze) i heartbeat z "seq" spoza 0..65535. Pole "ch" (kanał
+    różny od 0) zamienia się w poprzedzającą ramkę FRAME_CHANNEL.
+    """
+    if obj.get("ch"):
+        obj = dict(obj)
+        return _CHANNEL.pack(FRAME_CHANNEL, obj.pop("ch")) + encode_binary(obj)
+    kind = obj.get("type")
+    try:
+        if kind == "attack" and obj.keys() == _ATTACK_KEYS:
+            return _FRAME.pack(FRAME_ATTACK, obj["row"], obj["col"], 0)
+        if kind == "result" and obj.keys() == _RESULT_KEYS:
+            flags = ((FLAG_HIT if obj["hit"] else 0) | (FLAG_SUNK if obj["sunk"] else 0)
+                     | (FLAG_GAMEOVER if obj["gameover"] else 0))
+            return _FRAME.pack(FRAME_RESULT, obj["row"], obj["col"], flags)
+        if kind == "ready" and len(obj) == 1:
+            return _READY_FRAME
+        if kind in _HEARTBEAT_FRAMES and obj.keys() == _HEARTBEAT_KEYS:
+            return _HEARTBEAT.pack(_HEARTBEAT_FRAMES[kind], obj["seq"])
+    except struct.error:
+        # Wartość nie mieści się w polu stałej ramki – wysyłamy całość jako FRAME_JSON
+        pass
+    payload = json.dumps(obj).encode()
+    return _JSON_HEADER.pack(FRAME_JSON, len(payload)) + payload
+
+
 def try_receive_from_buffer(sock, buffer):
     """
     Nieblokujący odczyt pełnych wiadomości JSON-owych zakończonych '\n' z socketu.
@@ -82,29 +210,1029 @@ def try_receive_from_buffer(sock, buffer):
     return messages, buffer
 
 
+def wait_for_match(sock):
+    """
+    Blokująco czeka na komunikat {"type":"match","player":n} od serwera meczów.
+
+    Zwraca:
+    --------
+    int
+        Numer gracza przydzielony przez serwer (1 strzela pierwszy).
+    """
+    buffer = b""
+    while b"\n" not in buffer:
+        data = sock.recv(4096)
+        if not data:
+            raise ConnectionError("Serwer zamknął połączenie")
+        buffer += data
+    line, rest = buffer.split(b"\n", 1)
+    msg = json.loads(line)
+    if msg.get("type") != "match" or rest:
+        raise ConnectionError(f"Nieoczekiwana odpowiedź serwera: {msg}")
+    return msg["player"]
+
+
+class FrameReader:
+    """
+    Czytnik wiadomości JSON rozdzielonych '\n' z nieblokującego socketu.
+
+    W przeciwieństwie do try_receive_from_buffer():
+    - dane trafiają przez recv_into() do stałego bufora bytearray (bez dekodowania do str
+      i doklejania napisów), więc znak UTF-8 rozcięty między dwa recv() nie psuje odczytu,
+    - separatorów szukamy od miejsca, w którym skończyło się poprzednie wyszukiwanie,
+      bez ponownego kopiowania reszty bufora,
+    - jedno wywołanie receive() opróżnia socket i zwraca wszystkie pełne wiadomości,
+    - wiadomość dłuższa niż `max_frame` kończy się wyjątkiem FrameTooLargeError.
+
+    Parametry:
+    ----------
+    max_frame : int
+        Maksymalny rozmiar jednej wiadomości w bajtach (bez '\n').
+
+    Atrybuty:
+    ----------
+    bytes_in : int
+        Liczba bajtów odczytanych z socketu albo przekazanych do feed().
+    """
+
+    def __init__(self, max_frame=MAX_FRAME):
+        self.max_frame = max_frame
+        self.bytes_in = 0
+        self._buf = bytearray(max_frame + 1 + RECV_CHUNK)
+        self._view = memoryview(self._buf)
+        self._start = 0   # początek nieprzetworzonych danych
+        self._end = 0     # koniec danych w buforze
+        self._scan = 0    # do tego miejsca wiadomo, że nie ma '\n'
+
+    def pending(self):
+        """
+        Liczba bajtów niepełnej wiadomości czekających w buforze.
+        """
+        return self._end - self._start
+
+    def receive(self, sock):
+        """
+        Odczytuje wszystko, co jest dostępne w sockecie, i zwraca listę pełnych wiadomości.
+
+        Zgłasza ConnectionError, jeśli połączenie zostało zerwane, oraz
+        FrameTooLargeError, jeśli wiadomość przekracza max_frame.
+        """
+        messages = []
+        while True:
+            if len(self._buf) - self._end < RECV_CHUNK:
+                self._compact()
+            try:
+                n = sock.recv_into(self._view[self._end:])
+            except BlockingIOError:
+                break
+            if n == 0:
+                raise ConnectionError("Połączenie zerwane")
+            self._end += n
+            self.bytes_in += n
+            self._extract(messages)
+        return messages
+
+    def feed(self, data):
+        """
+        Dokłada bajty `data` (np. odebrane inną drogą) i zwraca pełne wiadomości.
+        """
+        messages = []
+        view = memoryview(data)
+        self.bytes_in += view.nbytes
+        while view:
+            if len(self._buf) - self._end < RECV_CHUNK:
+                self._compact()
+            n = min(len(view), len(self._buf) - self._end)
+            self._view[self._end:self._end + n] = view[:n]
+            self._end += n
+            view = view[n:]
+            self._extract(messages)
+        return messages
+
+    def _extract(self, messages):
+        """
+        Wyodrębnia z bufora wszystkie pełne linie i dekoduje je do `messages`.
+
+        Wszystkie pełne linie z bufora dekodujemy jednym decode() i dzielimy jednym
+        split() – koszt jest liniowy względem liczby odebranych bajtów.
+        """
+        last = self._buf.rfind(b"\n", self._scan, self._end)
+        if last < 0:
+            self._scan = self._end
+            if self._end - self._start > self.max_frame:
+                raise FrameTooLargeError(f"Wiadomość przekracza {self.max_frame} bajtów")
+            return
+        lines = self._buf[self._start:last].decode().split("\n")
+        # Znak UTF-8 to 1–4 bajty: dokładną długość w bajtach liczymy tylko dla
+        # podejrzanie długich linii
+        if max(map(len, lines)) * 4 > self.max_frame:
+            for line in lines:
+                if len(line) * 4 > self.max_frame and len(line.encode()) > self.max_frame:
+                    raise FrameTooLargeError(f"Wiadomość przekracza {self.max_frame} bajtów")
+        decode = _decoder.decode
+        for line in lines:
+            if line and not line.isspace():
+                messages.append(decode(line))
+
+        self._start = self._scan = last + 1
+        if self._start == self._end:
+            # Wszystko przetworzone – bufor wraca na początek bez kopiowania
+            self._start = self._end = self._scan = 0
+        elif self._end - self._start > self.max_frame:
+            raise FrameTooLargeError(f"Wiadomość przekracza {self.max_frame} bajtów")
+
+    def _compact(self):
+        """
+        Przesuwa niepełną wiadomość na początek bufora, robiąc miejsce na recv_into().
+        """
+        length = self._end - self._start
+        self._buf[:length] = self._buf[self._start:self._end]
+        self._scan -= self._start
+        self._start = 0
+        self._end = length
+
+
+class BinaryFrameReader(FrameReader):
+    """
+    Czytnik ramek binarnych (patrz encode_binary) o tym samym interfejsie co FrameReader.
+
+    Ramka FRAME_CHANNEL dopisuje pole "ch" do następnej wiadomości; numer kanału
+    pamiętamy w czytniku, bo wiadomość może dotrzeć w kolejnym recv().
+    """
+
+    def __init__(self, max_frame=MAX_FRAME):
+        super().__init__(max_frame)
+        self._channel = 0   # kanał następnej wiadomości (z ramki FRAME_CHANNEL)
+
+    def _extract(self, messages):
+        buf = self._buf
+        pos = self._start
+        end = self._end
+        unpack = _FRAME.unpack_from
+        while end - pos >= 4:
+            kind, row, col, flags = unpack(buf, pos)
+            size = 4
+            if kind == FRAME_ATTACK:
+                msg = {"type": "attack", "row": row, "col": col}
+            elif kind == FRAME_RESULT:
+                msg = {
+                    "type": "result",
+                    "row": row,
+                    "col": col,
+                    "hit": bool(flags & FLAG_HIT),
+                    "sunk": bool(flags & FLAG_SUNK),
+                    "gameover": bool(flags & FLAG_GAMEOVER)
+                }
+            elif kind == FRAME_READY:
+                msg = {"type": "ready"}
+            elif kind == FRAME_PING or kind == FRAME_PONG:
+                msg = {"type": "ping" if kind == FRAME_PING else "pong",
+                       "seq": _HEARTBEAT.unpack_from(buf, pos)[1]}
+            elif kind == FRAME_CHANNEL:
+                self._channel = _CHANNEL.unpack_from(buf, pos)[1]
+                pos += 4
+                continue
+            elif kind == FRAME_JSON:
+                _, length = _JSON_HEADER.unpack_from(buf, pos)
+                if length > self.max_frame:
+                    raise FrameTooLargeError(f"Wiadomość przekracza {self.max_frame} bajtów")
+                if end - pos < _JSON_HEADER.size + length:
+                    break
+                start = pos + _JSON_HEADER.size
+                msg = _decoder.decode(buf[start:start + length].decode())
+                size = _JSON_HEADER.size + length
+            else:
+                raise ConnectionError(f"Nieznany typ ramki: {kind}")
+            if self._channel:
+                msg["ch"] = self._channel
+                self._channel = 0
+            messages.append(msg)
+            pos += size
+        if pos == end:
+            self._start = self._end = self._scan = 0
+        else:
+            self._start = self._scan = pos
+
+
+class LatencyStats:
+    """
+    Kroczące statystyki opóźnień: ostatnie `window` pomiarów (w sekundach).
+
+    Parametry:
+    ----------
+    window : int
+        Liczba ostatnich pomiarów branych do percentyli.
+    """
+
+    def __init__(self, window=RTT_WINDOW):
+        self.samples = collections.deque(maxlen=window)
+        self.count = 0   # liczba wszystkich pomiarów (także spoza okna)
+
+    def add(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+
+    def percentile(self, p):
+        """
+        Percentyl `p` (0–100) z pomiarów w oknie; None, jeśli pomiarów brak.
+        """
+        if not self.samples:
+            return None
+        return _pick(sorted(self.samples), p)
+
+    def summary(self):
+        """
+        Zwraca słownik {"count", "last", "p50", "p95", "p99", "max"} (czasy w sekundach,
+        None przy braku pomiarów).
+        """
+        if not self.samples:
+            return {"count": self.count, "last": None, "p50": None, "p95": None, "p99": None, "max": None}
+        ordered = sorted(self.samples)
+        return {
+            "count": self.count,
+            "last": self.samples[-1],
+            "p50": _pick(ordered, 50),
+            "p95": _pick(ordered, 95),
+            "p99": _pick(ordered, 99),
+            "max": ordered[-1],
+        }
+
+
+def _pick(ordered, p):
+    """
+    Percentyl `p` z posortowanej, niepustej listy (metoda najbliższej pozycji).
+    """
+    return ordered[min(len(ordered) - 1, len(ordered) * p // 100)]
+
+
+def tune_socket(sock):
+    """
+    Ustawia opcje socketu TCP pod kątem małych opóźnień:
+    - TCP_NODELAY – krótkie wiadomości (ataki, wyniki) wychodzą od razu, bez czekania
+      algorytmu Nagle'a na kolejne bajty,
+    - SO_KEEPALIVE (oraz TCP_KEEPIDLE/TCP_KEEPINTVL/TCP_KEEPCNT, jeśli system je zna) –
+      jądro samo wykryje zerwane łącze, także gdy aplikacja milczy.
+
+    Sockety inne niż TCP (np. para gniazd gry z komputerem) zostają bez zmian.
+    """
+    if sock.family not in (socket.AF_INET, socket.AF_INET6) or sock.type != socket.SOCK_STREAM:
+        return
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    for name, value in (("TCP_KEEPIDLE", 10), ("TCP_KEEPINTVL", 5), ("TCP_KEEPCNT", 3)):
+        if hasattr(socket, name):
+            sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, name), value)
+
+
+class Connection:
+    """
+    Połączenie z przeciwnikiem: socket razem z uzgodnionym kodowaniem wiadomości.
+
+    Atrybuty:
+    ----------
+    sock : socket.socket
+        Nieblokujący socket TCP.
+    codec : str
+        "json" albo "binary".
+    high_water : int
+        Próg bajtów w kolejce wyjściowej (patrz send()).
+    send_calls : int
+        Liczba wywołań sock.send() – przy łączeniu wiadomości mniejsza niż liczba wiadomości.
+    messages_in, messages_out : int
+        Liczba odebranych / wysłanych wiadomości (łącznie z "ping" i "pong").
+    bytes_out : int
+        Liczba bajtów przyjętych przez sock.send(); odebrane liczy reader.bytes_in.
+    rtt : LatencyStats
+        Czas od wysłania "attack" do nadejścia pasującego "result".
+    ping_rtt : LatencyStats
+        Czas od wysłania "ping" do nadejścia "pong" (samo łącze, bez obsługi gry).
+    heartbeat_interval : float
+        Odstęp między wiadomościami "ping" (s); 0 wyłącza heartbeat.
+    peer_timeout : float
+        Cisza (s), po której heartbeat() zgłasza PeerTimeoutError.
+
+    Wysyłka odbywa się przez kolejkę wyjściową: send() dopisuje ramkę, a flush()
+    łączy wszystkie oczekujące ramki w jedno sock.send(). Czego socket nie przyjął
+    (BlockingIOError albo częściowy zapis), zostaje w kolejce na następne flush() –
+    w przeciwieństwie do sendall(), które na nieblokującym sockecie potrafi przerwać
+    wiadomość w połowie.
+
+    "ping" i "pong" obsługuje samo połączenie – receive() ich nie zwraca.
+    """
+
+    def __init__(self, sock, codec="json", pending=b"", high_water=HIGH_WATER,
+                 heartbeat_interval=0.0, peer_timeout=PEER_TIMEOUT):
+        self.sock = sock
+        self.codec = codec
+        self.high_water = high_water
+        self.send_calls = 0
+        self.messages_in = 0
+        self.messages_out = 0
+        self.bytes_out = 0
+        self.rtt = LatencyStats()
+        self.ping_rtt = LatencyStats()
+        self.heartbeat_interval = heartbeat_interval
+        self.peer_timeout = peer_timeout
+        self.last_seen = time.perf_counter()   # kiedy ostatnio coś nadeszło
+        self._inflight = {}   # (kanał, wiersz, kolumna) ataku → czas wysłania
+        self._pings = {}      # numer "ping" → czas wysłania
+        self._ping_seq = 0
+        self._last_ping = self.last_seen
+        self._out = collections.deque()   # ramki czekające na wysłanie
+        self._out_bytes = 0
+        if codec == "binary":
+            self.reader = BinaryFrameReader()
+            self._encode = encode_binary
+        else:
+            self.reader = FrameReader()
+            self._encode = encode_json
+        # Dane odebrane razem z "hello" należą już do właściwego strumienia
+        self._initial = self.reader.feed(pending) if pending else []
+
+    def send(self, obj, flush=True):
+        """
+        Dopisuje słownik (w uzgodnionym kodowaniu) do kolejki wyjściowej.
+
+        Parametry:
+        ----------
+        obj : dict
+            Wiadomość do wysłania.
+        flush : bool
+            True – od razu próbujemy wysłać kolejkę; False – wiadomość czeka na
+            flush(), dzięki czemu kilka wiadomości trafi do jednego sock.send().
+
+        Zgłasza BackpressureError, jeśli kolejka już przekracza high_water.
+        """
+        if self._out_bytes > self.high_water:
+            raise BackpressureError(f"Kolejka wyjściowa: {self._out_bytes} B > {self.high_water} B")
+        if obj.get("type") == "attack":
+            inflight = self._inflight
+            if len(inflight) >= MAX_INFLIGHT:
+                # Ataki bez odpowiedzi (np. z zamkniętych kanałów) – zapominamy najstarszy
+                del inflight[next(iter(inflight))]
+            inflight[(obj.get("ch", 0), obj["row"], obj["col"])] = time.perf_counter()
+        data = self._encode(obj)
+        self.messages_out += 1
+        self._out.append(data)
+        self._out_bytes += len(data)
+        if flush:
+            self.flush()
+
+    def flush(self):
+        """
+        Wysyła oczekujące ramki jednym sock.send() (bez blokowania).
+
+        Zwraca:
+        --------
+        bool
+            True, jeśli kolejka została opróżniona.
+        """
+        out = self._out
+        if not out:
+            return True
+        data = out[0] if len(out) == 1 else b"".join(out)
+        try:
+            sent = self.sock.send(data)
+        except BlockingIOError:
+            sent = 0
+        self.send_calls += 1
+        self.bytes_out += sent
+        if sent == len(data):
+            out.clear()
+            self._out_bytes = 0
+            return True
+        self._out_bytes -= sent
+        while sent >= len(out[0]):
+            sent -= len(out.popleft())
+        if sent:
+            out[0] = out[0][sent:]
+        return False
+
+    @property
+    def queue_depth(self):
+        """
+        Liczba wiadomości (także częściowo wysłanych) czekających w kolejce wyjściowej.
+        """
+        return len(self._out)
+
+    @property
+    def pending_bytes(self):
+        """
+        Liczba bajtów czekających w kolejce wyjściowej.
+        """
+        return self._out_bytes
+
+    def receive(self):
+        """
+        Zwraca listę wszystkich pełnych wiadomości dostępnych w sockecie.
+        """
+        messages = self.reader.receive(self.sock)
+        if self._initial:
+            messages = self._initial + messages
+            self._initial = []
+        if not messages:
+            return messages
+        self.messages_in += len(messages)
+        now = self.last_seen = time.perf_counter()
+        out = []
+        for msg in messages:
+            kind = msg.get("type")
+            if kind == "result":
+                sent = self._inflight.pop((msg.get("ch", 0), msg.get("row"), msg.get("col")), None)
+                if sent is not None:
+                    self.rtt.add(now - sent)
+            elif kind == "ping":
+                if self._out_bytes <= self.high_water:
+                    self.send({"type": "pong", "seq": msg["seq"]}, flush=False)
+                continue
+            elif kind == "pong":
+                sent = self._pings.pop(msg["seq"], None)
+                if sent is not None:
+                    self.ping_rtt.add(now - sent)
+                continue
+            out.append(msg)
+        return out
+
+    def heartbeat(self):
+        """
+        Wysyła "ping", jeśli od poprzedniego minęło heartbeat_interval, i sprawdza,
+        czy druga strona żyje. Wywoływane regularnie (NetworkThread – co najwyżej
+        co IO_TICK); przy heartbeat_interval=0 nic nie robi.
+
+        Zgłasza PeerTimeoutError, jeśli od peer_timeout sekund nic nie nadeszło.
+        """
+        if not self.heartbeat_interval:
+            return
+        now = time.perf_counter()
+        if now - self.last_seen > self.peer_timeout:
+            raise PeerTimeoutError(f"Brak odpowiedzi od {now - self.last_seen:.1f} s")
+        if now - self._last_ping >= self.heartbeat_interval and self._out_bytes <= self.high_water:
+            self._ping_seq = (self._ping_seq + 1) & 0xFFFF
+            if len(self._pings) >= MAX_INFLIGHT:
+                self._pings.clear()
+            self._pings[self._ping_seq] = now
+            self._last_ping = now
+            self.send({"type": "ping", "seq": self._ping_seq})
+
+    def stats(self):
+        """
+        Zwraca słownik ze stanem łącza do diagnostyki:
+        "rtt" i "ping" (LatencyStats.summary()), "idle" (s od ostatniej wiadomości),
+        "inflight" (ataki bez odpowiedzi), "queued_bytes", "send_calls" oraz liczniki
+        "messages_in", "messages_out", "bytes_in" i "bytes_out".
+        """
+        return {
+            "rtt": self.rtt.summary(),
+            "ping": self.ping_rtt.summary(),
+            "idle": time.perf_counter() - self.last_seen,
+            "inflight": len(self._inflight),
+            "queued_bytes": self._out_bytes,
+            "send_calls": self.send_calls,
+            "messages_in": self.messages_in,
+            "messages_out": self.messages_out,
+            "bytes_in": self.reader.bytes_in,
+            "bytes_out": self.bytes_out,
+        }
+
+    def fileno(self):
+        return self.sock.fileno()
+
+    def close(self):
+        self.sock.close()
+
+
+class SendScheduler:
+    """
+    Opróżnia kolejki wyjściowe wielu połączeń, gdy ich sockety są gotowe do zapisu.
+
+    Selektor jest trwały: połączenie rejestrujemy (EVENT_WRITE) tylko wtedy, gdy ma
+    zaległe dane, i wyrejestrowujemy po opróżnieniu kolejki.
+    """
+
+    def __init__(self):
+        self._selector = selectors.DefaultSelector()
+        self._waiting = set()
+
+    def flush(self, connections, timeout=0.0):
+        """
+        Próbuje opróżnić kolejki `connections`; te, których socket był pełny,
+        czekają na gotowość do zapisu najwyżej `timeout` sekund.
+
+        Zwraca:
+        --------
+        int
+            Liczba połączeń, które nadal mają zaległe dane.
+        """
+        for conn in connections:
+            if conn.queue_depth and not conn.flush() and conn not in self._waiting:
+                self._selector.register(conn.sock, selectors.EVENT_WRITE, conn)
+                self._waiting.add(conn)
+        if self._waiting:
+            for key, _ in self._selector.select(timeout):
+                conn = key.data
+                if conn.flush():
+                    self._selector.unregister(conn.sock)
+                    self._waiting.discard(conn)
+        return len(self._waiting)
+
+    def discard(self, conn):
+        """
+        Usuwa połączenie z selektora (np. przed jego zamknięciem).
+        """
+        if conn in self._waiting:
+            self._selector.unregister(conn.sock)
+            self._waiting.discard(conn)
+
+
+class NetworkThread:
+    """
+    Obsługa socketu połączenia w osobnym wątku.
+
+    Wątek śpi na selektorze (socket połączenia i para gniazd budzenia) i sam odbiera
+    wiadomości, wysyła kolejkę wyjściową, gdy socket jest gotowy do zapisu, oraz
+    prowadzi heartbeat. Odebrane wiadomości trafiają do kolejki `inbox`, a wątek
+    zapisuje bajt do gniazda powiadomień – fileno() zwraca jego deskryptor, więc
+    pętla gry czekająca w select([net], ...) budzi się od razu po nadejściu
+    wiadomości, a powolny albo zapchany przeciwnik nie zatrzymuje klatki.
+
+    Obiekt ma interfejs Connection używany przez Multiplexer (send, flush, receive,
+    pending_bytes, queue_depth, high_water, stats, fileno), więc można go podać
+    zamiast połączenia: Multiplexer(NetworkThread(connection)). send() dopisuje
+    wiadomość od razu do kolejki wyjściowej Connection, więc pending_bytes,
+    BackpressureError i próg high_water działają tak samo jak bez wątku. Z Connection
+    korzystają oba wątki pod jedną blokadą (wątek sieciowy trzyma ją tylko na czas
+    nieblokujących recv/send); odebrane wiadomości przechodzą przez collections.deque,
+    którego append() i popleft() są bezpieczne między wątkami.
+    Pętla Pygame może zamiast select() czekać w pygame.event.wait(): funkcja
+    `notify` (wołana w wątku sieciowym) wstawia wtedy własne zdarzenie przez
+    pygame.event.post(). Pętla nie może jednak wołać pygame.event.peek() bez
+    argumentów – w Pygame 2.6 każde takie wywołanie przy wstawionym zdarzeniu
+    w kolejce gubi referencję do jego słownika (odtworzenie: python -m benchmarks.eventpost).
+
+    Parametry:
+    ----------
+    connection : Connection
+        Połączenie z nieblokującym socketem; od tej chwili należy do wątku.
+    tick : float
+        Najdłuższy sen wątku (s) – co tyle najpóźniej wywołujemy heartbeat().
+    notify : callable lub None
+        Wołana w wątku sieciowym po odebraniu wiadomości (albo błędzie), po zapisie
+        do gniazda powiadomień, np. lambda: pygame.event.post(pygame.event.Event(NETWORK_EVENT)).
+
+    Atrybuty:
+    ----------
+    error : ConnectionError lub None
+        Błąd, który zakończył wątek (inny niż ConnectionError – opakowany w ConnectionError);
+        receive() zgłasza go po oddaniu odebranych wiadomości.
+    """
+
+    def __init__(self, connection, tick=IO_TICK, notify=None):
+        self.connection = connection
+        self.tick = tick
+        self.notify = notify
+        self.error = None
+        self.inbox = collections.deque()    # wiadomości odebrane przez wątek
+        self._lock = threading.Lock()
+        self._stop = False
+        self._wake_r, self._wake_w = socket.socketpair()        # wątek główny → sieciowy
+        self._notify_r, self._notify_w = socket.socketpair()    # wątek sieciowy → główny
+        for sock in (self._wake_r, self._wake_w, self._notify_r, self._notify_w):
+            sock.setblocking(False)
+        self._thread = threading.Thread(target=self._run, name="network-io", daemon=True)
+        self._thread.start()
+
+    @property
+    def high_water(self):
+        return self.connection.high_water
+
+    @property
+    def pending_bytes(self):
+        return self.connection.pending_bytes
+
+    @property
+    def queue_depth(self):
+        return self.connection.queue_depth
+
+    def send(self, obj, flush=True):
+        """
+        Dopisuje wiadomość do kolejki wyjściowej połączenia; flush=True budzi wątek
+        sieciowy, żeby ją wysłał.
+
+        Zgłasza BackpressureError, jeśli kolejka już przekracza high_water.
+        """
+        with self._lock:
+            self.connection.send(obj, flush=False)
+        if flush:
+            _signal(self._wake_w)
+
+    def flush(self):
+        """
+        Budzi wątek sieciowy, żeby wysłał kolejkę wyjściową połączenia.
+
+        Zwraca:
+        --------
+        bool
+            True, jeśli kolejka jest pusta – jak Connection.flush(), więc Multiplexer
+            przestaje dokładać wiadomości, gdy socket nie nadąża.
+        """
+        if self.connection.queue_depth:
+            _signal(self._wake_w)
+            return False
+        return True
+
+    def receive(self):
+        """
+        Zwraca wszystkie wiadomości odebrane przez wątek od poprzedniego wywołania.
+
+        Zgłasza ConnectionError, który zakończył wątek, gdy nie ma już czego oddać.
+        """
+        # Najpierw kasujemy powiadomienia: wiadomość dopisana później przyjdzie z nowym
+        _drain(self._notify_r)
+        inbox = self.inbox
+        messages = [inbox.popleft() for _ in range(len(inbox))]
+        if not messages and self.error is not None:
+            raise self.error
+        return messages
+
+    def stats(self):
+        with self._lock:
+            return self.connection.stats()
+
+    def fileno(self):
+        """
+        Deskryptor gotowy do odczytu, gdy wątek ma wiadomości (albo błąd) do odebrania.
+        """
+        return self._notify_r.fileno()
+
+    def _run(self):
+        conn = self.connection
+        selector = selectors.DefaultSelector()
+        selector.register(self._wake_r, selectors.EVENT_READ)
+        selector.register(conn.sock, selectors.EVENT_READ)
+        writing = False
+        try:
+            while not self._stop:
+                for key, _ in selector.select(self.tick):
+                    if key.fileobj is self._wake_r:
+                        _drain(self._wake_r)
+                with self._lock:
+                    messages = conn.receive()
+                    conn.flush()
+                    conn.heartbeat()
+                    backlog = conn.queue_depth > 0
+                if backlog != writing:
+                    # Gotowości do zapisu pilnujemy tylko, gdy socket nie przyjął wszystkiego
+                    writing = backlog
+                    events = selectors.EVENT_READ | (selectors.EVENT_WRITE if writing else 0)
+                    selector.modify(conn.sock, events)
+                if messages:
+                    self.inbox.extend(messages)
+                    self._wake_main()
+        except Exception as e:
+            # Każdy błąd kończy wątek – także uszkodzona ramka (ValueError, struct.error)
+            # czy "ping" bez "seq" (KeyError); pętla gry musi się o nim dowiedzieć
+            if isinstance(e, ConnectionError):
+                self.error = e
+            else:
+                self.error = ConnectionError(f"Błąd wątku sieciowego: {e!r}")
+                self.error.__cause__ = e
+            self._wake_main()
+        finally:
+            selector.close()
+
+    def _wake_main(self):
+        """
+        Budzi pętlę gry (wołane w wątku sieciowym): bajt do gniazda powiadomień
+        i funkcja `notify`.
+        """
+        _signal(self._notify_w)
+        if self.notify is not None:
+            self.notify()
+
+    def close(self):
+        """
+        Zatrzymuje wątek (po ostatniej próbie wysłania kolejki) i zamyka połączenie.
+        """
+        self._stop = True
+        _signal(self._wake_w)
+        self._thread.join()
+        if self.error is None:
+            try:
+                self.connection.flush()
+            except OSError:
+                pass
+        for sock in (self._wake_r, self._wake_w, self._notify_r, self._notify_w):
+            sock.close()
+        self.connection.close()
+
+
+def _signal(sock):
+    """
+    Budzi drugą stronę pary gniazd jednym bajtem.
+    """
+    try:
+        sock.send(b"\0")
+    except OSError:
+        pass   # bufor pełny (druga strona i tak się obudzi) albo para już zamknięta
+
+
+def _drain(sock):
+    """
+    Odczytuje wszystkie bajty budzenia z pary gniazd.
+    """
+    try:
+        while sock.recv(4096):
+            pass
+    except OSError:
+        pass
+
+
+class Channel:
+    """
+    Jedna gra prowadzona w multipleksowanym połączeniu (patrz Multiplexer).
+
+    Kanał ma własne kolejki wiadomości; stan rozgrywki prowadzi osobna
+    session.GameSession (jedna sesja na kanał).
+
+    Atrybuty:
+    ----------
+    id : int
+        Numer kanału (0 – zwykła gra, zgodna z klientami bez kanałów).
+    inbox : collections.deque
+        Odebrane, jeszcze nieobsłużone wiadomości.
+    outbox : collections.deque
+        Wiadomości czekające na miejsce w kolejce wyjściowej połączenia.
+    """
+
+    __slots__ = ("id", "inbox", "outbox", "_mux")
+
+    def __init__(self, mux, channel_id):
+        self.id = channel_id
+        self.inbox = collections.deque()
+        self.outbox = collections.deque()
+        self._mux = mux
+
+    def send(self, obj, flush=True):
+        """
+        Dopisuje wiadomość do kolejki kanału; flush=True od razu próbuje ją wysłać
+        (Multiplexer.flush()).
+        """
+        if self.id:
+            obj = dict(obj, ch=self.id)
+        if not self.outbox:
+            self._mux._tx_ready.append(self)
+        self.outbox.append(obj)
+        if flush:
+            self._mux.flush()
+
+    def receive(self):
+        """
+        Zwraca (i usuwa ze skrzynki) wszystkie odebrane wiadomości kanału.
+        """
+        messages = list(self.inbox)
+        self.inbox.clear()
+        return messages
+
+    def __repr__(self):
+        return f"Channel({self.id}, inbox={len(self.inbox)}, outbox={len(self.outbox)})"
+
+
+class Multiplexer:
+    """
+    Wiele gier (kanałów) na jednym połączeniu Connection.
+
+    poll() odbiera wszystko z socketu i rozkłada wiadomości do skrzynek kanałów według
+    pola "ch"; kanał, o którym jeszcze nie słyszeliśmy, jest tworzony automatycznie.
+    Obsługa w obu kierunkach jest sprawiedliwa (round-robin): process() i flush()
+    biorą z każdego kanału najwyżej `quantum` wiadomości na kolejkę, więc kanał
+    z tysiącami zaległych wiadomości nie zagłodzi pozostałych. flush() nie przekracza
+    progu high_water połączenia – nadmiar czeka w kolejkach kanałów.
+
+    Parametry:
+    ----------
+    connection : Connection
+        Połączenie z nieblokującym socketem.
+    quantum : int
+        Liczba wiadomości jednego kanału obsługiwanych w jednej kolejce.
+    """
+
+    def __init__(self, connection, quantum=QUANTUM):
+        self.connection = connection
+        self.quantum = quantum
+        self.channels = {}
+        self._rx_ready = collections.deque()   # kanały z niepustym inbox
+        self._tx_ready = collections.deque()   # kanały z niepustym outbox
+
+    def channel(self, channel_id):
+        """
+        Zwraca kanał o numerze `channel_id`, tworząc go w razie potrzeby.
+        """
+        ch = self.channels.get(channel_id)
+        if ch is None:
+            if not 0 <= channel_id <= MAX_CHANNEL:
+                raise ValueError(f"Numer kanału poza zakresem 0..{MAX_CHANNEL}: {channel_id}")
+            ch = self.channels[channel_id] = Channel(self, channel_id)
+        return ch
+
+    def close_channel(self, channel_id):
+        """
+        Zapomina kanał (np. po zakończonej grze). Nieobsłużone odebrane wiadomości
+        przepadają, a te czekające w outbox zostaną jeszcze wysłane.
+        """
+        ch = self.channels.pop(channel_id, None)
+        if ch is not None:
+            ch.inbox.clear()
+
+    def poll(self):
+        """
+        Odbiera dostępne wiadomości i rozkłada je do skrzynek kanałów.
+
+        Zwraca:
+        --------
+        int
+            Liczba odebranych wiadomości.
+        """
+        messages = self.connection.receive()
+        channels = self.channels
+        ready = self._rx_ready
+        for msg in messages:
+            channel_id = msg.pop("ch", 0)
+            ch = channels.get(channel_id)
+            if ch is None:
+                ch = self.channel(channel_id)
+            if not ch.inbox:
+                ready.append(ch)
+            ch.inbox.append(msg)
+        return len(messages)
+
+    def process(self, handler, budget=None):
+        """
+        Obsługuje odebrane wiadomości kolejnych kanałów po kolei (round-robin),
+        wywołując handler(channel, msg).
+
+        Parametry:
+        ----------
+        handler : callable
+            Funkcja obsługi jednej wiadomości.
+        budget : int lub None
+            Najwyższa liczba wiadomości do obsłużenia w tym wywołaniu; resztę
+            (i miejsce w kolejce) zachowujemy na następne wywołanie.
+
+        Zwraca:
+        --------
+        int
+            Liczba obsłużonych wiadomości.
+        """
+        ready = self._rx_ready
+        done = 0
+        while ready and (budget is None or done < budget):
+            ch = ready.popleft()
+            inbox = ch.inbox
+            take = min(self.quantum, len(inbox))
+            if budget is not None:
+                take = min(take, budget - done)
+            # handler może zamknąć kanał (close_channel() czyści inbox)
+            while take and inbox:
+                handler(ch, inbox.popleft())
+                take -= 1
+                done += 1
+            if inbox:
+                ready.append(ch)
+        return done
+
+    def flush(self):
+        """
+        Przenosi wiadomości z kolejek kanałów (round-robin, po `quantum`) do kolejki
+        połączenia, dopóki nie osiągnie ona high_water, i wysyła je.
+
+        Zwraca:
+        --------
+        bool
+            True, jeśli wszystkie kolejki (kanałów i połączenia) są puste.
+        """
+        conn = self.connection
+        ready = self._tx_ready
+        while True:
+            while ready and conn.pending_bytes <= conn.high_water:
+                ch = ready.popleft()
+                out = ch.outbox
+                for _ in range(min(self.quantum, len(out))):
+                    conn.send(out.popleft(), flush=False)
+                    if conn.pending_bytes > conn.high_water:
+                        break
+                if out:
+                    ready.append(ch)
+            if not conn.flush() or not ready:
+                return not ready and not conn.queue_depth
+
+    @property
+    def backlog(self):
+        """
+        Liczba wiadomości czekających w kolejkach wyjściowych kanałów.
+        """
+        return sum(len(ch.outbox) for ch in self._tx_ready)
+
+
+def negotiate(sock, timeout=HELLO_TIMEOUT):
+    """
+    Uzgadnia kodowanie: obie strony wysyłają {"type":"hello",...} i czekają na
+    "hello" drugiej strony. Starsi klienci nie znają "hello" (ignorują je), więc
+    jeśli nie odpowiedzą w czasie `timeout`, zostajemy przy JSON.
+
+    Parametry:
+    ----------
+    sock : socket.socket
+        Połączony, blokujący socket.
+    timeout : float
+        Maksymalny czas oczekiwania na odpowiedź (s).
+
+    Zwraca:
+    --------
+    (codec, pending, version) : tuple[str, bytes, int]
+        Wybrane kodowanie ("binary" lub "json"), bajty odebrane po "hello",
+        które należy przekazać do czytnika tego kodowania, oraz wersja protokołu
+        drugiej strony (1, jeśli nie odpowiedziała na "hello").
+    """
+    sock.sendall(encode_json({"type": "hello", "version": PROTOCOL_VERSION, "codecs": ["binary", "json"]}))
+    buffer = b""
+    deadline = time.monotonic() + timeout
+    try:
+        while True:
+            newline = buffer.find(b"\n")
+            if newline >= 0:
+                try:
+                    msg = json.loads(buffer[:newline])
+                except ValueError:
+                    msg = None
+                if isinstance(msg, dict) and msg.get("type") == "hello":
+                    rest = buffer[newline + 1:]
+                    version = msg.get("version", 1)
+                    if version >= 2 and "binary" in msg.get("codecs", ()):
+                        return "binary", rest, version
+                    return "json", rest, version
+                # Stary klient zaczął już nadawać JSON – nie czekamy dłużej
+                return "json", buffer, 1
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return "json", buffer, 1
+            sock.settimeout(remaining)
+            data = sock.recv(4096)
+            if not data:
+                raise ConnectionError("Połączenie zerwane")
+            buffer += data
+    except socket.timeout:
+        return "json", buffer, 1
+    finally:
+        sock.settimeout(None)
+
+
 def init_network():
     """
     Urządza proste menu konsolowe, w którym użytkownik wybiera:
     - [h] – host: bind, listen, accept() → czekamy na klienta,
-    - [j] – join (klient): connect(host_ip, PORT).
+    - [j] – join (klient): connect(host_ip, PORT),
+    - [a] – gra z komputerem: przeciwnikiem jest ai.AIOpponent na parze gniazd
+            (gracz jest hostem i strzela pierwszy),
+    - [s] – serwer meczów (server.py): connect(server_ip, PORT) i oczekiwanie
+            na {"type":"match","player":n}, który wyznacza numer gracza.
 
-    Po nawiązaniu połączenia ustawia socket jako nieblokujący i zwraca:
-        (socket, my_player, is_host)
+    Po nawiązaniu połączenia z innym graczem (h/j) uzgadnia kodowanie (negotiate())
+    i – jeśli druga strona zna wersję 3 – włącza heartbeat. Socket TCP dostaje opcje
+    tune_socket(), zostaje ustawiony jako nieblokujący, a funkcja zwraca:
+        (connection, my_player, is_host)
 
     Zwraca:
     --------
-    sock : socket.socket
-        Połączony, nieblokujący socket TCP.
+    connection : Connection
+        Połączenie z nieblokującym socketem TCP i uzgodnionym kodowaniem.
     my_player : int
         Numer gracza w bieżącej instancji (1 = host, 2 = klient).
     is_host : bool
         True, jeśli to host; False, jeśli klient.
     """
     choice = ""
-    while choice not in ("h", "j"):
-        choice = input("Host [h] czy Join [j]? (h/j): ").strip().lower()
+    while choice not in ("h", "j", "a", "s"):
+        choice = input("Host [h], Join [j], gra z komputerem [a] czy serwer meczów [s]? (h/j/a/s): ").strip().lower()
 
-    if choice == "h":
+    if choice == "a":
+        from ai import start_ai_opponent  # import lokalny – ai importuje network
+        is_host = True
+        my_player = 1
+        sock = start_ai_opponent()
+        print("Gra z komputerem.")
+    elif choice == "s":
+        server_ip = input("Podaj adres IP serwera: ").strip()
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            sock.connect((server_ip, PORT))
+        except Exception as e:
+            print(f"Nie udało się połączyć: {e}")
+            sys.exit(1)
+        print("Połączono z serwerem, czekam na przeciwnika...")
+        my_player = wait_for_match(sock)
+        is_host = my_player == 1
+        print(f"Mecz rozpoczęty – jesteś graczem {my_player}.")
+    elif choice == "h":
         is_host = True
         my_player = 1
         server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -128,5 +1256,15 @@ def init_network():
         print("Połączono z hostem.")
         sock = client
 
+    tune_socket(sock)
+
+    # Komputer i serwer meczów mówią wyłącznie JSON i nie odpowiadają na "ping"
+    codec, pending, heartbeat = "json", b"", 0.0
+    if choice in ("h", "j"):
+        codec, pending, version = negotiate(sock)
+        if version >= 3:
+            heartbeat = HEARTBEAT_INTERVAL
+        print(f"Kodowanie wiadomości: {codec}")
+
     sock.setblocking(False)
-    return sock, my_player, is_host
+    return Connection(sock, codec, pending, heartbeat_interval=heartbeat), my_player, is_host
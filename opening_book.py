@@ -0,0 +1,392 @@
+"""
+opening_book.py
+
+Pamięć podręczna strzałów dla gracza komputerowego, zredukowana przez symetrie planszy.
+
+Stan obserwacji (wzór 'X'/'O' na planszy zgadywań oraz zbiór zatopionych statków)
+sprowadzamy do postaci kanonicznej względem 8 symetrii kwadratu (obroty i odbicia).
+Najlepszy strzał dla stanu kanonicznego trzymamy:
+- w ograniczonej pamięci LRU (ShotCache), współdzielonej przez wszystkie gry w procesie,
+- opcjonalnie w „książce otwarć” – posortowanym pliku rekordów stałej długości,
+  mapowanym w pamięć (mmap) przy starcie i przeszukiwanym binarnie (OpeningBook).
+
+CachedShooter opakowuje ProbabilityShooter: w pierwszych `depth` turach najpierw
+pyta książkę i LRU, a heatmapę liczy dopiero przy chybieniu pamięci.
+
+Uruchomienie:
+    python -m opening_book build --games 2000 --depth 10 --out opening_book.bin
+    python -m opening_book bench --games 1000 [--book opening_book.bin]
+"""
+
+import argparse
+import bisect
+import collections
+import mmap
+import random
+import struct
+import time
+
+from board import Board, BOARD_SIZE, SHIPS
+from strategies import STRATEGIES, ProbabilityShooter, Shooter
+
+CELLS = BOARD_SIZE * BOARD_SIZE
+
+
+def _transforms(size):
+    """
+    Permutacje pól dla 8 symetrii kwadratu: perm[t][cell] → pole po przekształceniu t.
+    """
+    last = size - 1
+    maps = (
+        lambda r, c: (r, c),
+        lambda r, c: (c, last - r),
+        lambda r, c: (last - r, last - c),
+        lambda r, c: (last - c, r),
+        lambda r, c: (r, last - c),
+        lambda r, c: (last - r, c),
+        lambda r, c: (c, r),
+        lambda r, c: (last - c, last - r),
+    )
+    perms = []
+    for f in maps:
+        perm = []
+        for cell in range(size * size):
+            r, c = f(*divmod(cell, size))
+            perm.append(r * size + c)
+        perms.append(tuple(perm))
+    return tuple(perms)
+
+
+_PERMS = _transforms(BOARD_SIZE)
+_INVERSE = tuple(tuple(sorted(range(CELLS), key=perm.__getitem__)) for perm in _PERMS)
+# _BITS[t][i] = 1 << _PERMS[t][i] – bez przesunięć w pętli kanonizacji
+_BITS = tuple(tuple(1 << j for j in perm) for perm in _PERMS)
+
+
+def _map_mask(mask, bits):
+    """
+    Przekształca maskę pól tablicą `bits` (iteracja tylko po ustawionych bitach).
+    """
+    out = 0
+    while mask:
+        low = mask & -mask
+        out |= bits[low.bit_length() - 1]
+        mask ^= low
+    return out
+
+
+def canonical_key(hits, misses, sunk):
+    """
+    Sprowadza stan obserwacji do postaci kanonicznej.
+
+    Parametry:
+    ----------
+    hits, misses : int
+        Maski bitowe pól 'X' i 'O' (bit nr row*BOARD_SIZE + col).
+    sunk : tuple[int, ...]
+        Posortowane długości zatopionych statków.
+
+    Zwraca:
+    --------
+    (key, transform) : tuple
+        key – (hits, misses, sunk) po przekształceniu dającym najmniejszą parę masek,
+        transform – numer tego przekształcenia (do odwzorowania strzału).
+    """
+    best = None
+    best_t = 0
+    for t, bits in enumerate(_BITS):
+        candidate = (_map_mask(hits, bits), _map_mask(misses, bits))
+        if best is None or candidate < best:
+            best = candidate
+            best_t = t
+    return (best[0], best[1], sunk), best_t
+
+
+class ShotCache:
+    """
+    Ograniczona pamięć LRU: klucz kanoniczny → kanoniczne pole strzału.
+    """
+
+    def __init__(self, maxsize=100_000):
+        self.maxsize = maxsize
+        self._data = collections.OrderedDict()
+
+    def get(self, key):
+        shot = self._data.get(key)
+        if shot is not None:
+            self._data.move_to_end(key)
+        return shot
+
+    def put(self, key, shot):
+        self._data[key] = shot
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        self._data.clear()
+
+    def items(self):
+        return self._data.items()
+
+
+# Format pliku książki: nagłówek + posortowane rekordy (klucz, pole strzału)
+_MASK_BYTES = (CELLS + 7) // 8
+_SUNK_BYTES = 8
+_KEY_SIZE = 2 * _MASK_BYTES + _SUNK_BYTES
+_HEADER = struct.Struct("<4sHHI")   # magic, wersja, rozmiar rekordu, liczba rekordów
+_MAGIC = b"BSOB"
+_VERSION = 1
+_RECORD_SIZE = _KEY_SIZE + 1
+
+
+def encode_key(key):
+    """
+    Koduje klucz kanoniczny na bajty o stałej długości (porządek bajtów = porządek kluczy).
+    """
+    hits, misses, sunk = key
+    return (hits.to_bytes(_MASK_BYTES, "big") + misses.to_bytes(_MASK_BYTES, "big")
+            + bytes(sunk).ljust(_SUNK_BYTES, b"\0"))
+
+
+class OpeningBook:
+    """
+    Książka otwarć zmapowana w pamięć. Rekordy są posortowane po zakodowanym kluczu,
+    więc wyszukiwanie to bisekcja bez wczytywania pliku do pamięci.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size, count = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC or version != _VERSION or record_size != _RECORD_SIZE:
+            self.close()
+            raise ValueError(f"Nieobsługiwany plik książki otwarć: {path}")
+        self._count = count
+        self._keys = _RecordKeys(self._mm, count)
+
+    @staticmethod
+    def save(path, entries):
+        """
+        Zapisuje słownik/iterowalną parę (klucz kanoniczny, pole) jako plik książki.
+        """
+        records = sorted((encode_key(key), shot) for key, shot in entries)
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, _RECORD_SIZE, len(records)))
+            for key_bytes, shot in records:
+                f.write(key_bytes + bytes((shot,)))
+        return len(records)
+
+    def lookup(self, key):
+        """
+        Zwraca kanoniczne pole strzału dla klucza albo None.
+        """
+        key_bytes = encode_key(key)
+        i = bisect.bisect_left(self._keys, key_bytes)
+        if i < self._count and self._keys[i] == key_bytes:
+            return self._mm[_HEADER.size + i * _RECORD_SIZE + _KEY_SIZE]
+        return None
+
+    def __len__(self):
+        return self._count
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+
+class _RecordKeys:
+    """
+    Sekwencja kluczy rekordów w mmap – pozwala użyć bisect bez kopiowania pliku.
+    """
+
+    def __init__(self, mm, count):
+        self._mm = mm
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        start = _HEADER.size + i * _RECORD_SIZE
+        return self._mm[start:start + _KEY_SIZE]
+
+
+class CacheStats:
+    """
+    Liczniki trafień pamięci i czasy tur (w sekundach) z podziałem na źródło strzału.
+    """
+
+    def __init__(self):
+        self.book_hits = 0
+        self.lru_hits = 0
+        self.misses = 0
+        self.uncached = 0          # tury poza głębokością pamięci
+        self.hit_time = 0.0
+        self.miss_time = 0.0
+
+    def report(self):
+        """
+        Zwraca tekstowe podsumowanie: odsetek trafień i średnie opóźnienie tury.
+        """
+        lookups = self.book_hits + self.lru_hits + self.misses
+        hits = self.book_hits + self.lru_hits
+        rate = hits / lookups if lookups else 0.0
+        hit_us = self.hit_time / hits * 1e6 if hits else 0.0
+        miss_us = self.miss_time / self.misses * 1e6 if self.misses else 0.0
+        return (f"zapytania: {lookups:,}  trafienia: {rate:.1%} "
+                f"(książka {self.book_hits:,}, LRU {self.lru_hits:,})  "
+                f"tura z pamięci: {hit_us:.1f} µs  tura liczona: {miss_us:.1f} µs")
+
+
+CACHE = ShotCache()
+STATS = CacheStats()
+_book = None
+
+
+def use_opening_book(path):
+    """
+    Mapuje książkę otwarć z pliku `path` dla wszystkich CachedShooter w procesie
+    (None wyłącza książkę). Nadaje się jako initializer puli procesów.
+    """
+    global _book
+    if _book is not None:
+        _book.close()
+    _book = OpeningBook(path) if path else None
+
+
+class CachedShooter(Shooter):
+    """
+    ProbabilityShooter z pamięcią strzałów dla pierwszych `depth` tur.
+    """
+
+    def __init__(self, rng=None, ships=SHIPS, depth=10, cache=None, stats=None):
+        super().__init__(rng, ships)
+        self.inner = ProbabilityShooter(self.rng, ships)
+        self.depth = depth
+        self.cache = CACHE if cache is None else cache
+        self.stats = STATS if stats is None else stats
+        self._hits = 0
+        self._misses = 0
+        self._turn = 0
+
+    def next_shot(self):
+        if self._turn >= self.depth:
+            self.stats.uncached += 1
+            return self.inner.next_shot()
+
+        start = time.perf_counter()
+        key, t = canonical_key(self._hits, self._misses, tuple(sorted(self.inner.sunk_lengths)))
+        shot = _book.lookup(key) if _book is not None else None
+        if shot is not None:
+            self.stats.book_hits += 1
+        else:
+            shot = self.cache.get(key)
+            if shot is not None:
+                self.stats.lru_hits += 1
+        if shot is not None:
+            cell = _INVERSE[t][shot]
+            self.stats.hit_time += time.perf_counter() - start
+            return divmod(cell, BOARD_SIZE)
+
+        row, col = self.inner.next_shot()
+        self.cache.put(key, _PERMS[t][row * BOARD_SIZE + col])
+        self.stats.misses += 1
+        self.stats.miss_time += time.perf_counter() - start
+        return row, col
+
+    def observe(self, row, col, hit, sunk):
+        super().observe(row, col, hit, sunk)
+        self.inner.observe(row, col, hit, sunk)
+        if hit:
+            self._hits |= 1 << (row * BOARD_SIZE + col)
+        else:
+            self._misses |= 1 << (row * BOARD_SIZE + col)
+        self._turn += 1
+
+
+STRATEGIES["cached"] = CachedShooter
+
+
+def _play(shooter, board):
+    """
+    Strzela `shooter` w `board` aż do zatopienia floty; zwraca liczbę strzałów.
+    """
+    shots = 0
+    while True:
+        row, col = shooter.next_shot()
+        hit, sunk = board.receive_attack(row, col)
+        shooter.observe(row, col, bool(hit), sunk)
+        shots += 1
+        if hit and board.all_sunk():
+            return shots
+
+
+def _copy(board):
+    """
+    Świeża kopia planszy z tym samym rozstawieniem floty.
+    """
+    copy = Board()
+    for ship in board.ships:
+        copy.place_ship(ship.row, ship.col, ship.length, ship.orient)
+    return copy
+
+
+def build_book(games, depth, seed=1):
+    """
+    Rozgrywa `games` gier CachedShooter z pustą pamięcią i zwraca zebrane
+    stany kanoniczne z pierwszych `depth` tur jako ShotCache.
+    """
+    cache = ShotCache(maxsize=10 ** 9)
+    rng = random.Random(seed)
+    for _ in range(games):
+        _play(CachedShooter(rng, depth=depth, cache=cache, stats=CacheStats()), Board.random_fleet(rng=rng))
+    return cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Książka otwarć gracza komputerowego")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="zbuduj książkę otwarć")
+    build.add_argument("--games", type=int, default=2000)
+    build.add_argument("--depth", type=int, default=10)
+    build.add_argument("--seed", type=int, default=1)
+    build.add_argument("--out", default="opening_book.bin")
+    bench = sub.add_parser("bench", help="zmierz trafienia pamięci i opóźnienie tury")
+    bench.add_argument("--games", type=int, default=1000)
+    bench.add_argument("--depth", type=int, default=10)
+    bench.add_argument("--seed", type=int, default=2)
+    bench.add_argument("--book", default=None)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        start = time.perf_counter()
+        cache = build_book(args.games, args.depth, args.seed)
+        count = OpeningBook.save(args.out, cache.items())
+        print(f"Zapisano {count:,} stanów do {args.out} w {time.perf_counter() - start:.1f} s")
+        return
+
+    use_opening_book(args.book)
+    rng = random.Random(args.seed)
+    boards = [Board.random_fleet(rng=rng) for _ in range(args.games)]
+
+    start = time.perf_counter()
+    for board in boards:
+        _play(ProbabilityShooter(rng), _copy(board))
+    plain = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for board in boards:
+        _play(CachedShooter(rng, depth=args.depth), _copy(board))
+    cached = time.perf_counter() - start
+
+    print(f"Bez pamięci:  {plain / args.games * 1e3:.2f} ms/grę")
+    print(f"Z pamięcią:   {cached / args.games * 1e3:.2f} ms/grę")
+    print(STATS.report())
+
+
+if __name__ == "__main__":
+    main()
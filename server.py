@@ -0,0 +1,331 @@
+"""
+server.py
+
+Serwer meczów „Statków” oparty na asyncio – wiele równoległych gier w jednym procesie.
+
+Klienci (main.py w trybie [s]) łączą się z serwerem, który łączy ich w pary i prowadzi
+mecz autorytatywnie na własnych planszach board.Board, używając tego samego protokołu
+JSON co gra host–klient:
+1. po sparowaniu serwer wysyła każdemu {"type":"match","player":1|2},
+2. klient wysyła {"type":"ready","ships":[[row,col,length,orient],...]} – serwer
+   sprawdza flotę i po gotowości obu stron przekazuje każdemu {"type":"ready"},
+3. gracz na turze wysyła {"type":"attack","row":r,"col":c}; serwer rozstrzyga strzał
+   na swojej planszy przeciwnika, odsyła strzelającemu {"type":"result",...}
+   i przekazuje atak przeciwnikowi (jego własna odpowiedź "result" jest ignorowana),
+4. po "gameover" lub rozłączeniu mecz się kończy, a połączenia są zamykane.
+
+Każdy mecz to lekkie zadanie asyncio, a nie proces.
+
+Z --metrics PLIK serwer co --metrics-interval sekund zrzuca liczbę meczów oraz
+liczniki wiadomości i bajtów (metrics.MetricsDumper): jako linie JSONL albo jako
+plik w formacie tekstowym Prometheusa (--metrics-format prom).
+
+Uruchomienie:
+    python -m server [--host 0.0.0.0] [--port 5000] [--metrics PLIK]
+"""
+
+import argparse
+import asyncio
+import json
+
+from board import Board, BOARD_SIZE, SHIPS
+from metrics import MetricsDumper, DUMP_INTERVAL
+from network import PORT
+
+MAX_LINE = 64 * 1024   # maksymalna długość jednej wiadomości JSON w bajtach
+
+
+class ProtocolError(Exception):
+    """
+    Niepoprawna wiadomość od klienta – mecz kończy się z komunikatem "error".
+    """
+
+
+class Player:
+    """
+    Połączenie jednego gracza w meczu; ruch (wiadomości i bajty) dolicza do
+    liczników serwera `server`.
+    """
+
+    __slots__ = ("reader", "writer", "server", "number", "board")
+
+    def __init__(self, reader, writer, server):
+        self.reader = reader
+        self.writer = writer
+        self.server = server
+        self.number = 0
+        self.board = None
+
+    async def send(self, obj):
+        """
+        Wysyła słownik jako linię JSON; drain() zapewnia kontrolę przepływu.
+        """
+        data = (json.dumps(obj) + "\n").encode()
+        self.server.messages_out += 1
+        self.server.bytes_out += len(data)
+        self.writer.write(data)
+        await self.writer.drain()
+
+    async def receive(self):
+        """
+        Odczytuje jedną wiadomość JSON; None oznacza zamknięcie połączenia.
+        """
+        try:
+            line = await self.reader.readline()
+        except ValueError:
+            # readline() zgłasza ValueError, gdy linia przekracza limit bufora
+            raise ProtocolError("za długa wiadomość") from None
+        if not line:
+            return None
+        self.server.messages_in += 1
+        self.server.bytes_in += len(line)
+        try:
+            return json.loads(line)
+        except ValueError:
+            raise ProtocolError("niepoprawny JSON") from None
+
+    def close(self):
+        if not self.writer.is_closing():
+            self.writer.close()
+
+
+def build_board(ships):
+    """
+    Buduje planszę z listy [[row, col, length, orient], ...] przesłanej w "ready".
+
+    Zgłasza ProtocolError, jeśli flota nie odpowiada SHIPS albo statki się nie mieszczą.
+    """
+    if not isinstance(ships, list):
+        raise ProtocolError("brak floty w komunikacie ready")
+    try:
+        fleet = []
+        for ship in ships:
+            if not isinstance(ship, list) or len(ship) != 4:
+                raise ProtocolError("niepoprawny opis statku")
+            row, col, length, orient = ship
+            fleet.append((int(row), int(col), int(length), orient))
+    except (TypeError, ValueError):
+        raise ProtocolError("niepoprawny opis statku") from None
+    if sorted(length for _, _, length, _ in fleet) != sorted(length for _, length in SHIPS):
+        raise ProtocolError("flota nie odpowiada liście SHIPS")
+    board = Board()
+    for row, col, length, orient in fleet:
+        if orient not in ("H", "V") or not board.can_place(row, col, length, orient):
+            raise ProtocolError("nieprawidłowe ustawienie statku")
+        board.place_ship(row, col, length, orient)
+    return board
+
+
+class Match:
+    """
+    Jeden mecz dwóch graczy prowadzony przez serwer.
+    """
+
+    def __init__(self, server, first, second):
+        self.server = server
+        self.players = (first, second)
+        first.number = 1
+        second.number = 2
+
+    async def run(self):
+        self.server.active += 1
+        try:
+            await self._play()
+        except ProtocolError as e:
+            await self._broadcast({"type": "error", "reason": str(e)})
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            await self._broadcast({"type": "opponent_left"})
+        finally:
+            for player in self.players:
+                player.close()
+            self.server.active -= 1
+            self.server.finished += 1
+
+    async def _broadcast(self, obj):
+        for player in self.players:
+            try:
+                await player.send(obj)
+            except (ConnectionError, RuntimeError):
+                pass
+
+    async def _play(self):
+        for player in self.players:
+            await player.send({"type": "match", "player": player.number})
+
+        # Faza ustawiania: czekamy na "ready" z flotą od obu graczy (w dowolnej kolejności)
+        async def wait_ready(player):
+            while True:
+                msg = await player.receive()
+                if msg is None:
+                    raise ConnectionError("rozłączenie")
+                if msg.get("type") == "ready":
+                    player.board = build_board(msg.get("ships"))
+                    return
+
+        # Błąd jednego gracza kończy mecz – czekanie na drugiego anulujemy
+        waiting = [asyncio.ensure_future(wait_ready(player)) for player in self.players]
+        try:
+            done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                task.result()
+        finally:
+            for task in waiting:
+                task.cancel()
+        for player in self.players:
+            await player.send({"type": "ready"})
+
+        # Faza gry: wiadomości obu graczy trafiają do jednej kolejki meczu; błąd odczytu
+        # (niepoprawny JSON, za długa linia, zerwane połączenie) też trafia do kolejki,
+        # żeby mecz zakończył się zwykłą ścieżką zamiast czekać na inbox w nieskończoność
+        inbox = asyncio.Queue()
+
+        async def pump(player):
+            while True:
+                try:
+                    msg = await player.receive()
+                except (ProtocolError, ConnectionError) as e:
+                    await inbox.put((player, e))
+                    return
+                await inbox.put((player, msg))
+                if msg is None:
+                    return
+
+        pumps = [asyncio.ensure_future(pump(player)) for player in self.players]
+        try:
+            turn = 0   # gracz 1 (host) strzela pierwszy
+            while True:
+                player, msg = await inbox.get()
+                if msg is None:
+                    raise ConnectionError("rozłączenie")
+                if isinstance(msg, Exception):
+                    raise msg
+                if msg.get("type") != "attack":
+                    continue   # m.in. lokalne "result" obrońcy – serwer ma własny wynik
+                if player is not self.players[turn]:
+                    await player.send({"type": "error", "reason": "nie twoja tura"})
+                    continue
+                if await self._attack(player, self.players[1 - turn], msg):
+                    return
+                turn = 1 - turn
+        finally:
+            for task in pumps:
+                task.cancel()
+
+    async def _attack(self, attacker, defender, msg):
+        """
+        Rozstrzyga atak na planszy serwera. Zwraca True, jeśli to był koniec gry.
+        """
+        try:
+            r, c = int(msg["row"]), int(msg["col"])
+        except (KeyError, TypeError, ValueError):
+            raise ProtocolError("niepoprawny atak") from None
+        if not (0 <= r < BOARD_SIZE and 0 <= c < BOARD_SIZE):
+            raise ProtocolError("atak poza planszą")
+        res, sunk = defender.board.receive_attack(r, c)
+        lost = bool(res) and defender.board.all_sunk()
+        await defender.send({"type": "attack", "row": r, "col": c})
+        await attacker.send({
+            "type": "result",
+            "row": r,
+            "col": c,
+            "hit": False if res is None else res,
+            "sunk": True if sunk else False,
+            "gameover": lost
+        })
+        return lost
+
+
+class MatchServer:
+    """
+    Serwer przyjmujący połączenia i łączący graczy w pary.
+
+    Atrybuty:
+    ----------
+    active : int
+        Liczba trwających meczów.
+    finished : int
+        Liczba zakończonych meczów.
+    messages_in, messages_out : int
+        Liczba wiadomości odebranych od graczy / wysłanych do graczy.
+    bytes_in, bytes_out : int
+        Liczba bajtów tych wiadomości.
+    """
+
+    def __init__(self):
+        self.active = 0
+        self.finished = 0
+        self.messages_in = 0
+        self.messages_out = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self._waiting = None
+        self._tasks = set()
+
+    async def handle_client(self, reader, writer):
+        player = Player(reader, writer, self)
+        waiting = self._waiting
+        if waiting is None or waiting.reader.at_eof() or waiting.writer.is_closing():
+            self._waiting = player
+            return
+        self._waiting = None
+        task = asyncio.ensure_future(Match(self, waiting, player).run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def snapshot(self):
+        """
+        Płaski słownik metryk serwera do MetricsDumper.
+        """
+        return {
+            "matches_active": self.active,
+            "matches_finished_total": self.finished,
+            "messages_in_total": self.messages_in,
+            "messages_out_total": self.messages_out,
+            "bytes_in_total": self.bytes_in,
+            "bytes_out_total": self.bytes_out,
+        }
+
+    async def dump_metrics(self, dumper):
+        """
+        Zadanie zrzucające metryki co dumper.interval sekund.
+        """
+        while True:
+            await asyncio.sleep(dumper.interval)
+            dumper.dump()
+
+    async def serve(self, host="", port=PORT, dumper=None):
+        server = await asyncio.start_server(self.handle_client, host or None, port,
+                                            limit=MAX_LINE, backlog=1024)
+        print(f"Serwer meczów: nasłuchuję na porcie {port}...")
+        if dumper is not None:
+            task = asyncio.ensure_future(self.dump_metrics(dumper))
+            self._tasks.add(task)
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serwer meczów gry w statki")
+    parser.add_argument("--host", default="", help="adres nasłuchu (domyślnie wszystkie)")
+    parser.add_argument("--port", type=int, default=PORT, help="port TCP")
+    parser.add_argument("--metrics", default=None, help="okresowo zrzucaj metryki serwera do pliku")
+    parser.add_argument("--metrics-format", choices=("jsonl", "prom"), default="jsonl",
+                        help="format zrzutu metryk: JSONL albo tekst Prometheusa")
+    parser.add_argument("--metrics-interval", type=float, default=DUMP_INTERVAL,
+                        help="odstęp zrzutów metryk (s)")
+    args = parser.parse_args()
+    server = MatchServer()
+    dumper = None
+    if args.metrics:
+        dumper = MetricsDumper(args.metrics, server.snapshot, fmt=args.metrics_format,
+                               interval=args.metrics_interval)
+    try:
+        asyncio.run(server.serve(args.host, args.port, dumper))
+    except KeyboardInterrupt:
+        pass
+    if dumper is not None:
+        dumper.dump()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+session.py
+
+Rdzeń rozgrywki bez Pygame: GameSession – maszyna stanów gry jednego gracza
+(placement → waiting_opponent → game → over), która prowadzi własną planszę
+board.Board i planszę zgadywań oraz mówi protokołem z network.py.
+
+Sesja nie rysuje i nie odtwarza dźwięków. Widok (main.py) przekazuje jej akcje
+gracza (place(), rotate(), confirm(), fire()), a update() odbiera wiadomości
+przeciwnika i zwraca listę zdarzeń do pokazania:
+    {"type": "start"}                                       – obaj gracze gotowi,
+    {"type": "attacked", "row", "col", "hit", "sunk"}       – strzał przeciwnika,
+    {"type": "result", "row", "col", "hit", "sunk"}         – wynik naszego strzału,
+    {"type": "over", "won": bool}                           – koniec gry.
+
+Z parametrem `log` (matchlog.MatchLogWriter) sesja zapisuje zakończoną grę do
+dziennika meczów: gracz A to my (z naszą flotą), B – przeciwnik (flota nieznana).
+
+Moduł (wraz z board, network i matchlog) nie importuje pygame ani numpy, więc bezgłowe
+narzędzia mogą prowadzić gry bez kosztu inicjalizacji SDL – patrz
+benchmarks/startup.py.
+"""
+
+from board import Board, BOARD_SIZE, SHIPS
+from matchlog import shot_word
+
+# Fazy gry
+PLACEMENT = "placement"
+WAITING = "waiting_opponent"
+GAME = "game"
+OVER = "over"
+
+
+class GameSession:
+    """
+    Stan jednej gry po stronie gracza.
+
+    Parametry:
+    ----------
+    link : network.Channel lub network.Connection
+        Kanał do przeciwnika – dowolny obiekt z metodami send(obj) i receive().
+    my_player : int
+        Numer gracza (1 – host, 2 – klient).
+    is_host : bool
+        True – po rozpoczęciu gry strzelamy pierwsi.
+    ships : list[tuple[str, int]]
+        Flota do ustawienia (nazwa, długość).
+    size : int
+        Rozmiar planszy.
+    log : matchlog.MatchLogWriter lub None
+        Dziennik, do którego trafi gra po zakończeniu.
+
+    Atrybuty:
+    ----------
+    phase : str
+        PLACEMENT, WAITING, GAME albo OVER.
+    board : Board
+        Własna plansza.
+    guess : list[list[str]]
+        Plansza zgadywań: '~' – nieostrzelane, 'X' – trafienie, 'O' – pudło.
+    ship_index : int
+        Indeks następnego statku do ustawienia.
+    orientation : str
+        Orientacja ustawianego statku ('H' lub 'V').
+    my_turn : bool
+        Czy teraz strzelamy my.
+    ready_received : bool
+        Czy przeciwnik przysłał już {"type":"ready"}.
+    won : bool lub None
+        W fazie OVER: True – wygrana, False – przegrana.
+    """
+
+    def __init__(self, link, my_player, is_host, ships=SHIPS, size=BOARD_SIZE, log=None):
+        self.link = link
+        self.my_player = my_player
+        self.is_host = is_host
+        self.ships = ships
+        self.board = Board(size)
+        self.guess = [["~"] * size for _ in range(size)]
+        self.phase = PLACEMENT
+        self.ship_index = 0
+        self.orientation = "H"
+        self.my_turn = False
+        self.ready_received = False
+        self.won = None
+        self.log = log
+        self.shots = []   # strzały obu stron (matchlog.shot_word), gdy zapisujemy grę
+
+    @property
+    def current_ship(self):
+        """
+        Ustawiany statek (nazwa, długość) albo None, gdy cała flota stoi.
+        """
+        if self.phase != PLACEMENT or self.ship_index >= len(self.ships):
+            return None
+        return self.ships[self.ship_index]
+
+    def rotate(self):
+        """
+        Zmienia orientację ustawianego statku H ↔ V.
+        """
+        self.orientation = "V" if self.orientation == "H" else "H"
+
+    def can_place(self, row, col):
+        """
+        Czy bieżący statek w bieżącej orientacji można postawić w (row, col).
+        """
+        ship = self.current_ship
+        return ship is not None and self.board.can_place(row, col, ship[1], self.orientation)
+
+    def place(self, row, col):
+        """
+        Stawia bieżący statek w (row, col). Zwraca False, jeśli miejsce jest niepoprawne.
+        """
+        if not self.can_place(row, col):
+            return False
+        self.board.place_ship(row, col, self.current_ship[1], self.orientation)
+        self.ship_index += 1
+        return True
+
+    def confirm(self):
+        """
+        Kończy ustawianie: gdy cała flota stoi, wysyła {"type":"ready"} (z flotą – potrzebną
+        serwerowi meczów, zwykły przeciwnik ją pomija) i przechodzi do WAITING.
+
+        Zwraca:
+        --------
+        bool
+            True, jeśli faza się zmieniła.
+        """
+        if self.phase != PLACEMENT or self.ship_index < len(self.ships):
+            return False
+        ships = [[s.row, s.col, s.length, s.orient] for s in self.board.ships]
+        self.link.send({"type": "ready", "ships": ships})
+        self.phase = WAITING
+        return True
+
+    def fire(self, row, col):
+        """
+        Oddaje strzał w (row, col), jeśli jest nasza tura, a pole nie było ostrzelane.
+        Zwraca True, jeśli atak został wysłany.
+        """
+        if self.phase != GAME or not self.my_turn or self.guess[row][col] in ("X", "O"):
+            return False
+        self.link.send({"type": "attack", "row": row, "col": col})
+        self.my_turn = False
+        return True
+
+    def update(self):
+        """
+        Obsługuje wiadomości przeciwnika czekające w `link` i zwraca zdarzenia (patrz
+        opis modułu). W fazie PLACEMENT wiadomości czekają w kanale (np. "ready"
+        przeciwnika, który skończył ustawiać wcześniej). Wiadomości, które przyszły
+        w jednej paczce z "ready" (np. pierwszy atak hosta), są obsługiwane już
+        w fazie GAME, a nie gubione.
+        """
+        events = []
+        if self.phase not in (WAITING, GAME):
+            return events
+        for msg in self.link.receive():
+            kind = msg.get("type")
+            if self.phase == WAITING:
+                if kind == "ready":
+                    self.ready_received = True
+                    self.phase = GAME
+                    self.my_turn = self.is_host
+                    events.append({"type": "start"})
+            elif kind == "attack":
+                self._on_attack(msg, events)
+            elif kind == "result":
+                self._on_result(msg, events)
+            if self.phase == OVER:
+                break
+        return events
+
+    def _on_attack(self, msg, events):
+        """
+        Strzał przeciwnika: rozstrzygamy go na własnej planszy i odsyłamy wynik.
+        """
+        row, col = msg["row"], msg["col"]
+        res, sunk = self.board.receive_attack(row, col)
+        lost = bool(res) and self.board.all_sunk()
+        self.link.send({
+            "type": "result",
+            "row": row,
+            "col": col,
+            # jeśli res jest None (pole już ostrzelane), odpowiadamy pudłem
+            "hit": False if res is None else res,
+            "sunk": True if sunk else False,
+            "gameover": lost
+        })
+        if self.log is not None:
+            self.shots.append(shot_word(1, row * self.board.size + col, res, sunk))
+        events.append({"type": "attacked", "row": row, "col": col, "hit": res, "sunk": sunk})
+        if lost:
+            self._finish(False, events)
+        else:
+            self.my_turn = True
+
+    def _on_result(self, msg, events):
+        """
+        Odpowiedź na nasz atak: zaznaczamy trafienie ('X') lub pudło ('O').
+        """
+        row, col = msg["row"], msg["col"]
+        hit = msg.get("hit", False)
+        sunk = msg.get("sunk", False)
+        self.guess[row][col] = "X" if hit else "O"
+        if self.log is not None:
+            self.shots.append(shot_word(0, row * self.board.size + col, hit, sunk))
+        events.append({"type": "result", "row": row, "col": col, "hit": hit, "sunk": sunk})
+        if msg.get("gameover", False):
+            self._finish(True, events)
+        else:
+            self.my_turn = False
+
+    def abandon(self):
+        """
+        Zapisuje do dziennika grę przerwaną przed końcem (zwycięzca nieznany), jeśli
+        padł w niej choć jeden strzał.
+        """
+        if self.log is not None and self.phase != OVER and self.shots:
+            self.log.write_game(self.board.ships, [], self.shots, -1)
+
+    def _finish(self, won, events):
+        self.phase = OVER
+        self.my_turn = False
+        self.won = won
+        if self.log is not None:
+            self.log.write_game(self.board.ships, [], self.shots, 0 if won else 1)
+        events.append({"type": "over", "won": won})
+
+    def __repr__(self):
+        return f"GameSession(player={self.my_player}, phase={self.phase!r}, my_turn={self.my_turn})"
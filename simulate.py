@@ -0,0 +1,247 @@
+"""
+simulate.py
+
+Bezgłowy (bez Pygame i bez sieci) symulator rozgrywek „Statków”.
+
+Rozgrywa pełne gry między dwiema strategiami z strategies.STRATEGIES na planszach
+board.Board z losowymi flotami, rozdzielając je na pulę procesów. Gry są dzielone
+na paczki o stałym rozmiarze, a każda paczka ma własne ziarno wyprowadzone z --seed
+i numeru paczki – dzięki temu wynik nie zależy od liczby procesów (--workers).
+
+Z --log gry trafiają do dziennika meczów (matchlog.py): procesy robocze kodują całe
+paczki, a proces główny dopisuje je do pliku w kolejności paczek.
+
+Uruchomienie:
+    python -m simulate --games 1000000 --workers 8 [--a hunt] [--b random] [--seed 1]
+                       [--log mecze.bin]
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+import opening_book  # rejestruje strategię "cached"
+from board import Board, BitBoard, BOARD_SIZE
+from matchlog import MatchLogWriter, encode_game, shot_word
+from strategies import STRATEGIES
+
+ENGINES = {
+    "board": Board,
+    "bitboard": BitBoard,
+}
+
+
+class SimStats:
+    """
+    Zagregowane statystyki symulacji; częściowe wyniki z procesów łączymy merge().
+
+    Atrybuty:
+    ----------
+    games : int
+        Liczba rozegranych gier.
+    wins : list[int]
+        Zwycięstwa gracza A (indeks 0, strzela pierwszy) i gracza B (indeks 1).
+    shots : int
+        Łączna liczba strzałów obu graczy.
+    winner_shots : list[int]
+        Histogram: winner_shots[k] – liczba gier wygranych k-tym strzałem zwycięzcy.
+    games_log : bytearray
+        Gry paczki zakodowane dla dziennika meczów (puste, gdy nie zapisujemy).
+    """
+
+    def __init__(self):
+        self.games = 0
+        self.wins = [0, 0]
+        self.shots = 0
+        self.winner_shots = [0] * (BOARD_SIZE * BOARD_SIZE + 1)
+        self.games_log = bytearray()
+
+    def merge(self, other):
+        """
+        Dolicza statystyki `other` do bieżących (kolejność łączenia bez znaczenia).
+        """
+        self.games += other.games
+        self.wins[0] += other.wins[0]
+        self.wins[1] += other.wins[1]
+        self.shots += other.shots
+        for k, count in enumerate(other.winner_shots):
+            self.winner_shots[k] += count
+        return self
+
+    def mean_winner_shots(self):
+        """
+        Średnia liczba strzałów zwycięzcy potrzebna do wygranej.
+        """
+        if not self.games:
+            return 0.0
+        return sum(k * n for k, n in enumerate(self.winner_shots)) / self.games
+
+
+def play_game(board_a, board_b, shooter_a, shooter_b, record=None):
+    """
+    Rozgrywa jedną grę do końca; A strzela pierwszy (jak host w main.py).
+    Do listy `record` (jeśli podana) trafiają strzały zakodowane przez matchlog.shot_word().
+
+    Zwraca:
+    --------
+    (winner, shots_a, shots_b) : tuple[int, int, int]
+        winner – 0 dla A, 1 dla B; liczba strzałów każdego z graczy.
+    """
+    boards = (board_b, board_a)      # plansza, w którą strzela dany gracz
+    shooters = (shooter_a, shooter_b)
+    shots = [0, 0]
+    player = 0
+    while True:
+        shooter = shooters[player]
+        target = boards[player]
+        row, col = shooter.next_shot()
+        hit, sunk = target.receive_attack(row, col)
+        shots[player] += 1
+        if record is not None:
+            record.append(shot_word(player, row * BOARD_SIZE + col, hit, sunk))
+        shooter.observe(row, col, bool(hit), sunk)
+        if hit and target.all_sunk():
+            return player, shots[0], shots[1]
+        player ^= 1
+
+
+def run_chunk(task):
+    """
+    Rozgrywa jedną paczkę gier (wywoływane w procesie roboczym).
+
+    Parametry:
+    ----------
+    task : tuple
+        (seed, chunk_index, games, strategy_a, strategy_b, engine, log) – `log`: czy
+        kodować gry do dziennika meczów (SimStats.games_log).
+
+    Zwraca:
+    --------
+    SimStats
+        Statystyki paczki.
+    """
+    seed, chunk_index, games, name_a, name_b, engine, log = task
+    rng = random.Random(f"{seed}-{chunk_index}")
+    board_cls = ENGINES[engine]
+    cls_a = STRATEGIES[name_a]
+    cls_b = STRATEGIES[name_b]
+    # Pamięć strzałów zależałaby od tego, które paczki trafiły do procesu
+    opening_book.CACHE.clear()
+    stats = SimStats()
+    for _ in range(games):
+        board_a = board_cls.random_fleet(rng=rng)
+        board_b = board_cls.random_fleet(rng=rng)
+        record = [] if log else None
+        winner, shots_a, shots_b = play_game(board_a, board_b, cls_a(rng), cls_b(rng), record)
+        if log:
+            stats.games_log += encode_game(board_a.ships, board_b.ships, record, winner)
+        stats.games += 1
+        stats.wins[winner] += 1
+        stats.shots += shots_a + shots_b
+        stats.winner_shots[shots_b if winner else shots_a] += 1
+    return stats
+
+
+def simulate(games, workers=1, seed=1, strategy_a="hunt", strategy_b="random",
+             engine="board", chunk=1000, progress=None, book=None, log=None):
+    """
+    Rozgrywa `games` gier i zwraca łączne SimStats.
+
+    Parametry:
+    ----------
+    games : int
+        Liczba gier.
+    workers : int
+        Liczba procesów; 1 – wszystko w bieżącym procesie.
+    seed : int
+        Ziarno główne.
+    strategy_a, strategy_b : str
+        Nazwy strategii z STRATEGIES.
+    engine : str
+        "board" lub "bitboard".
+    chunk : int
+        Rozmiar paczki gier (od niego – a nie od `workers` – zależą ziarna).
+    progress : callable lub None
+        Wywoływane jako progress(stats) po każdej scalonej paczce.
+    book : str lub None
+        Ścieżka książki otwarć dla strategii "cached" (mapowana w każdym procesie).
+    log : str lub None
+        Plik dziennika meczów, do którego dopisujemy rozegrane gry.
+    """
+    tasks = []
+    for index, start in enumerate(range(0, games, chunk)):
+        tasks.append((seed, index, min(chunk, games - start), strategy_a, strategy_b, engine,
+                      log is not None))
+
+    total = SimStats()
+    writer = MatchLogWriter(log) if log else None
+
+    def collect(part):
+        if writer is not None:
+            writer.write_encoded(part.games_log, part.games)
+            part.games_log = bytearray()
+        total.merge(part)
+        if progress:
+            progress(total)
+
+    try:
+        if workers <= 1:
+            opening_book.use_opening_book(book)
+            for task in tasks:
+                collect(run_chunk(task))
+            return total
+
+        with multiprocessing.Pool(workers, opening_book.use_opening_book, (book,)) as pool:
+            # Przy zapisie dziennika zachowujemy kolejność paczek – plik nie zależy od --workers
+            results = pool.imap(run_chunk, tasks) if writer else pool.imap_unordered(run_chunk, tasks)
+            for part in results:
+                collect(part)
+        return total
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bezgłowy symulator gry w statki")
+    parser.add_argument("--games", type=int, default=10_000, help="liczba gier")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="liczba procesów")
+    parser.add_argument("--seed", type=int, default=1, help="ziarno główne")
+    parser.add_argument("--a", dest="strategy_a", default="hunt", choices=sorted(STRATEGIES),
+                        help="strategia gracza A (strzela pierwszy)")
+    parser.add_argument("--b", dest="strategy_b", default="random", choices=sorted(STRATEGIES),
+                        help="strategia gracza B")
+    parser.add_argument("--engine", default="board", choices=sorted(ENGINES), help="silnik planszy")
+    parser.add_argument("--chunk", type=int, default=1000, help="rozmiar paczki gier")
+    parser.add_argument("--book", default=None, help="książka otwarć dla strategii cached")
+    parser.add_argument("--log", default=None, help="dopisuj gry do dziennika meczów (matchlog)")
+    args = parser.parse_args()
+    for option in ("games", "chunk", "workers"):
+        if getattr(args, option) < 1:
+            parser.error(f"--{option} musi być dodatnie")
+
+    start = time.perf_counter()
+
+    def progress(stats):
+        elapsed = time.perf_counter() - start
+        print(f"\r{stats.games:>12,} gier  {stats.games / elapsed:>10,.0f} gier/s",
+              end="", file=sys.stderr, flush=True)
+
+    stats = simulate(args.games, args.workers, args.seed, args.strategy_a, args.strategy_b,
+                     args.engine, args.chunk, progress, args.book, args.log)
+    elapsed = time.perf_counter() - start
+    print(file=sys.stderr)
+
+    print(f"Gry:                    {stats.games:,}")
+    print(f"Czas:                   {elapsed:.2f} s ({stats.games / elapsed:,.0f} gier/s)")
+    print(f"Strzały na grę:         {stats.shots / stats.games:.2f}")
+    print(f"Strzały zwycięzcy:      {stats.mean_winner_shots():.2f}")
+    print(f"Wygrane A ({args.strategy_a}): {stats.wins[0] / stats.games:.2%}")
+    print(f"Wygrane B ({args.strategy_b}): {stats.wins[1] / stats.games:.2%}")
+
+
+if __name__ == "__main__":
+    main()
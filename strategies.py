@@ -0,0 +1,241 @@
+"""
+strategies.py
+
+Moduł ze strategiami strzelania („strzelcami”) używanymi przez symulator
+i przez gracza komputerowego. Każda strategia ma ten sam interfejs:
+- next_shot() → (row, col): kolejne pole do ostrzelania,
+- observe(row, col, hit, sunk): informacja zwrotna o wyniku strzału
+  (te same pola co w komunikacie {"type":"result", ...}).
+
+Strategia prowadzi własną planszę zgadywań `guess` w formacie guess_boards
+z main.py ('~' – nieostrzelane, 'X' – trafienie, 'O' – pudło).
+
+Dostępne strategie (słownik STRATEGIES):
+- "random" – RandomShooter: losowa kolejność pól,
+- "hunt"   – HuntTargetShooter: polowanie na szachownicy i dobijanie sąsiadów trafienia,
+- "probability" – ProbabilityShooter: mapa prawdopodobieństwa pozostałych ustawień statków.
+"""
+
+import functools
+import random
+
+import numpy as np
+
+from board import BOARD_SIZE, SHIPS, placements
+
+
+class Shooter:
+    """
+    Klasa bazowa strategii strzelania.
+
+    Atrybuty:
+    ----------
+    rng : random.Random
+        Źródło losowości strategii (deterministyczne dla danego ziarna).
+    ships : list[tuple[str, int]]
+        Flota przeciwnika (nazwa, długość).
+    guess : list[list[str]]
+        Plansza zgadywań 10×10 ('~', 'X', 'O').
+    """
+
+    def __init__(self, rng=None, ships=SHIPS):
+        self.rng = rng if isinstance(rng, random.Random) else random.Random(rng)
+        self.ships = ships
+        self.guess = [["~"] * BOARD_SIZE for _ in range(BOARD_SIZE)]
+
+    def next_shot(self):
+        """
+        Zwraca (row, col) kolejnego strzału – pole jeszcze nieostrzelane.
+        """
+        raise NotImplementedError
+
+    def observe(self, row, col, hit, sunk):
+        """
+        Zapisuje wynik strzału na planszy zgadywań.
+        """
+        self.guess[row][col] = "X" if hit else "O"
+
+
+class RandomShooter(Shooter):
+    """
+    Strzela w losowej kolejności w każde pole dokładnie raz.
+    """
+
+    def __init__(self, rng=None, ships=SHIPS):
+        super().__init__(rng, ships)
+        self._order = [(r, c) for r in range(BOARD_SIZE) for c in range(BOARD_SIZE)]
+        self.rng.shuffle(self._order)
+
+    def next_shot(self):
+        return self._order.pop()
+
+
+class HuntTargetShooter(Shooter):
+    """
+    Klasyczna strategia „poluj i dobijaj”:
+    - polowanie: losowe pola z jednego koloru szachownicy (najkrótszy statek ma 2 pola,
+      więc każdy statek zajmuje co najmniej jedno takie pole),
+    - dobijanie: po trafieniu ostrzeliwujemy kolejno sąsiadów trafionych pól,
+      aż statek zostanie zatopiony.
+    """
+
+    def __init__(self, rng=None, ships=SHIPS):
+        super().__init__(rng, ships)
+        parity = self.rng.randrange(2)
+        cells = [(r, c) for r in range(BOARD_SIZE) for c in range(BOARD_SIZE)]
+        self.rng.shuffle(cells)
+        # Pola z wybranej parzystości na końcu listy – zdejmowane są pierwsze (pop)
+        self._hunt = [rc for rc in cells if (rc[0] + rc[1]) % 2 != parity]
+        self._hunt += [rc for rc in cells if (rc[0] + rc[1]) % 2 == parity]
+        self._targets = []
+
+    def next_shot(self):
+        while self._targets:
+            r, c = self._targets.pop()
+            if self.guess[r][c] == "~":
+                return r, c
+        while True:
+            r, c = self._hunt.pop()
+            if self.guess[r][c] == "~":
+                return r, c
+
+    def observe(self, row, col, hit, sunk):
+        super().observe(row, col, hit, sunk)
+        if not hit:
+            return
+        if sunk:
+            self._targets.clear()
+            return
+        for dr, dc in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            r, c = row + dr, col + dc
+            if 0 <= r < BOARD_SIZE and 0 <= c < BOARD_SIZE and self.guess[r][c] == "~":
+                self._targets.append((r, c))
+
+
+@functools.lru_cache(maxsize=None)
+def placement_matrix(length):
+    """
+    Macierz wszystkich ustawień statku o długości `length` (z board.placements).
+
+    Zwraca:
+    --------
+    numpy.ndarray, float32, kształt (liczba_ustawień, BOARD_SIZE*BOARD_SIZE)
+        Wiersz to ustawienie, kolumna to pole; 1.0 oznacza pole zajęte przez statek.
+        Tablica jest współdzielona – nie wolno jej modyfikować.
+    """
+    rows = placements(length)
+    matrix = np.zeros((len(rows), BOARD_SIZE * BOARD_SIZE), dtype=np.float32)
+    for i, (_, _, _, mask) in enumerate(rows):
+        while mask:
+            low = mask & -mask
+            matrix[i, low.bit_length() - 1] = 1.0
+            mask ^= low
+    matrix.setflags(write=False)
+    return matrix
+
+
+class ProbabilityShooter(Shooter):
+    """
+    Strategia „mapy gęstości prawdopodobieństwa”.
+
+    Dla każdej długości pozostałego statku utrzymujemy wektor ustawień wciąż zgodnych
+    z obserwacjami (nie nachodzą na pudła ani na zatopione statki) oraz liczbę
+    niewyjaśnionych trafień, które każde ustawienie pokrywa. Oba wektory aktualizujemy
+    przyrostowo po każdym wyniku (jedna kolumna macierzy ustawień), a mapę cieplną
+    liczymy jednym mnożeniem macierzy na długość statku:
+    - polowanie (brak niewyjaśnionych trafień) – liczba zgodnych ustawień pokrywających pole,
+    - dobijanie – tylko ustawienia pokrywające trafienia, z wagą rosnącą z liczbą trafień.
+    Strzelamy w nieostrzelane pole o największej wartości (remisy rozstrzyga rng).
+    """
+
+    TARGET_WEIGHT = 50.0
+
+    def __init__(self, rng=None, ships=SHIPS):
+        super().__init__(rng, ships)
+        self.remaining = sorted((length for _, length in ships), reverse=True)
+        self.sunk_lengths = []
+        self._lengths = sorted(set(self.remaining), reverse=True)
+        self._matrix = {length: placement_matrix(length) for length in self._lengths}
+        self._alive = {length: np.ones(len(m), dtype=bool) for length, m in self._matrix.items()}
+        self._hits = {length: np.zeros(len(m), dtype=np.float32) for length, m in self._matrix.items()}
+        self._shot = np.zeros(BOARD_SIZE * BOARD_SIZE, dtype=bool)
+        self._unresolved = set()   # trafione pola statków jeszcze niezatopionych
+
+    def heatmap(self):
+        """
+        Zwraca mapę cieplną (numpy.ndarray float32, kształt (BOARD_SIZE, BOARD_SIZE));
+        pola już ostrzelane mają wartość 0.
+        """
+        heat = np.zeros(BOARD_SIZE * BOARD_SIZE, dtype=np.float32)
+        targeting = bool(self._unresolved)
+        for length in self._lengths:
+            count = self.remaining.count(length)
+            if not count:
+                continue
+            alive = self._alive[length]
+            if targeting:
+                weights = alive * self._hits[length] * self.TARGET_WEIGHT
+            else:
+                weights = alive.astype(np.float32)
+            heat += count * (weights @ self._matrix[length])
+        heat[self._shot] = 0.0
+        return heat.reshape(BOARD_SIZE, BOARD_SIZE)
+
+    def next_shot(self):
+        heat = self.heatmap().ravel()
+        best = heat.max()
+        if best <= 0.0:
+            # Brak zgodnych ustawień (np. niespójne obserwacje) – dowolne wolne pole
+            candidates = np.flatnonzero(~self._shot)
+        else:
+            candidates = np.flatnonzero(heat == best)
+        cell = int(candidates[self.rng.randrange(len(candidates))])
+        return divmod(cell, BOARD_SIZE)
+
+    def observe(self, row, col, hit, sunk):
+        super().observe(row, col, hit, sunk)
+        cell = row * BOARD_SIZE + col
+        self._shot[cell] = True
+        if not hit:
+            for length in self._lengths:
+                self._alive[length] &= self._matrix[length][:, cell] == 0.0
+            return
+        self._unresolved.add(cell)
+        for length in self._lengths:
+            self._hits[length] += self._matrix[length][:, cell]
+        if sunk:
+            self._resolve_sunk(cell)
+
+    def _resolve_sunk(self, cell):
+        """
+        Ustala, który statek zatonął w polu `cell`: najdłuższy pozostały, którego
+        ustawienie przez `cell` składa się wyłącznie z niewyjaśnionych trafień.
+        Jego pola przestają być „trafieniami do dobicia” i blokują inne ustawienia.
+        """
+        unresolved = np.zeros(BOARD_SIZE * BOARD_SIZE, dtype=np.float32)
+        unresolved[list(self._unresolved)] = 1.0
+        cells = [cell]
+        length = self.remaining[-1]
+        for candidate in sorted(set(self.remaining), reverse=True):
+            matrix = self._matrix[candidate]
+            fits = (matrix[:, cell] == 1.0) & (matrix @ unresolved == candidate)
+            found = np.flatnonzero(fits)
+            if len(found):
+                length = candidate
+                cells = np.flatnonzero(matrix[found[0]]).tolist()
+                break
+
+        self.remaining.remove(length)
+        self.sunk_lengths.append(length)
+        self._unresolved.difference_update(cells)
+        for other in self._lengths:
+            matrix = self._matrix[other]
+            self._alive[other] &= ~matrix[:, cells].any(axis=1)
+            self._hits[other] -= matrix[:, cells].sum(axis=1)
+
+
+STRATEGIES = {
+    "random": RandomShooter,
+    "hunt": HuntTargetShooter,
+    "probability": ProbabilityShooter,
+}
@@ -0,0 +1,121 @@
+"""
+viewer.py
+
+Podgląd dużej planszy (wariant np. 1000×1000 z wieloma flotami) w gui.ViewportRenderer:
+board.SparseBoard z losową flotą, przybliżanie i przesuwanie widoku oraz strzały myszą.
+
+Sterowanie:
+- kółko myszy – przybliżenie/oddalenie wokół kursora,
+- prawy przycisk (przeciągnięcie) lub strzałki – przesuwanie widoku,
+- lewy przycisk – strzał w pole pod kursorem,
+- F – cała plansza w oknie, S – pokaż/ukryj statki.
+
+Pętla jest sterowana zdarzeniami: ekran rysujemy tylko po zdarzeniu, które coś zmienia,
+a obraz planszy liczymy od nowa tylko po zmianie widoku albo planszy.
+
+Uruchomienie:
+    python -m viewer [--size 1000] [--fleets 2500] [--seed 0] [--view 800]
+"""
+
+import argparse
+import time
+
+import pygame
+
+from board import SparseBoard, SHIPS
+from gui import (
+    TextCache,
+    ViewportRenderer,
+    COLOR_GRID_BG,
+    COLOR_TEXT,
+    INFO_HEIGHT,
+    MARGIN,
+)
+
+PAN_STEP = 64   # przesunięcie widoku strzałką (piksele)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Podgląd dużej planszy")
+    parser.add_argument("--size", type=int, default=1000, help="liczba pól w wierszu i kolumnie")
+    parser.add_argument("--fleets", type=int, default=2500, help="liczba flot SHIPS na planszy")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--view", type=int, default=800, help="bok okna widoku w pikselach")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    board = SparseBoard.random_fleet(SHIPS * args.fleets, args.seed, args.size)
+    setup_ms = (time.perf_counter() - start) * 1000
+
+    pygame.init()
+    screen = pygame.display.set_mode((args.view, args.view + INFO_HEIGHT))
+    pygame.display.set_caption(f"Statki – plansza {args.size}×{args.size}")
+    text_cache = TextCache(pygame.font.SysFont("arial", 18))
+    view = ViewportRenderer(args.size, (args.view, args.view), hide_ships=True)
+    view.fit()
+
+    hover = (None, None)
+    dragging = False
+    frame_ms = 0.0
+    running = True
+    dirty = True
+    while running:
+        events = pygame.event.get() if dirty else [pygame.event.wait()] + pygame.event.get()
+        for event in events:
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.MOUSEWHEEL:
+                view.zoom(event.y, pygame.mouse.get_pos())
+                dirty = True
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                row, col = view.cell_at(event.pos)
+                if row is not None:
+                    board.receive_attack(row, col)
+                    dirty = True
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 3:
+                dragging = True
+            elif event.type == pygame.MOUSEBUTTONUP and event.button == 3:
+                dragging = False
+            elif event.type == pygame.MOUSEMOTION:
+                if dragging:
+                    view.pan(-event.rel[0], -event.rel[1])
+                    dirty = True
+                cell = view.cell_at(event.pos)
+                if cell != hover:
+                    hover = cell
+                    dirty = True
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_f:
+                    view.fit()
+                elif event.key == pygame.K_s:
+                    view.hide_ships = not view.hide_ships
+                elif event.key in (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN):
+                    dx = {pygame.K_LEFT: -PAN_STEP, pygame.K_RIGHT: PAN_STEP}.get(event.key, 0)
+                    dy = {pygame.K_UP: -PAN_STEP, pygame.K_DOWN: PAN_STEP}.get(event.key, 0)
+                    view.pan(dx, dy)
+                dirty = True
+
+        if not dirty or not running:
+            continue
+        dirty = False
+        start = time.perf_counter()
+        view.draw(screen, (0, 0), board)
+        frame_ms = (time.perf_counter() - start) * 1000
+
+        afloat, remaining = board.fleet_status()
+        where = f"pole {hover[0]}, {hover[1]}" if hover[0] is not None else "poza planszą"
+        bar = pygame.Rect(0, args.view, args.view, INFO_HEIGHT)
+        pygame.draw.rect(screen, COLOR_GRID_BG, bar)
+        screen.blit(text_cache.render(
+            f"{where}   przybliżenie {view.scale:g} px/pole   statki na wodzie {afloat}   "
+            f"pola {remaining}", COLOR_TEXT), (MARGIN // 2, bar.top + 10))
+        screen.blit(text_cache.render(
+            f"klatka {frame_ms:.1f} ms (pól {view.rendered:,})   flota {setup_ms:.0f} ms",
+            COLOR_TEXT), (MARGIN // 2, bar.top + 32))
+        pygame.display.flip()
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()